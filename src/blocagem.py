@@ -0,0 +1,371 @@
+# blocagem.py
+"""Vinculação de duas bases: blocagem, geração de pares candidatos e pontuação.
+
+Em vez de exigir um arquivo com os pares já montados lado a lado, cada
+registro da base A é comparado apenas com os registros da base B que têm a
+mesma chave de blocagem (ex.: soundex do primeiro nome + ano de nascimento).
+A base B fica em memória, indexada pela chave; a base A é lida em blocos e
+os pares candidatos de cada bloco são gerados por *hash join* e entregues
+diretamente a :func:`comparaRegistros.processar_blocos`, sem gravar o
+arquivo de pares.
+
+Além da chave exata (:class:`ChaveBloco`) há a vizinhança ordenada
+(:class:`VizinhancaOrdenada`), que tolera erros no fim da chave, e a
+blocagem em várias passadas: a união dos candidatos de várias estratégias,
+com cada par pontuado uma única vez.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+import comparaRegistros as cr
+import freqBuilder as fb
+import gravacaoSaida as gs
+import leituraEntrada as le
+import util
+from comparators import build_criterios_labels
+
+# Separador entre os componentes de uma chave composta.
+_SEP_CHAVE = "\x1f"
+
+
+def _soundex_primeiro(valor: str) -> str:
+    tokens = util.padroniza(valor).split()
+    return util.soundex(tokens[0]) if tokens else ""
+
+
+def _soundex_ultimo(valor: str) -> str:
+    tokens = util.padroniza(valor).split()
+    return util.soundex(tokens[-1]) if tokens else ""
+
+
+def _ano(valor: str) -> str:
+    valor = valor.strip()
+    return valor[:4] if valor[:4].isdigit() and len(valor) >= 4 else ""
+
+
+# Transformações aplicáveis a cada componente da chave. Um componente vazio
+# deixa o registro fora da blocagem.
+TRANSFORMACOES: dict[str, Callable[[str], str]] = {
+    "exato": str.strip,
+    "padroniza": util.padroniza,
+    "soundex": _soundex_primeiro,
+    "soundex_ultimo": _soundex_ultimo,
+    "inicial": lambda v: util.padroniza(v)[:1],
+    "ano": _ano,
+}
+
+
+@dataclass(frozen=True)
+class ChaveBloco:
+    """Chave de blocagem composta por ``(coluna_a, coluna_b, transformação)``.
+
+    ``coluna_a`` e ``coluna_b`` são índices (0-based) nas bases A e B; a
+    transformação é um nome de :data:`TRANSFORMACOES`. Exemplo: soundex do
+    primeiro nome + ano de nascimento::
+
+        ChaveBloco(((0, 1, "soundex"), (2, 4, "ano")))
+    """
+
+    componentes: tuple[tuple[int, int, str], ...]
+
+    def __post_init__(self):
+        if not self.componentes:
+            raise ValueError("a chave de blocagem precisa de ao menos um componente")
+        for _, _, transformacao in self.componentes:
+            if transformacao not in TRANSFORMACOES:
+                raise ValueError(f"Transformação de blocagem desconhecida: '{transformacao}'")
+
+    def valores(self, df: pd.DataFrame, lado: int) -> pd.Series:
+        """Chave de cada linha de ``df`` (``lado`` 0 = base A, 1 = base B); ``None`` se incompleta.
+
+        Cada transformação roda uma vez por valor distinto da coluna.
+        """
+        chave = None
+        incompleta = np.zeros(len(df), dtype=bool)
+        for componente in self.componentes:
+            transformar = TRANSFORMACOES[componente[2]]
+            codigos, unicos = pd.factorize(df.iloc[:, componente[lado]].astype(str))
+            parte = np.array([transformar(v) for v in unicos] + [""], dtype=object)[codigos]
+            incompleta |= parte == ""
+            chave = parte if chave is None else chave + _SEP_CHAVE + parte
+        return pd.Series(np.where(incompleta, None, chave), index=df.index, dtype=object)
+
+
+class IndiceBloco:
+    """Índice ``chave -> linhas`` da base B para o *hash join* com a base A."""
+
+    def __init__(self, chaves_b: pd.Series):
+        codigos, unicos = pd.factorize(chaves_b)
+        validos = np.flatnonzero(codigos >= 0)
+        self.ordem = validos[np.argsort(codigos[validos], kind="stable")]
+        self.contagem = np.bincount(codigos[validos], minlength=len(unicos))
+        self.inicio = np.cumsum(self.contagem) - self.contagem
+        self.chaves = pd.Index(unicos)
+
+    def _grupos(self, chaves_a: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        if not len(self.chaves):
+            return np.full(len(chaves_a), -1), np.zeros(len(chaves_a), dtype=np.int64)
+        grupos = self.chaves.get_indexer(chaves_a)
+        return grupos, np.where(grupos >= 0, self.contagem[grupos], 0)
+
+    def contar(self, chaves_a: pd.Series) -> int:
+        """Número de pares candidatos das linhas com ``chaves_a``."""
+        return int(self._grupos(chaves_a)[1].sum())
+
+    def candidatos(self, chaves_a: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Pares ``(linha_a, linha_b)`` (posições) com a mesma chave, agrupados por linha de A."""
+        grupos, tamanhos = self._grupos(chaves_a)
+        ia = np.repeat(np.arange(len(grupos)), tamanhos)
+        deslocamento = np.repeat(self.inicio[grupos] - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+        ib = self.ordem[deslocamento + np.arange(len(ia))] if len(ia) else np.zeros(0, dtype=np.int64)
+        return ia, ib
+
+
+@dataclass(frozen=True)
+class VizinhancaOrdenada:
+    """Blocagem por vizinhança ordenada (*sorted neighbourhood*).
+
+    A base B é ordenada pela ``chave`` e cada registro de A é comparado com
+    os ``janela`` registros de B em torno da posição em que sua chave
+    entraria nessa ordem. Chaves que diferem só no fim (erro de digitação
+    após o prefixo) continuam próximas; em compensação, grupos de chaves
+    iguais maiores que a janela são cortados.
+    """
+
+    chave: ChaveBloco
+    janela: int = 10
+
+    def __post_init__(self):
+        if self.janela < 1:
+            raise ValueError("a janela da vizinhança ordenada deve ser positiva")
+
+
+class IndiceVizinhanca:
+    """Base B ordenada pela chave, para a :class:`VizinhancaOrdenada`."""
+
+    def __init__(self, chaves_b: pd.Series, janela: int):
+        valores = chaves_b.to_numpy(dtype=object)
+        validos = np.flatnonzero(pd.notna(valores))
+        ordenadas = np.array(valores[validos], dtype=str)
+        arranjo = np.argsort(ordenadas, kind="stable")
+        self.ordem = validos[arranjo]
+        self.chaves = ordenadas[arranjo]
+        self.janela = janela
+
+    def candidatos(self, chaves_a: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Pares ``(linha_a, linha_b)`` (posições) dentro da janela, agrupados por linha de A."""
+        valores = chaves_a.to_numpy(dtype=object)
+        linhas = np.flatnonzero(pd.notna(valores))
+        n = len(self.chaves)
+        if not n or not len(linhas):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        posicao = np.searchsorted(self.chaves, np.array(valores[linhas], dtype=str))
+        tamanho = min(self.janela, n)
+        inicio = np.clip(posicao - self.janela // 2, 0, n - tamanho)
+        ia = np.repeat(linhas, tamanho)
+        ib = self.ordem[np.repeat(inicio, tamanho) + np.tile(np.arange(tamanho), len(linhas))]
+        return ia, ib
+
+
+Passada = Union[ChaveBloco, VizinhancaOrdenada]
+
+
+@dataclass
+class EstatisticasBlocagem:
+    """Resumo da geração de candidatos de :func:`vincular`.
+
+    ``pares_por_passada`` conta os pares gerados por cada passada antes da
+    deduplicação e ``candidatos`` são os pares distintos efetivamente
+    pontuados. ``segundos`` é todo o tempo gasto na geração dos candidatos:
+    a indexação de B e as duas leituras de A (contagem e pontuação), que
+    geram os mesmos candidatos. ``pares_por_segundo`` divide um pelo outro,
+    então mede o custo real de cada candidato pontuado, incluindo a geração
+    repetida.
+    """
+
+    linhas_a: int = 0
+    linhas_b: int = 0
+    pares_por_passada: list[int] = field(default_factory=list)
+    candidatos: int = 0
+    segundos: float = 0.0
+
+    @property
+    def razao_reducao(self) -> float:
+        """Fração do produto cartesiano A x B descartada pela blocagem."""
+        total = self.linhas_a * self.linhas_b
+        return 1.0 - self.candidatos / total if total else 0.0
+
+    @property
+    def pares_por_segundo(self) -> float:
+        return self.candidatos / self.segundos if self.segundos else 0.0
+
+
+@dataclass
+class EstatisticasVinculacao(cr.Estatisticas):
+    """:class:`comparaRegistros.Estatisticas` da pontuação mais as da blocagem."""
+
+    blocagem: EstatisticasBlocagem = field(default_factory=EstatisticasBlocagem)
+
+
+class GeradorCandidatos:
+    """União dos candidatos de várias passadas sobre a base B, sem pares repetidos.
+
+    Cada par ``(linha_a, linha_b)`` de um bloco vira o código
+    ``linha_a * len(B) + linha_b`` (int64) e a deduplicação entre passadas é
+    um ``np.unique`` sobre esses códigos, que também devolve os pares
+    agrupados por linha de A. ``segundos`` acumula o tempo da indexação de B
+    e de cada chamada a :meth:`candidatos`.
+    """
+
+    def __init__(self, passadas: Sequence[Passada], df_b: pd.DataFrame):
+        if not passadas:
+            raise ValueError("informe ao menos uma passada de blocagem")
+        inicio = time.perf_counter()
+        self.linhas_b = len(df_b)
+        self.passadas: list[tuple[ChaveBloco, IndiceBloco | IndiceVizinhanca]] = []
+        for passada in passadas:
+            if isinstance(passada, VizinhancaOrdenada):
+                chave = passada.chave
+                indice = IndiceVizinhanca(chave.valores(df_b, 1), passada.janela)
+            else:
+                chave = passada
+                indice = IndiceBloco(chave.valores(df_b, 1))
+            self.passadas.append((chave, indice))
+        self.segundos = time.perf_counter() - inicio
+
+    def candidatos(self, bloco_a: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, list[int]]:
+        """``(ia, ib, pares_por_passada)`` de ``bloco_a``; ``ia``/``ib`` são posições."""
+        inicio = time.perf_counter()
+        gerados = [indice.candidatos(chave.valores(bloco_a, 0)) for chave, indice in self.passadas]
+        contagens = [len(ia) for ia, _ in gerados]
+        if len(gerados) == 1:
+            ia, ib = gerados[0]
+        else:
+            codigos = np.unique(
+                np.concatenate([ia.astype(np.int64) * self.linhas_b + ib for ia, ib in gerados])
+            )
+            ia, ib = codigos // self.linhas_b, codigos % self.linhas_b
+        self.segundos += time.perf_counter() - inicio
+        return ia, ib, contagens
+
+
+def _blocos_pares(
+    blocos_a: Iterator[pd.DataFrame],
+    df_b: pd.DataFrame,
+    gerador: GeradorCandidatos,
+    colunas: list[str],
+    max_pares: int,
+) -> Iterator[pd.DataFrame]:
+    """Monta os pares candidatos de cada bloco de A, lado a lado com as linhas de B."""
+    for bloco_a in blocos_a:
+        ia, ib, _ = gerador.candidatos(bloco_a)
+        for inicio in range(0, len(ia), max_pares):
+            fim = inicio + max_pares
+            pares_df = pd.concat(
+                [
+                    bloco_a.iloc[ia[inicio:fim]].reset_index(drop=True),
+                    df_b.iloc[ib[inicio:fim]].reset_index(drop=True),
+                ],
+                axis=1,
+            )
+            pares_df.columns = colunas
+            yield pares_df
+
+
+def vincular(
+    arquivo_a: str,
+    arquivo_b: str,
+    arquivo_saida: str,
+    pares: list[tuple[int, int, str, str]],
+    chave: Passada | Sequence[Passada],
+    *,
+    sep: str = "|",
+    sep_b: str | None = None,
+    prefixos: tuple[str, str] = ("R_", "C_"),
+    chunksize: int = 100_000,
+    max_pares_bloco: int = 50_000,
+    progress_cb=None,
+    sort_by: str | None = "nota final",
+    ascending: bool = False,
+    workers: int | None = None,
+    min_nota: float | None = None,
+    top_k: int | None = None,
+    chave_registro: str | None = None,
+    formato: str = "csv",
+    motor: str = "auto",
+) -> EstatisticasVinculacao:
+    """Vincula as bases ``arquivo_a`` e ``arquivo_b`` e grava ``arquivo_saida`` (+ extensão).
+
+    ``pares`` segue o formato de :func:`comparaRegistros.processar_generico`,
+    mas ``idx1`` indexa as colunas de A e ``idx2`` as de B. A saída traz as
+    colunas de A e de B com os ``prefixos`` (padrão OpenRecLink ``R_``/``C_``)
+    seguidas dos critérios e da nota final.
+
+    ``chave`` é uma :class:`ChaveBloco`, uma :class:`VizinhancaOrdenada` ou
+    uma lista delas (blocagem em várias passadas: vale a união dos
+    candidatos, e um par gerado por mais de uma passada é pontuado uma vez).
+
+    A base B (``sep_b``, padrão ``sep``) é carregada em memória e indexada
+    por cada passada; A é lida em blocos de ``chunksize`` linhas. Uma
+    primeira leitura de A conta os tokens (tabelas de frequência de A e B,
+    cada registro contado uma vez) e os pares candidatos; a segunda gera os
+    pares em blocos de até ``max_pares_bloco`` e os pontua em modo
+    streaming (``min_nota``, ``top_k`` e ``formato`` como em
+    :func:`comparaRegistros.processar_generico`; ``chave_registro`` é o nome
+    de uma coluna de saída, já com o prefixo, ex.: ``"R_id"``). ``motor``
+    escolhe o leitor das duas bases (ver :mod:`leituraEntrada`).
+    O retorno inclui :class:`EstatisticasBlocagem` (razão de redução e pares
+    por segundo, medidos sobre as duas leituras de A) em ``blocagem``.
+    """
+    colunas_a = le.cabecalho(arquivo_a, sep)
+    df_b = next(le.ler(arquivo_b, sep_b or sep, motor=motor))
+    colunas = [prefixos[0] + c for c in colunas_a] + [prefixos[1] + c for c in df_b.columns]
+    pares_saida = [(idx_a, len(colunas_a) + idx_b, tipo, nome) for idx_a, idx_b, tipo, nome in pares]
+    if sort_by is not None and sort_by not in colunas + build_criterios_labels(pares_saida):
+        raise ValueError(f"Coluna '{sort_by}' não encontrada para ordenação")
+    if max_pares_bloco < 1:
+        raise ValueError("max_pares_bloco deve ser positivo")
+    gs.validar_formato(formato)
+
+    passadas = [chave] if isinstance(chave, (ChaveBloco, VizinhancaOrdenada)) else list(chave)
+    gerador = GeradorCandidatos(passadas, df_b)
+    blocagem = EstatisticasBlocagem(linhas_b=len(df_b), pares_por_passada=[0] * len(passadas))
+
+    def contando(blocos):
+        for bloco in blocos:
+            ia, _, contagens = gerador.candidatos(bloco)
+            blocagem.linhas_a += len(bloco)
+            blocagem.candidatos += len(ia)
+            blocagem.pares_por_passada = [a + b for a, b in zip(blocagem.pares_por_passada, contagens)]
+            yield bloco
+
+    def ler_a() -> Iterator[pd.DataFrame]:
+        return le.ler(arquivo_a, sep, chunksize=chunksize, motor=motor)
+
+    freq_maps = fb.count_bases(contando(ler_a()), [df_b], pares)
+    blocos = _blocos_pares(ler_a(), df_b, gerador, colunas, max_pares_bloco)
+    estatisticas = cr.processar_blocos(
+        blocos,
+        colunas,
+        pares_saida,
+        freq_maps,
+        blocagem.candidatos,
+        arquivo_saida,
+        sep=sep,
+        progress_cb=progress_cb,
+        sort_by=sort_by,
+        ascending=ascending,
+        workers=workers,
+        min_nota=min_nota,
+        top_k=top_k,
+        chave_registro=chave_registro,
+        formato=formato,
+    )
+    blocagem.segundos = gerador.segundos
+    return EstatisticasVinculacao(estatisticas.linhas, estatisticas.pares, estatisticas.descartadas, blocagem)
@@ -1,22 +1,44 @@
 from __future__ import annotations
 
+import contextlib
 import os
+import tempfile
+import numpy as np
 import pandas as pd
-from concurrent.futures import ProcessPoolExecutor
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from decimal import Decimal, ROUND_HALF_UP
+from itertools import accumulate
+from pathlib import Path
 from typing import Any
 import time
 
 from comparators import (
+    Vocabulario,
+    build_criterios_formatos,
     build_criterios_labels,
-    comparar_data,
-    comparar_logradouro,
-    comparar_localidade,
+    comparar_data_batch,
+    comparar_logradouro_normalizado,
+    comparar_localidade_batch,
     comparar_nome,
-    comparar_numero,
-    comparar_texto,
+    comparar_nome_ids,
+    comparar_numero_batch,
+    comparar_texto_ids,
+    formatar_coluna,
+    formatar_flags,
+    normalizar_logradouro,
 )
+import controleExecucao as ce
 import freqBuilder as fb  # novo
+import gravacaoSaida as gs
+import indiceLinhas as il
+import leituraEntrada as le
+import ordenacaoExterna as oe
+import retomadaExecucao as rx
+import selecaoTopK as stk
+import tabelasCompartilhadas as tc
 import util
 
 DFMT = lambda x: format(Decimal(x).quantize(Decimal("0.00"), rounding=ROUND_HALF_UP), "f")
@@ -25,45 +47,454 @@ DFMT = lambda x: format(Decimal(x).quantize(Decimal("0.00"), rounding=ROUND_HALF
 # Índices para saber em qual fatia da lista de frequências procurar
 PACIENTE, MAE = 0, 1
 
+# Linhas por bloco pontuado de uma vez no modo sequencial.
+_BLOCO = 1000
+
+# Lotes enviados aos processos (ver :class:`_TamanhoLote`).
+_LOTE_INICIAL = 5_000
+_LOTE_MIN = _BLOCO
+_LOTE_MAX = 50_000
+_LOTE_ALVO_SEG = 0.5
+
+# Custo relativo de cada tipo de par: com ``min_nota`` os pares são avaliados
+# do mais barato (vetorizados) para o mais caro.
+_CUSTO_TIPO = {"D": 0, "C": 0, "M": 1, "N": 2, "T": 2, "L": 3}
+
+# Nota máxima de cada tipo de par de nota constante (data, localidade,
+# número e logradouro); nomes e textos têm o limite calculado por linha.
+_NOTA_MAXIMA = {"D": 1.0, "C": 2.0, "M": 4.0, "L": 4.6}
+
+# Folga do corte por ``min_nota``: a nota gravada é arredondada a 2 casas
+# (14,996 vira 15,00 e alcança 15) e a ordem das somas muda o último bit.
+_FOLGA_NOTA = 0.005 + 1e-9
+
+
+@dataclass
+class EstatisticasPar:
+    """Linhas comparadas e combinações distintas efetivamente pontuadas em um par."""
+
+    nome: str
+    linhas: int = 0
+    pontuadas: int = 0
+
+    @property
+    def razao_dedup(self) -> float:
+        """Linhas por combinação pontuada (1,0 = nenhuma repetição aproveitada)."""
+        return self.linhas / self.pontuadas if self.pontuadas else 0.0
+
+
+@dataclass
+class Estatisticas:
+    """Resumo de uma execução de :func:`processar_generico`.
+
+    ``descartadas`` conta as linhas pontuadas que ficaram fora da saída
+    (abaixo de ``min_nota`` ou fora das ``top_k`` melhores do registro).
+    """
+
+    linhas: int = 0
+    pares: list[EstatisticasPar] = field(default_factory=list)
+    descartadas: int = 0
+
+    def somar(self, contagens: list[list[int]]) -> None:
+        for par, (linhas, pontuadas) in zip(self.pares, contagens):
+            par.linhas += linhas
+            par.pontuadas += pontuadas
+
+
+class _Contexto:
+    """Estado de uma execução compartilhado por todas as linhas de um processo.
+
+    Guarda os pares, as tabelas de frequência e o :class:`Vocabulario` da
+    execução, com as frequências dos pares T/N já convertidas em arrays
+    indexados pelo id de cada token. ``resultados`` guarda, por par, o
+    resultado de cada combinação ``(valor1, valor2)`` já pontuada (até
+    ``util.CACHE_TAMANHO`` entradas, sem limite se ``None``) como
+    ``(critérios numéricos, nota)``, ``formatos`` diz como cada coluna da saída é gravada e ``contagens`` soma
+    ``[linhas, combinações pontuadas]`` para a estatística de deduplicação. Com
+    ``min_nota``, ``mantidas`` guarda as posições das linhas do último bloco
+    que atingiram a nota mínima.
+    """
+
+    def __init__(self, pares, freq_maps, min_nota: float | None = None):
+        self.pares = pares
+        self.freq_maps = freq_maps
+        self.min_nota = min_nota
+        self.mantidas: np.ndarray | None = None
+        self.vocab = Vocabulario()
+        self.resultados: list[dict[tuple[str, str], tuple]] = [{} for _ in pares]
+        self.formatos = build_criterios_formatos(pares)
+        self.limite_resultados = util.CACHE_TAMANHO
+        self.contagens = [[0, 0] for _ in pares]
+        self.tabelas: dict[int, Any] = {}
+        for j, (_, _, tipo, _) in enumerate(pares):
+            t = tipo.upper()
+            freq_map = freq_maps.get(j)
+            if t == "N":
+                self.tabelas[j] = [self.vocab.tabela(m) for m in freq_map] if freq_map else None
+            elif t not in ("D", "C", "L", "M"):
+                self.tabelas[j] = self.vocab.tabela(freq_map or {})
+
+    def tomar_contagens(self) -> list[list[int]]:
+        """Devolve as contagens acumuladas desde a última chamada e as zera."""
+        contagens, self.contagens = self.contagens, [[0, 0] for _ in self.pares]
+        return contagens
+
+
 # Globals used by worker processes
-_WORK_PARES: list[tuple[int, int, str, str]] = []
-_WORK_FREQ_MAPS: dict[int, Any] = {}
+_WORK_CTX: _Contexto | None = None
+
+
+def _init_worker(pares, freq_maps, min_nota: float | None = None):
+    """Initializer for worker processes.
 
+    ``freq_maps`` pode ser um :class:`tabelasCompartilhadas.Descritor`; nesse
+    caso as tabelas são anexadas da memória compartilhada em vez de copiadas.
+    """
+    global _WORK_CTX
+    if isinstance(freq_maps, tc.Descritor):
+        freq_maps = tc.anexar(freq_maps)
+    _WORK_CTX = _Contexto(pares, freq_maps, min_nota)
+
+
+def _colunas_usadas(pares) -> list[int]:
+    return sorted({idx for idx1, idx2, _, _ in pares for idx in (idx1, idx2)})
+
+
+def _projetar(
+    colunas: list[str], usadas: list[int], colunas_saida: list[str]
+) -> tuple[list[int], dict[int, int], list[int]]:
+    """Projeção da entrada: só as colunas ``usadas`` na pontuação e as ``colunas_saida``.
+
+    Devolve as posições a ler (na ordem do arquivo), a nova posição de cada
+    coluna lida e as posições, entre as lidas, das colunas copiadas para a
+    saída.
+    """
+    faltando = [c for c in colunas_saida if c not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas de saída não encontradas: {', '.join(faltando)}")
+    copiadas = {colunas.index(c) for c in colunas_saida}
+    lidas = sorted(copiadas | set(usadas))
+    posicao = {idx: k for k, idx in enumerate(lidas)}
+    return lidas, posicao, [posicao[idx] for idx in sorted(copiadas)]
+
+
+class _ColunaBloco:
+    """Valores distintos de uma coluna do bloco, normalizados uma única vez.
+
+    A coluna é fatorada (``codigos`` indexa ``brutos``) e cada forma
+    normalizada é calculada sob demanda sobre os valores distintos, sendo
+    reaproveitada por todos os pares que usam a coluna.
+    """
+
+    def __init__(self, valores: list):
+        codigos, unicos = pd.factorize(np.asarray([str(v) for v in valores], dtype=object))
+        self.codigos = codigos
+        self.brutos: list[str] = list(unicos)
+        self._padronizados: list[str] | None = None
+        self._ids: list[tuple[int, ...]] | None = None
+        self._tokens: tuple[np.ndarray, np.ndarray] | None = None
+        self._logradouros: list | None = None
 
-def _init_worker(pares, freq_maps):
-    """Initializer for worker processes."""
-    global _WORK_PARES, _WORK_FREQ_MAPS
-    _WORK_PARES = pares
-    _WORK_FREQ_MAPS = freq_maps
+    @property
+    def padronizados(self) -> list[str]:
+        if self._padronizados is None:
+            self._padronizados = [util.padroniza(v) for v in self.brutos]
+        return self._padronizados
+
+    def ids(self, vocab: Vocabulario) -> list[tuple[int, ...]]:
+        if self._ids is None:
+            self._ids = [vocab.codificar(v) for v in self.padronizados]
+        return self._ids
+
+    def tokens(self, vocab: Vocabulario) -> tuple[np.ndarray, np.ndarray]:
+        """``(tokens, tokens de uma letra)`` de cada valor distinto."""
+        if self._tokens is None:
+            tamanho = vocab.tamanho
+            ids = self.ids(vocab)
+            self._tokens = (
+                np.fromiter((len(p) for p in ids), dtype=np.int64, count=len(ids)),
+                np.fromiter((sum(tamanho[i] == 1 for i in p) for p in ids), dtype=np.int64, count=len(ids)),
+            )
+        return self._tokens
+
+    @property
+    def logradouros(self) -> list:
+        if self._logradouros is None:
+            self._logradouros = [normalizar_logradouro(v) for v in self.padronizados]
+        return self._logradouros
+
+
+def _pontuar_coluna(j: int, t: str, col1: _ColunaBloco, col2: _ColunaBloco, ia: list[int], ib: list[int], ctx: _Contexto):
+    """Pontua as combinações ``(col1[ia[k]], col2[ib[k]])``.
+
+    Devolve ``(critérios, notas)``: uma linha de critérios numéricos por
+    combinação (``NaN``: não calculado) e a nota de cada uma.
+    """
+    n = len(ia)
+    vocab = ctx.vocab
+    if t == "M":
+        lote = comparar_numero_batch([col1.brutos[i] for i in ia], [col2.brutos[i] for i in ib])
+        return np.column_stack(lote.pontos), lote.nota
+    if t in ("D", "C"):
+        v1 = [col1.padronizados[i] for i in ia]
+        v2 = [col2.padronizados[i] for i in ib]
+        lote = comparar_data_batch(v1, v2) if t == "D" else comparar_localidade_batch(v1, v2)
+        return np.column_stack(lote.pontos), lote.nota
+    if t == "L":
+        l1, l2 = col1.logradouros, col2.logradouros
+        resultados = [comparar_logradouro_normalizado(l1[a], l2[b]) for a, b in zip(ia, ib)]
+    else:
+        ids1, ids2 = col1.ids(vocab), col2.ids(vocab)
+        tab = ctx.tabelas[j]
+        comparar = comparar_nome_ids if t == "N" else comparar_texto_ids
+        resultados = [comparar(ids1[a], ids2[b], vocab, tab) for a, b in zip(ia, ib)]
+    criterios = np.array([r.valores for r in resultados], dtype=float)
+    return criterios, np.fromiter((r.nota for r in resultados), dtype=float, count=n)
+
+
+def _nota_maxima(j: int, t: str, col1: _ColunaBloco, col2: _ColunaBloco, ctx: _Contexto) -> np.ndarray:
+    """Limite superior da nota do par ``j`` em cada linha do bloco.
+
+    Nomes e textos: 2 (primeiro/último iguais) + 1 (interseção) + raros
+    (até 2 num nome de um fragmento, contado como primeiro e último) + 0,8
+    (parecidos) + 0,5 por abreviatura possível (fragmentos de uma letra dos
+    dois lados) sobre os fragmentos do primeiro valor; "comuns" só subtrai.
+    """
+    if t in _NOTA_MAXIMA:
+        return np.full(len(col1.codigos), _NOTA_MAXIMA[t])
+    tok1, curtos1 = (a[col1.codigos] for a in col1.tokens(ctx.vocab))
+    tok2, curtos2 = (a[col2.codigos] for a in col2.tokens(ctx.vocab))
+    if t != "N":
+        raros = 1.0
+    elif ctx.tabelas[j]:
+        raros = np.where(tok1 == 1, 2.0, 1.0)
+    else:
+        raros = 0.0
+    maximo = 3.8 + raros + 0.5 * (curtos1 + curtos2) / np.maximum(tok1, 1)
+    return np.where((tok1 > 0) & (tok2 > 0), maximo, 0.0)
+
+
+def _arredondar_notas(notas: np.ndarray) -> np.ndarray:
+    """Notas arredondadas a 2 casas como em :data:`DFMT` (HALF_UP sobre o valor exato).
+
+    Cada nota distinta é arredondada uma vez. ``f"{x:.2f}"`` também arredonda
+    o valor exato do double e só difere de ``DFMT`` nos empates exatos
+    (``200 * x`` inteiro e ímpar), que passam por ``DFMT``.
+    """
+    codigos, unicos = pd.factorize(np.ascontiguousarray(notas, dtype=np.float64).view(np.int64))
+    unicos = unicos.view(np.float64)
+    dobro = unicos * 200
+    empates = (dobro == np.floor(dobro)) & (np.mod(dobro, 2) == 1)
+    arredondadas = [
+        float(DFMT(x)) if empate else float(f"{x:.2f}") for x, empate in zip(unicos.tolist(), empates.tolist())
+    ]
+    return np.array(arredondadas, dtype=np.float64)[codigos]
+
+
+def _formatar_saida(saida: list[np.ndarray], formatos: list[str]) -> list[np.ndarray]:
+    """Converte as colunas de :func:`_score_block` no texto gravado (``"0,75"``)."""
+    return [formatar_coluna(coluna, formato) for coluna, formato in zip(saida, formatos)]
+
+
+def _score_block(cols: dict[int, list], ctx: _Contexto) -> list[np.ndarray]:
+    """Pontua um bloco de linhas coluna a coluna.
+
+    ``cols`` mapeia o índice de cada coluna usada em ``ctx.pares`` para os
+    valores do bloco. Devolve um array ``float64`` por critério (``NaN``:
+    não calculado), terminando pela nota final já arredondada a 2 casas; o
+    texto da saída sai de :func:`_formatar_saida`, uma vez por valor
+    distinto de cada coluna.
+
+    Cada coluna é normalizada uma vez sobre seus valores distintos (ver
+    :class:`_ColunaBloco`), e cada combinação distinta ``(valor1, valor2)``
+    de um par é pontuada uma única vez: as que ainda não estão no cache do
+    par (``ctx.resultados``) passam pelos comparadores e o resultado é
+    replicado para todas as linhas.
+
+    Com ``ctx.min_nota`` os pares são avaliados em ordem de custo
+    (:data:`_CUSTO_TIPO`) e uma linha deixa de ser pontuada assim que a nota
+    acumulada mais o limite superior dos pares restantes (ver
+    :func:`_nota_maxima`) não alcança a nota mínima. Só as linhas com nota
+    final ``>= min_nota`` são devolvidas; suas posições ficam em
+    ``ctx.mantidas``.
+    """
+    n = len(next(iter(cols.values()))) if cols else 0
+    ctx.mantidas = None
+    if n == 0:
+        if ctx.min_nota is not None:
+            ctx.mantidas = np.zeros(0, dtype=np.int64)
+        return [np.zeros(0) for _ in ctx.formatos]
+    colunas_bloco = {idx: _ColunaBloco(valores) for idx, valores in cols.items()}
+    ordem = list(range(len(ctx.pares)))
+    vivas: np.ndarray | None = None
+    if ctx.min_nota is not None:
+        ordem.sort(key=lambda j: _CUSTO_TIPO.get(ctx.pares[j][2].upper(), 2))
+        maximos = [
+            _nota_maxima(j, ctx.pares[j][2].upper(), colunas_bloco[ctx.pares[j][0]], colunas_bloco[ctx.pares[j][1]], ctx)
+            for j in ordem
+        ]
+        restante = np.sum(maximos, axis=0)
+        parcial = np.zeros(n)
+    por_par: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    for passo, j in enumerate(ordem):
+        idx1, idx2, tipo, _ = ctx.pares[j]
+        col1, col2 = colunas_bloco[idx1], colunas_bloco[idx2]
+        codigos = col1.codigos * len(col2.brutos) + col2.codigos
+        if ctx.min_nota is not None:
+            vivas = np.flatnonzero(parcial + restante >= ctx.min_nota - _FOLGA_NOTA)
+            codigos = codigos[vivas]
+        _, primeira, inversa = np.unique(codigos, return_index=True, return_inverse=True)
+        if vivas is not None:
+            primeira = vivas[primeira]
+        ia, ib = col1.codigos[primeira].tolist(), col2.codigos[primeira].tolist()
+        chaves = [(col1.brutos[a], col2.brutos[b]) for a, b in zip(ia, ib)]
+
+        memo = ctx.resultados[j]
+        novas = [k for k, chave in enumerate(chaves) if chave not in memo]
+        if ctx.limite_resultados is not None and len(memo) + len(novas) > ctx.limite_resultados:
+            memo.clear()
+            novas = list(range(len(chaves)))
+        if novas:
+            criterios, notas = _pontuar_coluna(
+                j, tipo.upper(), col1, col2, [ia[k] for k in novas], [ib[k] for k in novas], ctx
+            )
+            for k, valores, nota in zip(novas, criterios.tolist(), notas.tolist()):
+                memo[chaves[k]] = (valores, nota)
+        ctx.contagens[j][0] += len(inversa)
+        ctx.contagens[j][1] += len(novas)
+
+        unicos = [memo[chave] for chave in chaves]
+        notas = np.fromiter((nota for _, nota in unicos), dtype=float, count=len(unicos))[inversa]
+        largura = len(build_criterios_labels([ctx.pares[j]])) - 1
+        colunas = np.array([valores for valores, _ in unicos], dtype=float).reshape(-1, largura)[inversa].T
+        if vivas is None:
+            por_par[j] = (colunas, notas)
+            continue
+        # linhas descartadas ficam com 0.0 neste par e saem no filtro final
+        completas = np.zeros((len(colunas), n))
+        completas[:, vivas] = colunas
+        nota_par = np.zeros(n)
+        nota_par[vivas] = notas
+        por_par[j] = (completas, nota_par)
+        parcial += nota_par
+        restante -= maximos[passo]
+
+    saida: list[np.ndarray] = []
+    nota_total = np.zeros(n)
+    for j in range(len(ctx.pares)):
+        colunas, notas = por_par[j]
+        saida.extend(colunas)
+        nota_total += notas
+    if vivas is None:
+        saida.append(_arredondar_notas(nota_total))
+        return saida
+    # o corte usa a nota como gravada (2 casas)
+    notas = _arredondar_notas(nota_total[vivas])
+    alcancou = notas >= ctx.min_nota
+    ctx.mantidas = vivas[alcancou]
+    saida = [coluna[ctx.mantidas] for coluna in saida]
+    saida.append(notas[alcancou])
+    return saida
+
+
+def _score_row(row: tuple, ctx: _Contexto) -> list[str]:
+    """Pontua uma linha e devolve os pontos parciais seguidos da nota final."""
+    cols = {idx: [row[idx]] for idx in _colunas_usadas(ctx.pares)}
+    return [c[0] for c in _formatar_saida(_score_block(cols, ctx), ctx.formatos)]
 
 
 def _process_row(row: tuple) -> list:
     """Process a single CSV row (tuple of values)."""
-    pontos_linha: list[str] = []
-    nota_total = 0.0
-    for j, (idx1, idx2, tipo, _) in enumerate(_WORK_PARES):
-        raw1 = str(row[idx1])
-        raw2 = str(row[idx2])
-        v1 = util.padroniza(raw1)
-        v2 = util.padroniza(raw2)
-        t = tipo.upper()
-        freq_map = _WORK_FREQ_MAPS.get(j)
-        if t == "D":
-            resultado = comparar_data(v1, v2)
-        elif t == "N":
-            resultado = comparar_nome(v1, v2, freq_map)
-        elif t == "C":
-            resultado = comparar_localidade(v1, v2)
-        elif t == "L":
-            resultado = comparar_logradouro(v1, v2)
-        elif t == "M":
-            resultado = comparar_numero(raw1, raw2)
-        else:
-            resultado = comparar_texto(v1, v2, freq_map or {})
-        pontos_linha.extend(resultado.pontos)
-        nota_total += resultado.nota
-    pontos_linha.append(DFMT(nota_total).replace(".", ","))
-    return list(row) + pontos_linha
+    return list(row) + _score_row(row, _WORK_CTX)
+
+
+def _pontuar_fatia(
+    cols: dict[int, list], ctx: _Contexto
+) -> tuple[list[np.ndarray], list[list[int]], np.ndarray | None]:
+    """Pontua um bloco e devolve também as contagens de deduplicação dele.
+
+    O terceiro item são as posições das linhas mantidas (``None``: todas).
+    """
+    pontos = _score_block(cols, ctx)
+    return pontos, ctx.tomar_contagens(), ctx.mantidas
+
+
+def _empacotar_colunas(cols: dict[int, list]) -> dict[int, tuple[str, array]]:
+    """Concatena cada coluna em um único texto e um array de tamanhos.
+
+    É o formato enviado aos processos: um objeto grande por coluna em vez de
+    milhares de strings individuais para serializar.
+    """
+    pacote = {}
+    for idx, valores in cols.items():
+        valores = [str(v) for v in valores]
+        pacote[idx] = ("".join(valores), array("I", map(len, valores)))
+    return pacote
+
+
+def _desempacotar_colunas(pacote: dict[int, tuple[str, array]]) -> dict[int, list[str]]:
+    cols = {}
+    for idx, (texto, tamanhos) in pacote.items():
+        fim = list(accumulate(tamanhos))
+        cols[idx] = [texto[a:b] for a, b in zip([0] + fim[:-1], fim)]
+    return cols
+
+
+@dataclass
+class _Lote:
+    """Faixa de linhas enviada a um processo trabalhador.
+
+    ``pacote`` traz as colunas da faixa que o lote usa (ver :func:`_empacotar_colunas`)
+    ou, com ``fonte`` (``(arquivo, sep, colunas no arquivo, posições lidas,
+    byte inicial, byte final)``), o trabalhador lê a faixa da entrada por
+    conta própria (ver :func:`indiceLinhas.ler_faixa`). Ele pontua, monta as
+    linhas de saída e grava o parcial ``destino`` com ``partes`` (ver
+    :class:`gravacaoSaida.Partes`), já ordenadas por ``sort_by`` quando ``ordenar``. Com
+    ``top_k`` (``(chave, k)``) grava só as ``k`` melhores linhas de cada chave
+    da faixa (ver :func:`selecaoTopK.reduzir`). ``copiadas`` são as colunas
+    do pacote que vão para a saída (``None``: todas).
+    """
+
+    numero: int
+    pacote: dict[int, tuple[str, array]] | None
+    destino: str
+    partes: gs.Partes
+    sort_by: str | None
+    ascending: bool
+    ordenar: bool
+    top_k: tuple[str, int] | None = None
+    copiadas: list[int] | None = None
+    fonte: tuple[str, str, int, list[int] | None, int, int] | None = None
+
+
+def _process_lote(lote: _Lote) -> tuple[int, int, int, list[list[int]], float]:
+    """Pontua um lote no processo trabalhador e grava o arquivo parcial.
+
+    Devolve ``(numero, linhas, linhas gravadas, contagens de deduplicação,
+    segundos gastos)``.
+    """
+    inicio = time.perf_counter()
+    ctx = _WORK_CTX
+    if lote.fonte is None:
+        cols = _desempacotar_colunas(lote.pacote)
+    else:
+        arquivo, sep, ncolunas, colunas, ini, fim = lote.fonte
+        df = il.ler_faixa(arquivo, sep, ini, fim, ncolunas, colunas=colunas)
+        cols = {i: df.iloc[:, i].tolist() for i in range(df.shape[1])}
+    linhas = len(next(iter(cols.values()))) if cols else 0
+    pontos, contagens, mantidas = _pontuar_fatia({idx: cols[idx] for idx in _colunas_usadas(ctx.pares)}, ctx)
+    entrada = [cols[i] for i in (range(len(cols)) if lote.copiadas is None else lote.copiadas)]
+    if mantidas is not None:
+        entrada = [[coluna[k] for k in mantidas.tolist()] for coluna in entrada]
+    out_df = pd.DataFrame(dict(enumerate(entrada + pontos)))
+    out_df.columns = lote.partes.header
+    if lote.top_k is not None:
+        out_df = stk.reduzir(out_df, *lote.top_k)
+    if lote.ordenar:
+        oe.gravar_run(out_df, lote.destino, lote.sort_by, lote.ascending, partes=lote.partes)
+    else:
+        lote.partes.gravar(out_df, Path(lote.destino))
+    return lote.numero, linhas, len(out_df), contagens, time.perf_counter() - inicio
 
 
 def _comparar_nome_flag(
@@ -91,22 +522,41 @@ def processar(
     sep: str = ";",
     sort_by: str | None = "nota final",
     ascending: bool = False,
+    colunas_saida: list[str] | None = None,
 ) -> None:
-    Nome1, Mae1, Nasc1, Nome2, Mae2, Nasc2 = idxs
+    """Pontua nome, nome da mãe e nascimento das colunas ``idxs``.
+
+    ``colunas_saida`` limita as colunas da entrada copiadas para a saída
+    (``None``: todas; ``[]``: nenhuma); só elas e as de ``idxs`` são lidas.
+    """
     freq_maps = fb.build_if_missing(arquivo_entrada, idxs, out_dir=cache_dir, sep=sep)
 
-    df = pd.read_csv(arquivo_entrada, sep=sep, dtype=str).fillna("")
+    copiadas = None
+    if colunas_saida is None:
+        df = pd.read_csv(arquivo_entrada, sep=sep, dtype=str).fillna("")
+    else:
+        colunas = list(pd.read_csv(arquivo_entrada, sep=sep, dtype=str, nrows=0).columns)
+        lidas, posicao, copiadas = _projetar(colunas, sorted(set(idxs)), colunas_saida)
+        df = pd.read_csv(arquivo_entrada, sep=sep, dtype=str, usecols=lidas).fillna("")
+        idxs = tuple(posicao[idx] for idx in idxs)
+    Nome1, Mae1, Nasc1, Nome2, Mae2, Nasc2 = idxs
+
+    # Datas pontuadas de uma vez (só as linhas com as duas datas em 8 dígitos)
+    datas1 = df.iloc[:, Nasc1].astype(str).tolist()
+    datas2 = df.iloc[:, Nasc2].astype(str).tolist()
+    com_data = [i for i, (d1, d2) in enumerate(zip(datas1, datas2)) if len(d1) == 8 and len(d2) == 8]
+    lote = comparar_data_batch([datas1[i] for i in com_data], [datas2[i] for i in com_data])
+    pontos_data = dict(zip(com_data, zip(*(formatar_flags(c.tolist()) for c in lote.pontos))))
+    notas_data = dict(zip(com_data, lote.nota.tolist()))
 
     linhas_saida = []
-    for _, row in df.iterrows():
+    for i, (_, row) in enumerate(df.iterrows()):
         # Normalização
         n1 = util.padroniza(row.iloc[Nome1])
         m1 = util.padroniza(row.iloc[Mae1])
-        d1 = str(row.iloc[Nasc1])
 
         n2 = util.padroniza(row.iloc[Nome2])
         m2 = util.padroniza(row.iloc[Mae2])
-        d2 = str(row.iloc[Nasc2])
 
         pontos: list[str] = ["0,0"] * 20  # 0..18 + nota final no 19
         nota_total = 0.0
@@ -119,14 +569,13 @@ def processar(
             resultado = _comparar_nome_flag(m1, m2, freq_maps, MAE)
             pontos[7:14] = resultado.pontos
             nota_total += resultado.nota
-        if len(d1) == 8 and len(d2) == 8:
-            resultado = comparar_data(d1, d2)
-            pontos[14:19] = resultado.pontos
-            nota_total += resultado.nota
+        if i in notas_data:
+            pontos[14:19] = pontos_data[i]
+            nota_total += notas_data[i]
 
         pontos[19] = DFMT(nota_total).replace(".", ",")
 
-        linhas_saida.append(list(row) + pontos)
+        linhas_saida.append((list(row) if copiadas is None else [row.iloc[k] for k in copiadas]) + pontos)
 
     header_criterios = [
         "prim frag igual",
@@ -150,7 +599,8 @@ def processar(
         "dt inv ano",
         "nota final",
     ]
-    header = list(df.columns) + header_criterios
+    entrada = list(df.columns) if copiadas is None else [df.columns[k] for k in copiadas]
+    header = entrada + header_criterios
     out_df = pd.DataFrame(linhas_saida, columns=header)
     if sort_by is not None:
         if sort_by not in out_df.columns:
@@ -161,11 +611,9 @@ def processar(
 
 
 def _build_freq_map(df: pd.DataFrame, idx1: int, idx2: int) -> dict[str, int]:
-    counter: dict[str, int] = {}
-    for val in pd.concat([df.iloc[:, idx1], df.iloc[:, idx2]]).astype(str):
-        parts = util.padroniza(val).split()
-        for p in parts:
-            counter[p] = counter.get(p, 0) + 1
+    counter: Counter = Counter()
+    for idx in (idx1, idx2):
+        fb.contar_tokens(counter, df.iloc[:, idx].fillna(""))
     return counter
 
 
@@ -175,6 +623,8 @@ def _build_name_freq_map(df: pd.DataFrame, idx1: int, idx2: int) -> list[dict[st
 
     This function processes two columns of a DataFrame, extracts name parts
     (first, middle, and last), and counts their occurrences across both columns.
+    The counting itself lives in :func:`freqBuilder.contar_partes_nome`, which
+    is also used by the chunked first pass of ``processar_generico``.
 
     Parameters:
         df (pd.DataFrame): The input DataFrame containing name data.
@@ -187,19 +637,372 @@ def _build_name_freq_map(df: pd.DataFrame, idx1: int, idx2: int) -> list[dict[st
             - The second dictionary maps middle name parts to their frequencies.
             - The third dictionary maps last name parts to their frequencies.
     """
-    first: dict[str, int] = {}
-    middle: dict[str, int] = {}
-    last: dict[str, int] = {}
-    for val in pd.concat([df.iloc[:, idx1], df.iloc[:, idx2]]).astype(str):
-        parts = util.padroniza(val).split()
-        if not parts:
-            continue
-        first_part, last_part = parts[0], parts[-1]
-        first[first_part] = first.get(first_part, 0) + 1
-        last[last_part] = last.get(last_part, 0) + 1
-        for m in parts[1:-1]:
-            middle[m] = middle.get(m, 0) + 1
-    return [first, middle, last]
+    counters: list[Counter] = [Counter(), Counter(), Counter()]
+    for idx in (idx1, idx2):
+        fb.contar_partes_nome(counters, df.iloc[:, idx].fillna(""))
+    return counters
+
+
+class _Progresso:
+    """Notifica ``progress_cb`` com porcentagem e ETA a cada linha pontuada."""
+
+    def __init__(self, progress_cb, total: int):
+        self.cb = progress_cb
+        self.total = total
+        self.last_pct = -1
+        self.last_eta_line = 0
+        self.last_eta_time = time.time()
+        self.last_eta = 0.0
+        if self.cb:
+            self.cb(0, f"0/{total}")
+
+    def atualizar(self, feitas: int) -> None:
+        if not self.cb:
+            return
+        total = self.total
+        if not (feitas % 1000 == 0 or feitas == total or int(feitas * 100 / total) != self.last_pct):
+            return
+        now = time.time()
+        pct = int(feitas * 100 / total)
+        if feitas % 1000 == 0 or feitas == total:
+            elapsed = now - self.last_eta_time
+            lines = feitas - self.last_eta_line
+            avg = elapsed / lines if lines else 0
+            self.last_eta = avg * (total - feitas)
+            self.last_eta_time = now
+            self.last_eta_line = feitas
+        else:
+            self.last_eta = max(0.0, self.last_eta - (now - self.last_eta_time))
+            self.last_eta_time = now
+        self.cb(pct, f"{feitas}/{total}", self.last_eta)
+        self.last_pct = pct
+
+    def concluir(self) -> None:
+        if self.cb and self.last_pct < 100:
+            self.cb(100, f"{self.total}/{self.total}", 0)
+
+
+class _TamanhoLote:
+    """Tamanho dos lotes enviados aos processos, ajustado pelo custo por linha.
+
+    Cada lote concluído informa quantas linhas tinha e quanto tempo levou; a
+    média móvel do custo por linha define o próximo tamanho, mirando
+    :data:`_LOTE_ALVO_SEG` por lote dentro de ``[_LOTE_MIN, _LOTE_MAX]``.
+    Pares baratos (datas, códigos) ganham lotes grandes e pouca comunicação;
+    pares caros (logradouros) ganham lotes menores e melhor balanceamento.
+    """
+
+    def __init__(self):
+        self.linhas = _LOTE_INICIAL
+        self.custo: float | None = None
+
+    def registrar(self, linhas: int, segundos: float) -> None:
+        if linhas <= 0:
+            return
+        custo = max(segundos, 1e-6) / linhas
+        self.custo = custo if self.custo is None else 0.7 * self.custo + 0.3 * custo
+        self.linhas = int(min(_LOTE_MAX, max(_LOTE_MIN, _LOTE_ALVO_SEG / self.custo)))
+
+
+class _ExecutorLocal:
+    """Executor que roda cada tarefa na hora, no próprio processo.
+
+    Substitui o :class:`ProcessPoolExecutor` quando há um único processo mas
+    o fluxo por lotes é necessário (checkpoints, ver :mod:`retomadaExecucao`).
+    """
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def submit(self, fn, *args) -> Future:
+        futuro: Future = Future()
+        try:
+            futuro.set_result(fn(*args))
+        except Exception as exc:
+            futuro.set_exception(exc)
+        return futuro
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        pass  # nada fica na fila: cada tarefa já rodou no submit
+
+    def __enter__(self) -> _ExecutorLocal:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _WORK_CTX
+        _WORK_CTX = None
+
+
+def _gravar_top_k(
+    selecao: stk.SelecaoTopK, gravador, *, sort_by: str | None, ascending: bool, partes: gs.Partes
+) -> int:
+    """Grava as linhas mantidas por ``selecao`` (ordenadas por ``sort_by``, estável); devolve quantas."""
+    out_df = selecao.resultado()
+    if sort_by is not None:
+        out_df.sort_values(by=sort_by, ascending=ascending, kind="stable", inplace=True, key=partes.chave)
+    gravador.gravar(out_df)
+    return len(out_df)
+
+
+def _executar_sequencial(
+    blocos,
+    pares,
+    freq_maps,
+    progresso: _Progresso,
+    estatisticas: Estatisticas,
+    *,
+    streaming: bool,
+    destino: Path,
+    gravador,
+    partes: gs.Partes,
+    sort_by: str | None,
+    ascending: bool,
+    min_nota: float | None,
+    top_k: tuple[str, int] | None,
+    copiadas: list[int] | None,
+) -> int:
+    """Pontua os blocos no próprio processo e grava a saída com ``gravador``; devolve as linhas feitas.
+
+    Os critérios seguem numéricos (``float64``) até o ``gravador``.
+    """
+    header = list(partes.header)
+    ctx = _Contexto(pares, freq_maps, min_nota)
+    usadas = _colunas_usadas(pares)
+    criterios = header[partes.inicio_criterios :]
+    selecao = stk.SelecaoTopK(header, *top_k) if top_k is not None else None
+    feitas = 0
+    with contextlib.ExitStack() as stack:
+        runs: list[Path] = []
+        tmp_dir: Path | None = None
+        for n, bloco in enumerate(blocos):
+            valores = {idx: bloco.iloc[:, idx].tolist() for idx in usadas}
+            pontuadas: list[list[np.ndarray]] = []
+            linhas_mantidas: list[np.ndarray] = []
+            for a in range(0, len(bloco), _BLOCO):
+                parte, contagens, mantidas = _pontuar_fatia(
+                    {idx: v[a : a + _BLOCO] for idx, v in valores.items()}, ctx
+                )
+                pontuadas.append(parte)
+                estatisticas.somar(contagens)
+                feitas += min(_BLOCO, len(bloco) - a)
+                if mantidas is not None:
+                    linhas_mantidas.append(a + mantidas)
+                    estatisticas.descartadas += min(_BLOCO, len(bloco) - a) - len(mantidas)
+                progresso.atualizar(feitas)
+            colunas = [np.concatenate(c) for c in zip(*pontuadas)] if pontuadas else [np.zeros(0) for _ in criterios]
+            pontos_df = pd.DataFrame(dict(enumerate(colunas)))
+            pontos_df.columns = criterios
+            if copiadas is not None:
+                bloco = bloco.iloc[:, copiadas]
+            if min_nota is not None:
+                bloco = bloco.iloc[np.concatenate(linhas_mantidas)] if linhas_mantidas else bloco.iloc[:0]
+            out_df = pd.concat([bloco.reset_index(drop=True), pontos_df], axis=1)
+
+            if selecao is not None:
+                selecao.adicionar(stk.reduzir(out_df, *top_k))
+            elif not streaming:
+                if sort_by is not None:
+                    out_df.sort_values(by=sort_by, ascending=ascending, inplace=True, key=partes.chave)
+                gravador.gravar(out_df)
+            elif sort_by is None:
+                gravador.gravar(out_df)
+            elif out_df.empty:
+                continue
+            else:
+                if tmp_dir is None:
+                    tmp_dir = Path(
+                        stack.enter_context(tempfile.TemporaryDirectory(prefix=".runs_", dir=destino.parent))
+                    )
+                runs.append(
+                    oe.gravar_run(out_df, tmp_dir / f"run_{n}{partes.extensao}", sort_by, ascending, partes=partes)
+                )
+
+        progresso.concluir()
+
+        if selecao is not None:
+            estatisticas.descartadas = feitas - _gravar_top_k(
+                selecao, gravador, sort_by=sort_by, ascending=ascending, partes=partes
+            )
+        elif runs:
+            oe.mesclar_runs(runs, destino, header, sort_by, ascending, gravar=gravador.gravar, partes=partes)
+    return feitas
+
+
+def _executar_paralelo(
+    blocos,
+    pares,
+    freq_maps,
+    workers: int,
+    progresso: _Progresso,
+    estatisticas: Estatisticas,
+    *,
+    streaming: bool,
+    destino: Path,
+    gravador,
+    partes: gs.Partes,
+    sort_by: str | None,
+    ascending: bool,
+    min_nota: float | None,
+    top_k: tuple[str, int] | None,
+    copiadas: list[int] | None,
+    retomada: rx.Retomada | None = None,
+    controle: ce.Controle | None = None,
+) -> int:
+    """Distribui faixas de linhas entre ``workers`` processos e costura o resultado.
+
+    Cada faixa (:class:`_Lote`, de tamanho dado por :class:`_TamanhoLote`) é
+    pontuada e gravada num arquivo parcial (ver :class:`gravacaoSaida.Partes`)
+    pelo próprio trabalhador; os lotes
+    terminam fora de ordem e no máximo ``2 * workers`` ficam pendentes. Ao
+    final os parciais são concatenados na ordem original, intercalados como
+    runs (streaming ordenado, ver :mod:`ordenacaoExterna`) ou, no modo em
+    memória com ordenação, relidos e ordenados como no modo sequencial. Com
+    ``top_k`` cada parcial já vem reduzido e os parciais são relidos em ordem
+    por uma :class:`selecaoTopK.SelecaoTopK`.
+
+    Quando ``blocos`` vem do índice de linhas (:class:`indiceLinhas.Leitura`)
+    o processo principal não lê a entrada: cada lote leva só a sua faixa de
+    bytes, interpretada pelo trabalhador.
+
+    Com ``retomada`` os parciais ficam na pasta do checkpoint e cada lote
+    concluído é registrado no manifesto; as faixas já concluídas numa
+    execução anterior não são pontuadas de novo, só entram na costura final
+    (ver :mod:`retomadaExecucao`). Com ``workers == 1`` os lotes rodam no
+    próprio processo.
+
+    ``controle`` é consultado antes de cada lote distribuído: na pausa os
+    lotes em andamento terminam (e são registrados) e nenhum novo é enviado;
+    no cancelamento os lotes na fila são descartados e
+    :class:`controleExecucao.ExecucaoCancelada` é levantada.
+    """
+    header = list(partes.header)
+    tamanho = _TamanhoLote()
+    ordenar = streaming and sort_by is not None and top_k is None
+    empacotadas = None if copiadas is None else sorted(set(copiadas) | set(_colunas_usadas(pares)))
+    arquivos: list[tuple[int, Path]] = []  # (primeira linha, parcial)
+    faixas: dict[int, tuple[int, int]] = {}
+    feitas = 0
+
+    def faixas_inteiras(inicio: int, fim: int) -> list[tuple[int, int]]:
+        return [(inicio, fim)] if inicio < fim else []
+
+    faltam = retomada.faltantes if retomada is not None else faixas_inteiras
+    if retomada is not None:
+        for faixa in retomada.concluidas:
+            arquivos.append((faixa.inicio, retomada.parte(faixa.inicio, faixa.fim)))
+            estatisticas.somar(faixa.contagens)
+            estatisticas.descartadas += faixa.linhas - faixa.gravadas
+            feitas += faixa.linhas
+        progresso.atualizar(feitas)
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            publicacao = stack.enter_context(tc.publicar(freq_maps))
+            ex = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=(pares, publicacao.descritor, min_nota)
+                )
+            )
+        else:
+            ex = stack.enter_context(_ExecutorLocal(_init_worker, (pares, freq_maps, min_nota)))
+        if retomada is not None:
+            tmp_dir = retomada.pasta
+        else:
+            tmp_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix=".lotes_", dir=destino.parent)))
+        pendentes: set = set()
+
+        def concluir(futuros) -> None:
+            nonlocal feitas
+            for futuro in futuros:
+                numero, linhas, gravadas, contagens, segundos = futuro.result()
+                if retomada is not None:
+                    retomada.registrar(rx.Faixa(*faixas[numero], gravadas, contagens))
+                tamanho.registrar(linhas, segundos)
+                estatisticas.somar(contagens)
+                estatisticas.descartadas += linhas - gravadas
+                feitas += linhas
+                progresso.atualizar(feitas)
+
+        def fatias():
+            """``(inicio, fim, pacote, fonte)`` de cada lote, com o tamanho atual de ``tamanho``.
+
+            ``inicio`` e ``fim`` são linhas da entrada (o índice dos blocos com
+            ``retomada``, a contagem das linhas recebidas sem ela).
+            """
+            if isinstance(blocos, il.Leitura):
+                indice = blocos.indice
+                for a, b in faltam(blocos.inicio, len(indice)):
+                    while a < b:
+                        fim = min(a + tamanho.linhas, b)
+                        ini_bytes, fim_bytes = indice.faixa(a, fim)
+                        fonte = (indice.arquivo, indice.sep, len(indice.nomes), blocos.colunas, ini_bytes, fim_bytes)
+                        yield a, fim, None, fonte
+                        a = fim
+                return
+            vistas = 0
+            for bloco in blocos:
+                base = int(bloco.index[0]) if retomada is not None and len(bloco) else vistas
+                vistas += len(bloco)
+                for a, b in faltam(base, base + len(bloco)):
+                    while a < b:
+                        fim = min(a + tamanho.linhas, b)
+                        fatia = bloco.iloc[a - base : fim - base]
+                        colunas = {i: fatia.iloc[:, i].tolist() for i in (empacotadas or range(fatia.shape[1]))}
+                        yield a, fim, _empacotar_colunas(colunas), None
+                        a = fim
+
+        def liberar() -> None:
+            """Espera o fim da pausa, concluindo os lotes em andamento enquanto isso."""
+            nonlocal pendentes
+            while controle.pausado and pendentes:
+                prontos, pendentes = wait(pendentes, timeout=0.2, return_when=FIRST_COMPLETED)
+                concluir(prontos)
+            controle.aguardar()
+
+        try:
+            for inicio, fim, pacote, fonte in fatias():
+                if controle is not None:
+                    liberar()
+                numero = len(faixas)
+                if retomada is not None:
+                    parte = retomada.parte(inicio, fim)
+                else:
+                    parte = tmp_dir / f"lote_{numero}{partes.extensao}"
+                lote = _Lote(numero, pacote, str(parte), partes, sort_by, ascending, ordenar, top_k, copiadas, fonte)
+                faixas[numero] = (inicio, fim)
+                arquivos.append((inicio, parte))
+                pendentes.add(ex.submit(_process_lote, lote))
+                if len(pendentes) >= 2 * workers:
+                    prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    concluir(prontos)
+            concluir(pendentes)
+            if controle is not None:
+                controle.verificar()
+        except ce.ExecucaoCancelada:
+            ex.shutdown(wait=False, cancel_futures=True)  # só os lotes já em andamento terminam
+            raise
+        progresso.concluir()
+
+        arquivos = [parte for _, parte in sorted(arquivos, key=lambda item: item[0])]
+        if top_k is not None:
+            selecao = stk.SelecaoTopK(header, *top_k)
+            for parte in arquivos:
+                for parcial in partes.ler(parte):
+                    selecao.adicionar(parcial)
+            estatisticas.descartadas = feitas - _gravar_top_k(
+                selecao, gravador, sort_by=sort_by, ascending=ascending, partes=partes
+            )
+        elif ordenar and arquivos:
+            oe.mesclar_runs(arquivos, destino, header, sort_by, ascending, gravar=gravador.gravar, partes=partes)
+        elif sort_by is not None and not streaming and arquivos:
+            parciais = [parcial for parte in arquivos for parcial in partes.ler(parte)]
+            if parciais:
+                out_df = pd.concat(parciais, ignore_index=True)
+                out_df.sort_values(by=sort_by, ascending=ascending, inplace=True, key=partes.chave)
+                gravador.gravar(out_df)
+        else:
+            for parte in arquivos:
+                gravador.copiar_parte(parte)
+    return feitas
 
 
 def processar_generico(
@@ -212,7 +1015,18 @@ def processar_generico(
     sort_by: str | None = "nota final",
     ascending: bool = False,
     workers: int | None = None,
-) -> None:
+    chunksize: int | None = None,
+    cache_dir: str | None = None,
+    min_nota: float | None = None,
+    top_k: int | None = None,
+    chave_registro: str | None = None,
+    formato: str = "csv",
+    motor: str = "auto",
+    colunas_saida: list[str] | None = None,
+    linha_inicial: int = 0,
+    checkpoint_dir: str | None = None,
+    controle: ce.Controle | None = None,
+) -> Estatisticas:
     """Processa genericamente pares de colunas.
 
     ``pares`` contém ``(idx1, idx2, tipo, nome)`` onde ``tipo`` é ``"T"`` para
@@ -224,112 +1038,265 @@ def processar_generico(
     ``progress_cb`` recebe ``(pct, msg, eta)`` para atualizar uma barra de
     progresso opcional.
     ``workers`` define o número de processos para paralelizar o cálculo
-    (``None`` usa ``os.cpu_count()``).
+    (``None`` usa ``os.cpu_count()``). Com mais de um processo, faixas de
+    linhas de tamanho adaptativo são pontuadas fora de ordem em arquivos
+    parciais e costuradas ao final (ver :func:`_executar_paralelo`).
+
+    ``chunksize`` ativa o modo streaming: a entrada é lida em blocos desse
+    número de linhas, cada bloco é pontuado e anexado à saída, de modo que a
+    memória usada não depende do tamanho do arquivo. Nesse modo a ordenação
+    por ``sort_by`` é feita por ordenação externa (runs temporárias
+    intercaladas ao final, ver :mod:`ordenacaoExterna`).
+
+    ``cache_dir`` guarda as tabelas de frequência em disco, indexadas pela
+    impressão digital do arquivo, pelo separador e por cada par
+    ``(idx1, idx2, tipo)`` (ver :func:`freqBuilder.cached_pares`); reexecuções
+    sobre a mesma entrada pulam a passada de frequências.
+
+    Cada combinação distinta de valores de um par é pontuada uma única vez
+    (ver :func:`_score_block`); a :class:`Estatisticas` devolvida traz, por
+    par, quantas linhas foram comparadas e quantas combinações pontuadas.
+
+    ``min_nota`` grava apenas as linhas com nota final ``>= min_nota``. Os
+    pares baratos (datas, localidades, números) são avaliados primeiro e uma
+    linha que já não pode alcançar a nota mínima não passa pelos comparadores
+    caros (nomes, textos, logradouros); as descartadas são contadas em
+    :attr:`Estatisticas.descartadas`.
+
+    ``top_k`` com ``chave_registro`` (coluna que identifica o registro, ex.:
+    o id do lado esquerdo) grava só as ``top_k`` linhas de maior nota de
+    cada registro: os blocos são reduzidos à medida que são pontuados e um
+    heap de tamanho ``top_k`` por registro guarda as melhores (ver
+    :mod:`selecaoTopK`), sem gravar nem ordenar todas as linhas. A saída vem
+    agrupada por registro, melhor nota primeiro, e ``sort_by`` (se houver)
+    reordena apenas esse resultado reduzido.
+
+    ``formato`` escolhe o arquivo gravado: ``"csv"`` (padrão, ``arquivo_saida``
+    + ``.csv``), ``"parquet"`` (``.parquet``) ou ``"feather"`` (Arrow IPC,
+    ``.feather``). Nos formatos colunares, que exigem o ``pyarrow``, os
+    critérios são gravados como ``float32`` e a nota final como ``float64``,
+    bloco a bloco (ver :mod:`gravacaoSaida`); a formatação pt-BR (``"0,75"``)
+    só existe no CSV.
+
+    ``motor`` escolhe o leitor da entrada (ver :mod:`leituraEntrada`):
+    ``"auto"`` (padrão) usa o leitor CSV multithread do ``pyarrow`` quando ele
+    está instalado e o ``pd.read_csv`` caso contrário; ``"pandas"`` e
+    ``"pyarrow"`` forçam um deles. A passada de frequências do modo
+    streaming lê só as colunas dos pares T/N. ``"mmap"`` lê pelo índice de
+    deslocamentos das linhas (ver :mod:`indiceLinhas`), construído na
+    primeira leitura e guardado em ``cache_dir``: com mais de um processo no
+    modo streaming, cada trabalhador lê a sua faixa de bytes da entrada.
+
+    ``colunas_saida`` escolhe as colunas da entrada copiadas para a saída, na
+    ordem do arquivo (``None``, o padrão, copia todas; ``[]`` grava só os
+    critérios). Com ela a entrada é projetada: só as colunas dos ``pares`` e
+    as de saída são lidas, e o custo da leitura passa a depender do número de
+    campos comparados, e não da largura do arquivo.
+
+    ``linha_inicial`` recomeça o processamento nessa linha de dados (a
+    primeira é a ``0``): só as linhas seguintes são pontuadas e gravadas,
+    com as frequências calculadas sobre o arquivo inteiro. Com o motor
+    ``"mmap"`` as linhas anteriores nem são lidas no modo streaming.
+
+    ``checkpoint_dir`` torna a execução retomável: cada lote pontuado é
+    gravado num arquivo parcial nessa pasta e registrado num manifesto com a
+    impressão digital da entrada, os ``pares`` e os demais parâmetros que
+    mudam a saída (ver :mod:`retomadaExecucao`). Se o processo cair, rodar
+    de novo com os mesmos parâmetros pontua só as faixas que faltam e costura
+    a saída com as já prontas; o checkpoint é apagado ao final. Nesse modo os
+    lotes passam pelo fluxo do executor paralelo mesmo com um único processo.
+
+    ``controle`` (:class:`controleExecucao.Controle`) permite pausar e
+    cancelar a execução a partir de outra thread. Ele é consultado entre os
+    blocos da passada de frequências (modo streaming) e entre os lotes da
+    pontuação, que passam pelo fluxo por lotes. O cancelamento levanta
+    :class:`controleExecucao.ExecucaoCancelada`, apaga a saída incompleta e
+    mantém o checkpoint, se houver.
     """
-    df = pd.read_csv(arquivo_entrada, sep=sep, dtype=str).fillna("")
-    total = len(df)
-    if progress_cb:
-        progress_cb(0, f"0/{total}")
-
-    freq_maps: dict[int, Any] = {}
-    for i, (idx1, idx2, tipo, _) in enumerate(pares):
-        t = tipo.upper()
-        if t == "T":
-            freq_maps[i] = _build_freq_map(df, idx1, idx2)
-        elif t == "N":
-            freq_maps[i] = _build_name_freq_map(df, idx1, idx2)
+    colunas = le.cabecalho(arquivo_entrada, sep)
+    lidas = copiadas = None
+    pares_lidos = pares
+    if colunas_saida is None:
+        _header_saida(colunas, pares, sort_by)
+    else:
+        lidas, posicao, copiadas = _projetar(colunas, _colunas_usadas(pares), colunas_saida)
+        pares_lidos = [(posicao[idx1], posicao[idx2], tipo, nome) for idx1, idx2, tipo, nome in pares]
+        _header_saida([colunas[lidas[k]] for k in copiadas], pares, sort_by)
+    gs.validar_formato(formato)
+    le.resolver_motor(motor, sep)
+    if linha_inicial < 0:
+        raise ValueError("linha_inicial não pode ser negativa")
+    retomada = None
+    inicio = linha_inicial
+    if checkpoint_dir is not None:
+        assinatura = dict(
+            entrada=fb.fingerprint(arquivo_entrada),
+            sep=sep,
+            pares=pares,
+            colunas_saida=colunas_saida,
+            linha_inicial=linha_inicial,
+            streaming=chunksize is not None,
+            sort_by=sort_by,
+            ascending=ascending,
+            min_nota=min_nota,
+            top_k=[chave_registro, top_k] if top_k is not None else None,
+            formato=formato,
+        )
+        retomada = rx.Retomada(checkpoint_dir, assinatura, extensao=gs.EXTENSOES_PARTES[formato])
+        inicio = retomada.continuo(linha_inicial)
+
+    if chunksize is None:
+        df = next(le.ler(arquivo_entrada, sep, colunas=lidas, motor=motor, cache_dir=cache_dir))
+        if cache_dir is None:
+            total, freq_maps = fb.count_pares([df], pares, lidas)
         else:
-            freq_maps[i] = None
+            total, freq_maps = fb.cached_pares(
+                arquivo_entrada, pares, lambda sub: fb.count_pares([df], sub, lidas), sep=sep, cache_dir=cache_dir
+            )
+        blocos = iter([df.iloc[inicio:]])
+    else:
+        if chunksize < 1:
+            raise ValueError("chunksize deve ser positivo")
+        total, freq_maps = fb.build_for_pares(
+            arquivo_entrada, pares, sep=sep, chunksize=chunksize, cache_dir=cache_dir, motor=motor, controle=controle
+        )
+        blocos = le.ler(
+            arquivo_entrada,
+            sep,
+            chunksize=chunksize,
+            colunas=lidas,
+            motor=motor,
+            inicio=inicio,
+            cache_dir=cache_dir,
+        )
+    if controle is not None:
+        controle.verificar()  # cancelado durante a passada de frequências
+
+    return processar_blocos(
+        blocos,
+        colunas if lidas is None else [colunas[idx] for idx in lidas],
+        pares_lidos,
+        freq_maps,
+        max(total - linha_inicial, 0),
+        arquivo_saida,
+        sep=sep,
+        progress_cb=progress_cb,
+        sort_by=sort_by,
+        ascending=ascending,
+        workers=workers,
+        streaming=chunksize is not None,
+        min_nota=min_nota,
+        top_k=top_k,
+        chave_registro=chave_registro,
+        formato=formato,
+        colunas_saida=copiadas,
+        retomada=retomada,
+        controle=controle,
+    )
 
-    linhas = []
-    start = time.time()
-    last_pct = -1
-    last_eta_line = 0
-    last_eta_time = start
-    last_eta = 0.0
+
+def _header_saida(colunas: list[str], pares, sort_by: str | None) -> list[str]:
+    header = list(colunas) + build_criterios_labels(pares)
+    if sort_by is not None and sort_by not in header:
+        raise ValueError(f"Coluna '{sort_by}' não encontrada para ordenação")
+    return header
+
+
+def processar_blocos(
+    blocos,
+    colunas: list[str],
+    pares: list[tuple[int, int, str, str]],
+    freq_maps: dict,
+    total: int,
+    arquivo_saida: str,
+    *,
+    sep: str = "|",
+    progress_cb=None,
+    sort_by: str | None = "nota final",
+    ascending: bool = False,
+    workers: int | None = None,
+    streaming: bool = True,
+    min_nota: float | None = None,
+    top_k: int | None = None,
+    chave_registro: str | None = None,
+    formato: str = "csv",
+    colunas_saida: list[int] | None = None,
+    retomada: rx.Retomada | None = None,
+    controle: ce.Controle | None = None,
+) -> Estatisticas:
+    """Pontua ``blocos`` já montados e grava ``arquivo_saida`` + ``.csv``.
+
+    É o estágio de pontuação de :func:`processar_generico`, exposto para quem
+    gera os pares por conta própria (ex.: :mod:`blocagem`). ``blocos`` são
+    DataFrames com as ``colunas`` (valores ``str``), ``freq_maps`` está no
+    formato de :func:`freqBuilder.count_pares` e ``total`` é o número de linhas
+    esperado, usado só no progresso. Com ``streaming`` os blocos são gravados
+    à medida que chegam (ordenação externa quando há ``sort_by``); sem ele há
+    um único bloco, ordenado em memória. ``min_nota``, ``top_k``,
+    ``chave_registro`` e ``formato`` funcionam como em
+    :func:`processar_generico`. ``colunas_saida`` são as posições, em
+    ``colunas``, das colunas copiadas para a saída (``None``: todas).
+
+    Com ``retomada`` os lotes pontuados ficam no checkpoint (os blocos devem
+    trazer o número da linha da entrada no índice) e o checkpoint é apagado
+    depois que a saída é gravada. Com ``controle`` a execução pode ser
+    pausada ou cancelada entre lotes; no cancelamento a saída incompleta é
+    apagada (o checkpoint, se houver, fica para a próxima execução).
+    """
+    copiadas = list(colunas_saida) if colunas_saida is not None else None
+    entrada = list(colunas) if copiadas is None else [colunas[k] for k in copiadas]
+    header = _header_saida(entrada, pares, sort_by)
+    gs.validar_formato(formato)
+    if top_k is not None:
+        if top_k < 1:
+            raise ValueError("top_k deve ser positivo")
+        if chave_registro not in entrada:
+            raise ValueError(f"Coluna '{chave_registro}' não encontrada para o top_k")
+    progresso = _Progresso(progress_cb, total)
 
     if workers is None:
         workers = os.cpu_count() or 1
     if workers < 1:
         workers = 1
 
-    if workers == 1:
-        row_iter = df.itertuples(index=False, name=None)
-        for i, row in enumerate(row_iter):
-            pontos_linha: list[str] = []
-            nota_total = 0.0
-            for j, (idx1, idx2, tipo, _) in enumerate(pares):
-                raw1 = str(row[idx1])
-                raw2 = str(row[idx2])
-                v1 = util.padroniza(raw1)
-                v2 = util.padroniza(raw2)
-                t = tipo.upper()
-                freq_map = freq_maps.get(j)
-                if t == "D":
-                    resultado = comparar_data(v1, v2)
-                elif t == "N":
-                    resultado = comparar_nome(v1, v2, freq_map)
-                elif t == "C":
-                    resultado = comparar_localidade(v1, v2)
-                elif t == "L":
-                    resultado = comparar_logradouro(v1, v2)
-                elif t == "M":
-                    resultado = comparar_numero(raw1, raw2)
-                else:
-                    resultado = comparar_texto(v1, v2, freq_map or {})
-                pontos_linha.extend(resultado.pontos)
-                nota_total += resultado.nota
-            pontos_linha.append(DFMT(nota_total).replace(".", ","))
-            linhas.append(list(row) + pontos_linha)
-            now = time.time()
-            if progress_cb and (
-                (i + 1) % 1000 == 0 or i + 1 == total or int((i + 1) * 100 / total) != last_pct
-            ):
-                pct = int((i + 1) * 100 / total)
-                if (i + 1) % 1000 == 0 or i + 1 == total:
-                    elapsed = now - last_eta_time
-                    lines = (i + 1) - last_eta_line
-                    avg = elapsed / lines if lines else 0
-                    last_eta = avg * (total - (i + 1))
-                    last_eta_time = now
-                    last_eta_line = i + 1
-                else:
-                    last_eta = max(0.0, last_eta - (now - last_eta_time))
-                    last_eta_time = now
-                progress_cb(pct, f"{i+1}/{total}", last_eta)
-                last_pct = pct
-    else:
-        rows = list(df.itertuples(index=False, name=None))
-        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pares, freq_maps)) as ex:
-            for i, linha in enumerate(ex.map(_process_row, rows, chunksize=100)):
-                linhas.append(linha)
-                now = time.time()
-                if progress_cb and (
-                    (i + 1) % 1000 == 0 or i + 1 == total or int((i + 1) * 100 / total) != last_pct
-                ):
-                    pct = int((i + 1) * 100 / total)
-                    if (i + 1) % 1000 == 0 or i + 1 == total:
-                        elapsed = now - last_eta_time
-                        lines = (i + 1) - last_eta_line
-                        avg = elapsed / lines if lines else 0
-                        last_eta = avg * (total - (i + 1))
-                        last_eta_time = now
-                        last_eta_line = i + 1
-                    else:
-                        last_eta = max(0.0, last_eta - (now - last_eta_time))
-                        last_eta_time = now
-                    progress_cb(pct, f"{i+1}/{total}", last_eta)
-                    last_pct = pct
-
-    if progress_cb and last_pct < 100:
-        progress_cb(100, f"{total}/{total}", 0)
-
-    header_criterios = build_criterios_labels(pares)
-
-    header = list(df.columns) + header_criterios
-    out_df = pd.DataFrame(linhas, columns=header)
-    if sort_by is not None:
-        if sort_by not in out_df.columns:
-            raise ValueError(f"Coluna '{sort_by}' não encontrada para ordenação")
-        out_df.sort_values(by=sort_by, ascending=ascending, inplace=True)
-    out_df.to_csv(f"{arquivo_saida}.csv", sep=sep, index=False)
+    destino = Path(f"{arquivo_saida}{gs.EXTENSOES[formato]}")
+    estatisticas = Estatisticas(pares=[EstatisticasPar(nome) for _, _, _, nome in pares])
+    formatos = build_criterios_formatos(pares)
+    partes = gs.Partes(formato, tuple(header), len(entrada), tuple(formatos), sep)
+    try:
+        with gs.abrir(formato, destino, header, len(entrada), sep=sep, formatos=formatos) as gravador:
+            saida = dict(
+                destino=destino,
+                gravador=gravador,
+                partes=partes,
+                sort_by=sort_by,
+                ascending=ascending,
+                min_nota=min_nota,
+                top_k=(chave_registro, top_k) if top_k is not None else None,
+                copiadas=copiadas,
+            )
+            if workers > 1 or retomada is not None or controle is not None:
+                feitas = _executar_paralelo(
+                    blocos,
+                    pares,
+                    freq_maps,
+                    workers,
+                    progresso,
+                    estatisticas,
+                    streaming=streaming,
+                    retomada=retomada,
+                    controle=controle,
+                    **saida,
+                )
+            else:
+                feitas = _executar_sequencial(
+                    blocos, pares, freq_maps, progresso, estatisticas, streaming=streaming, **saida
+                )
+    except ce.ExecucaoCancelada:
+        destino.unlink(missing_ok=True)  # saída incompleta
+        raise
+
+    if retomada is not None:
+        retomada.remover()
+    estatisticas.linhas = feitas
+    return estatisticas
@@ -2,22 +2,46 @@
 
 from .core import (
     ComparacaoResultado,
+    ResultadoLote,
+    build_criterios_formatos,
     build_criterios_labels,
     comparar_data,
+    comparar_data_batch,
     comparar_logradouro,
+    comparar_logradouro_normalizado,
     comparar_localidade,
+    comparar_localidade_batch,
     comparar_nome,
+    comparar_nome_ids,
     comparar_numero,
+    comparar_numero_batch,
     comparar_texto,
+    comparar_texto_ids,
+    formatar_flags,
+    normalizar_logradouro,
 )
+from .utils import formatar_coluna
+from .vocabulario import Vocabulario
 
 __all__ = [
     "ComparacaoResultado",
+    "ResultadoLote",
+    "build_criterios_formatos",
     "build_criterios_labels",
     "comparar_data",
+    "comparar_data_batch",
     "comparar_logradouro",
+    "comparar_logradouro_normalizado",
     "comparar_localidade",
+    "comparar_localidade_batch",
     "comparar_nome",
+    "comparar_nome_ids",
     "comparar_numero",
+    "comparar_numero_batch",
     "comparar_texto",
+    "comparar_texto_ids",
+    "formatar_coluna",
+    "formatar_flags",
+    "normalizar_logradouro",
+    "Vocabulario",
 ]
@@ -4,24 +4,30 @@ from dataclasses import dataclass
 from typing import Iterable, Sequence
 
 from . import data, logradouro, localidade, nomes, numeros, texto
+from .utils import RAZAO, ResultadoLote
+from .vocabulario import Vocabulario
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ComparacaoResultado:
     """Container que armazena os pontos parciais e a nota final."""
 
-    pontos: list[str]
+    pontos: Sequence[str]
     nota: float
 
     @property
     def pontos_formatados(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+        return list(self.pontos) + [f"{self.nota:.2f}".replace(".", ",")]
 
 
 def comparar_data(v1: str, v2: str) -> ComparacaoResultado:
     return data.comparar(v1, v2)
 
 
+def comparar_data_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    return data.comparar_batch(col1, col2)
+
+
 def comparar_nome(
     v1: str,
     v2: str,
@@ -32,26 +38,89 @@ def comparar_nome(
     return nomes.comparar(v1, v2, freq_maps, incluir_abreviaturas=incluir_abreviaturas)
 
 
+def comparar_nome_ids(
+    ids1: Sequence[int],
+    ids2: Sequence[int],
+    vocab: Vocabulario,
+    freq_tabelas: Sequence[Sequence[int]] | None = None,
+) -> ComparacaoResultado:
+    return nomes.comparar_ids(ids1, ids2, vocab, freq_tabelas)
+
+
 def comparar_texto(v1: str, v2: str, freq: dict[str, int] | None = None) -> ComparacaoResultado:
     return texto.comparar(v1, v2, freq or {})
 
 
+def comparar_texto_ids(
+    ids1: Sequence[int],
+    ids2: Sequence[int],
+    vocab: Vocabulario,
+    freq_tabela: Sequence[int],
+) -> ComparacaoResultado:
+    return texto.comparar_ids(ids1, ids2, vocab, freq_tabela)
+
+
 def comparar_localidade(v1: str, v2: str) -> ComparacaoResultado:
     return localidade.comparar(v1, v2)
 
 
+def comparar_localidade_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    return localidade.comparar_batch(col1, col2)
+
+
 def comparar_logradouro(v1: str, v2: str) -> ComparacaoResultado:
     return logradouro.comparar(v1, v2)
 
 
+def normalizar_logradouro(valor: str) -> logradouro.LogradouroNormalizado:
+    return logradouro.normalizar(valor)
+
+
+def comparar_logradouro_normalizado(
+    dados1: logradouro.LogradouroNormalizado, dados2: logradouro.LogradouroNormalizado
+) -> ComparacaoResultado:
+    return logradouro.comparar_normalizados(dados1, dados2)
+
+
 def formatar_resultado(pontos: Iterable[float]) -> list[str]:
     return [f"{p:.2f}".replace(".", ",") for p in pontos]
 
 
+_FLAGS_FORMATADOS = {0.0: "0,0", 1.0: "1,0"}
+
+
+def formatar_flags(pontos: Iterable[float]) -> list[str]:
+    """Formata critérios pontuais (``"1,0"``, ``"0,5"``) como os comparadores escalares."""
+    cache = _FLAGS_FORMATADOS
+    return [cache.get(p) or f"{p:.1f}".replace(".", ",") for p in pontos]
+
+
 def comparar_numero(v1: str, v2: str) -> ComparacaoResultado:
     return numeros.comparar(v1, v2)
 
 
+def comparar_numero_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    return numeros.comparar_batch(col1, col2)
+
+
+# Formatos dos critérios de cada tipo de par (nomes e textos: padrão)
+_FORMATOS_TIPO = {
+    "D": data.ResultadoData.FORMATOS,
+    "C": localidade.ResultadoLocalidade.FORMATOS,
+    "L": logradouro.comparador.ResultadoLogradouro.FORMATOS,
+    "M": numeros.ResultadoNumero.FORMATOS,
+}
+
+
+def build_criterios_formatos(pares: Sequence[tuple[int, int, str, str]]) -> list[str]:
+    """Formato de gravação (ver :func:`utils.formatar_coluna`) de cada coluna de :func:`build_criterios_labels`."""
+    formatos: list[str] = []
+    for _, _, tipo, _ in pares:
+        formatos += _FORMATOS_TIPO.get((tipo or "").upper(), nomes.ResultadoNome.FORMATOS)
+    formatos.append(RAZAO)  # nota final
+    return formatos
+
+
 def build_criterios_labels(pares: Sequence[tuple[int, int, str, str]]) -> list[str]:
     header_criterios: list[str] = []
     for _, _, tipo, nome in pares:
@@ -1,42 +1,76 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
 
 from util import levenshtein
 
+from .utils import FLAG, ResultadoLote, ResultadoPar, como_codigos, levenshtein_fixo
 
-@dataclass
-class ResultadoData:
-    pontos: list[str]
-    nota: float
 
-    def formatado(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+class ResultadoData(ResultadoPar):
+    __slots__ = ()
 
+    FORMATOS = (FLAG,) * 5
 
-def comparar(d1: str, d2: str) -> ResultadoData:
-    pontos = ["0,0"] * 5
-    nota = 0.0
 
-    if d1 == d2:
-        nota += 1
-        pontos[0] = "1,0"
+def comparar(d1: str, d2: str) -> ResultadoData:
+    igual = 1.0 if d1 == d2 else 0.0
+    ap_1digi = inv_dia = inv_mes = inv_ano = 0.0
 
     dist = levenshtein(d1, d2)
     if dist == 1:
-        nota += 1
-        pontos[1] = "1,0"
+        ap_1digi = 1.0
     elif dist == 2 and len(d1) == 8 and len(d2) == 8:
         dia1, mes1, ano1 = d1[6:], d1[4:6], d1[:4]
         dia2, mes2, ano2 = d2[6:], d2[4:6], d2[:4]
         if dia1[::-1] == dia2:
-            nota += 1
-            pontos[2] = "1,0"
+            inv_dia = 1.0
         elif mes1[::-1] == mes2:
-            nota += 1
-            pontos[3] = "1,0"
+            inv_mes = 1.0
         elif levenshtein(ano1, ano2) == 2 and sorted(ano1) == sorted(ano2):
-            nota += 1
-            pontos[4] = "1,0"
+            inv_ano = 1.0
+
+    nota = igual + ap_1digi + inv_dia + inv_mes + inv_ano
+    return ResultadoData((igual, ap_1digi, inv_dia, inv_mes, inv_ano), nota)
+
+
+def comparar_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    """Versão vetorizada de :func:`comparar` para colunas inteiras.
+
+    Pares em que as duas datas têm 8 caracteres (``AAAAMMDD``) são pontuados
+    com NumPy sobre matrizes de code points; os demais (vazios ou malformados)
+    passam pela versão escalar. Devolve as 5 colunas de critérios (0/1) e a
+    nota, idênticas às de :func:`comparar`.
+    """
+    n = len(col1)
+    pontos = np.zeros((5, n))
+    l1 = np.fromiter(map(len, col1), dtype=np.int64, count=n)
+    l2 = np.fromiter(map(len, col2), dtype=np.int64, count=n)
+    fixo = (l1 == 8) & (l2 == 8)
+
+    idx = np.flatnonzero(fixo)
+    if len(idx):
+        a = como_codigos([col1[i] for i in idx], 8)
+        b = como_codigos([col2[i] for i in idx], 8)
+        dist = levenshtein_fixo(a, b)
+        dist2 = dist == 2
+        dia = dist2 & (a[:, 7] == b[:, 6]) & (a[:, 6] == b[:, 7])
+        mes = dist2 & ~dia & (a[:, 5] == b[:, 4]) & (a[:, 4] == b[:, 5])
+        resto = dist2 & ~dia & ~mes
+        ano = np.zeros(len(idx), dtype=bool)
+        if resto.any():
+            ra, rb = a[resto, :4], b[resto, :4]
+            ano[resto] = (levenshtein_fixo(ra, rb) == 2) & (np.sort(ra, axis=1) == np.sort(rb, axis=1)).all(axis=1)
+        pontos[0, idx] = (a == b).all(axis=1)
+        pontos[1, idx] = dist == 1
+        pontos[2, idx] = dia
+        pontos[3, idx] = mes
+        pontos[4, idx] = ano
+
+    for i in np.flatnonzero(~fixo):
+        pontos[:, i] = comparar(col1[i], col2[i]).valores
 
-    return ResultadoData(pontos, nota)
+    nota = pontos[0] + pontos[1] + pontos[2] + pontos[3] + pontos[4]
+    return ResultadoLote(list(pontos), nota)
@@ -1,54 +1,131 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
 
 from util import levenshtein, soundex
 
+from .utils import FLAG, ResultadoLote, ResultadoPar, como_codigos, levenshtein_fixo
 
-@dataclass
-class ResultadoLocalidade:
-    pontos: list[str]
-    nota: float
 
-    def formatado(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+class ResultadoLocalidade(ResultadoPar):
+    __slots__ = ()
 
+    FORMATOS = (FLAG,) * 4
+
+
+_SEM_CODIGO = ResultadoLocalidade((0.0,) * 4, 0.0)
 
-def comparar(loc1: str, loc2: str) -> ResultadoLocalidade:
-    pontos = ["0,0"] * 4
-    nota = 0.0
 
+def comparar(loc1: str, loc2: str) -> ResultadoLocalidade:
     if len(loc1) != 6 or len(loc2) != 6:
-        return ResultadoLocalidade(pontos, nota)
+        return _SEM_CODIGO
 
     uf1, cod1 = loc1[:2].upper(), loc1[2:].upper()
     uf2, cod2 = loc2[:2].upper(), loc2[2:].upper()
+    uf_igual = uf_prox = local_igual = local_prox = 0.0
 
     if uf1 == uf2:
-        nota += 1
-        pontos[0] = "1,0"
+        uf_igual = 1.0
     else:
         dist_uf = levenshtein(uf1, uf2)
         if dist_uf == 1:
-            nota += 0.5
-            pontos[1] = "0,5"
+            uf_prox = 0.5
         elif soundex(uf1) == soundex(uf2):
-            nota += 0.3
-            pontos[1] = "0,3"
+            uf_prox = 0.3
 
     if cod1 == cod2:
-        nota += 1
-        pontos[2] = "1,0"
+        local_igual = 1.0
     else:
         dist_cod = levenshtein(cod1, cod2)
         if dist_cod == 1:
-            nota += 0.8
-            pontos[3] = "0,8"
+            local_prox = 0.8
         elif dist_cod == 2:
-            nota += 0.5
-            pontos[3] = "0,5"
+            local_prox = 0.5
         elif not (cod1.isdigit() and cod2.isdigit()) and soundex(cod1) == soundex(cod2):
-            nota += 0.4
-            pontos[3] = "0,4"
+            local_prox = 0.4
+
+    nota = uf_igual + uf_prox + local_igual + local_prox
+    return ResultadoLocalidade((uf_igual, uf_prox, local_igual, local_prox), nota)
+
+
+def _codigos_distintos(valores: Sequence[str], soundex_ids: dict[str, int]):
+    """Pré-processa cada código distinto de uma coluna (UF, município e soundex).
+
+    Devolve os códigos por linha e, por valor distinto: se tem 6 caracteres
+    (``ok``), se precisa da versão escalar (``upper()`` mudou o tamanho), as
+    partes como code points, os ids de soundex e se o município é numérico.
+    """
+    codigos, unicos = pd.factorize(pd.Series(valores, dtype=object), use_na_sentinel=False)
+    ok, escalar, ufs, cods, sx_uf, sx_cod, digitos = [], [], [], [], [], [], []
+    for v in unicos:
+        v = str(v)
+        uf, cod = v[:2].upper(), v[2:].upper()
+        seis = len(v) == 6
+        fixo = seis and len(uf) == 2 and len(cod) == 4
+        ok.append(fixo)
+        escalar.append(seis and not fixo)
+        if not fixo:
+            uf, cod = "  ", "    "
+        ufs.append(uf)
+        cods.append(cod)
+        sx_uf.append(soundex_ids.setdefault(soundex(uf), len(soundex_ids)) if fixo else -1)
+        digitos.append(cod.isdigit())
+        sx_cod.append(soundex_ids.setdefault(soundex(cod), len(soundex_ids)) if fixo else -1)
+    return (
+        codigos,
+        np.array(ok, dtype=bool),
+        np.array(escalar, dtype=bool),
+        como_codigos(ufs, 2),
+        como_codigos(cods, 4),
+        np.array(sx_uf, dtype=np.int64),
+        np.array(sx_cod, dtype=np.int64),
+        np.array(digitos, dtype=bool),
+    )
+
+
+def comparar_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    """Versão vetorizada de :func:`comparar` para colunas inteiras.
+
+    Os códigos têm largura fixa (2 de UF + 4 de município), então as
+    distâncias saem de comparações entre matrizes de code points: para
+    tamanhos iguais, Levenshtein 1 equivale a Hamming 1, e só os municípios
+    restantes passam por :func:`levenshtein_fixo`. O soundex é calculado uma
+    vez por código distinto. Devolve as 4 colunas e a nota de :func:`comparar`.
+    """
+    n = len(col1)
+    pontos = np.zeros((4, n))
+    soundex_ids: dict[str, int] = {}
+    c1, ok1, esc1, uf1, cod1, sxu1, sxc1, dig1 = _codigos_distintos(col1, soundex_ids)
+    c2, ok2, esc2, uf2, cod2, sxu2, sxc2, dig2 = _codigos_distintos(col2, soundex_ids)
+
+    fixo = ok1[c1] & ok2[c2]
+    idx = np.flatnonzero(fixo)
+    if len(idx):
+        a, b = c1[idx], c2[idx]
+        ua, ub = uf1[a], uf2[b]
+        uf_igual = (ua == ub).all(axis=1)
+        uf_ham1 = (ua != ub).sum(axis=1) == 1
+        uf_som = sxu1[a] == sxu2[b]
+        pontos[0, idx] = uf_igual
+        pontos[1, idx] = np.where(uf_igual, 0.0, np.where(uf_ham1, 0.5, np.where(uf_som, 0.3, 0.0)))
+
+        ca, cb = cod1[a], cod2[b]
+        diferentes = (ca != cb).sum(axis=1)
+        dist = diferentes.copy()
+        resto = diferentes > 1
+        if resto.any():
+            dist[resto] = levenshtein_fixo(ca[resto], cb[resto])
+        texto = ~(dig1[a] & dig2[b])
+        cod_som = texto & (sxc1[a] == sxc2[b])
+        pontos[2, idx] = diferentes == 0
+        pontos[3, idx] = np.select([dist == 1, dist == 2, (dist > 2) & cod_som], [0.8, 0.5, 0.4], 0.0)
+
+    seis = (ok1 | esc1)[c1] & (ok2 | esc2)[c2]
+    for i in np.flatnonzero(seis & ~fixo):
+        pontos[:, i] = comparar(col1[i], col2[i]).valores
 
-    return ResultadoLocalidade(pontos, nota)
+    nota = pontos[0] + pontos[1] + pontos[2] + pontos[3]
+    return ResultadoLote(list(pontos), nota)
@@ -1,3 +1,4 @@
-from .comparador import comparar
+from .comparador import comparar, comparar_normalizados
+from .normalizacao import LogradouroNormalizado, normalizar
 
-__all__ = ["comparar"]
+__all__ = ["comparar", "comparar_normalizados", "LogradouroNormalizado", "normalizar"]
@@ -24,6 +24,7 @@ except ImportError:  # pragma: no cover - fallback quando rapidfuzz não estiver
 from unidecode import unidecode
 
 from comparators.utils import tokens_to_string
+from util import memoizar
 
 _ADDRESS_STOP_WORDS = {"de", "da", "do", "das", "dos", "e"}
 _LOGRADOURO_EQUIV = {
@@ -145,20 +146,24 @@ def tokenize(valor: str) -> list[str]:
     return tokens
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LogradouroNormalizado:
     via: str
-    via_tokens: list[str]
+    via_tokens: tuple[str, ...]
     numero: str
     complemento: str
-    complemento_tokens: list[str]
-    all_tokens: list[str]
+    complemento_tokens: tuple[str, ...]
+    all_tokens: tuple[str, ...]
 
 
+_VAZIO = LogradouroNormalizado("", (), "", "", (), ())
+
+
+@memoizar
 def normalizar(valor: str) -> LogradouroNormalizado:
     tokens = tokenize(valor)
     if not tokens:
-        return LogradouroNormalizado("", [], "", "", [], [])
+        return _VAZIO
 
     via_tokens: list[str] = []
     complemento_tokens: list[str] = []
@@ -207,11 +212,11 @@ def normalizar(valor: str) -> LogradouroNormalizado:
 
     return LogradouroNormalizado(
         via=tokens_to_string(via_tokens),
-        via_tokens=via_tokens,
+        via_tokens=tuple(via_tokens),
         numero=numero,
         complemento=tokens_to_string(complemento_tokens),
-        complemento_tokens=complemento_tokens,
-        all_tokens=all_tokens,
+        complemento_tokens=tuple(complemento_tokens),
+        all_tokens=tuple(all_tokens),
     )
 
 
@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Sequence
 
-from util import soundex
+from .utils import FLAG, NAO_CALCULADO, RAZAO, ResultadoPar
+from .vocabulario import Vocabulario, vocabulario_padrao
 
 
-@dataclass
-class ResultadoNome:
-    pontos: list[str]
-    nota: float
+class ResultadoNome(ResultadoPar):
+    __slots__ = ()
 
-    def formatado(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+    FORMATOS = (FLAG, FLAG) + (RAZAO,) * 5
+
+
+_SEM_FRAGMENTOS = ResultadoNome((0.0, 0.0) + (NAO_CALCULADO,) * 5, 0.0)
 
 
 def comparar(
@@ -22,72 +22,91 @@ def comparar(
     *,
     incluir_abreviaturas: bool = True,
 ) -> ResultadoNome:
-    pontos = ["0,0"] * 7
-    nota = 0.0
+    vocab = vocabulario_padrao()
+    ids1 = vocab.codificar(nome1)
+    ids2 = vocab.codificar(nome2)
+    tabelas = None
+    if freq_maps:
+        tokens = vocab.tokens
+        tabelas = [{i: freq.get(tokens[i], 0) for i in ids1} for freq in freq_maps]
+    return comparar_ids(ids1, ids2, vocab, tabelas, incluir_abreviaturas=incluir_abreviaturas)
+
+
+def comparar_ids(
+    parts1: Sequence[int],
+    parts2: Sequence[int],
+    vocab: Vocabulario,
+    freq_tabelas: Sequence[Sequence[int]] | None,
+    *,
+    incluir_abreviaturas: bool = True,
+) -> ResultadoNome:
+    """Compara nomes já codificados em ids de ``vocab``.
 
-    parts1 = nome1.split()
-    parts2 = nome2.split()
+    ``freq_tabelas`` são as frequências (primeiro, meio, último) indexadas
+    por id, como as devolvidas por :meth:`Vocabulario.tabela`.
+    """
     if not parts1 or not parts2:
-        return ResultadoNome(pontos, nota)
+        return _SEM_FRAGMENTOS
 
+    nota = 0.0
+    primeiro = ultimo = 0.0
+    nota_raros = nota_comuns = nota_abrevs = NAO_CALCULADO
     t1 = len(parts1)
     if parts1[0] == parts2[0]:
         nota += 1
-        pontos[0] = "1,0"
+        primeiro = 1.0
     if parts1[-1] == parts2[-1]:
         nota += 1
-        pontos[1] = "1,0"
+        ultimo = 1.0
 
-    inter = sum(1 for f in parts1 if f in parts2)
-    incr = inter / t1
-    nota += incr
-    pontos[2] = f"{incr:.2f}".replace(".", ",")
+    set2 = set(parts2)
+    inter = sum(1 for f in parts1 if f in set2)
+    nota_iguais = inter / t1
+    nota += nota_iguais
 
-    if freq_maps:
-        first, middle, last = freq_maps
+    if freq_tabelas:
+        first, middle, last = freq_tabelas
         raros = 0
-        if first.get(parts1[0], 0) < 5:
+        if first[parts1[0]] < 5:
             raros += 1
         for p in parts1[1:-1]:
-            if middle.get(p, 0) < 5:
+            if middle[p] < 5:
                 raros += 1
-        if last.get(parts1[-1], 0) < 5:
+        if last[parts1[-1]] < 5:
             raros += 1
-        incr = raros / t1
-        nota += incr
-        pontos[3] = f"{incr:.2f}".replace(".", ",")
+        nota_raros = raros / t1
+        nota += nota_raros
 
         comuns = 0
-        if first.get(parts1[0], 0) > 1000:
+        if first[parts1[0]] > 1000:
             comuns += 1
         for p in parts1[1:-1]:
-            if middle.get(p, 0) > 1000:
+            if middle[p] > 1000:
                 comuns += 1
-        if last.get(parts1[-1], 0) > 1000:
+        if last[parts1[-1]] > 1000:
             comuns += 1
-        incr = -(comuns / t1)
-        nota += incr
-        pontos[4] = f"{incr:.2f}".replace(".", ",")
+        nota_comuns = -(comuns / t1)
+        nota += nota_comuns
 
     parecidos = 0
+    sx = vocab.soundex
+    codigos2 = {sx[p2] for p2 in parts2}
     for p1 in parts1:
-        s1 = soundex(p1)
-        if any(sum(c1 == c2 for c1, c2 in zip(s1, soundex(p2))) >= 3 for p2 in parts2):
+        c1 = sx[p1]
+        if any(vocab.parecidos(c1, c2) for c2 in codigos2):
             parecidos += 1
-    incr = (parecidos / t1) * 0.8
-    nota += incr
-    pontos[5] = f"{incr:.2f}".replace(".", ",")
+    nota_parecidos = (parecidos / t1) * 0.8
+    nota += nota_parecidos
 
     if incluir_abreviaturas:
-        abrevs = 0
-        for p1 in parts1:
-            if len(p1) == 1 and any(p2.startswith(p1) for p2 in parts2):
-                abrevs += 1
-        for p2 in parts2:
-            if len(p2) == 1 and any(p1.startswith(p2) for p1 in parts1):
-                abrevs += 1
-        incr = (abrevs / t1) * 0.5
-        nota += incr
-        pontos[6] = f"{incr:.2f}".replace(".", ",")
-
-    return ResultadoNome(pontos, nota)
+        tam, ini = vocab.tamanho, vocab.inicial
+        iniciais1 = {ini[p1] for p1 in parts1}
+        iniciais2 = {ini[p2] for p2 in parts2}
+        abrevs = sum(1 for p1 in parts1 if tam[p1] == 1 and ini[p1] in iniciais2)
+        abrevs += sum(1 for p2 in parts2 if tam[p2] == 1 and ini[p2] in iniciais1)
+        nota_abrevs = (abrevs / t1) * 0.5
+        nota += nota_abrevs
+
+    return ResultadoNome(
+        (primeiro, ultimo, nota_iguais, nota_raros, nota_comuns, nota_parecidos, nota_abrevs), nota
+    )
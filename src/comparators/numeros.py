@@ -1,20 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from typing import Optional
+from typing import Optional, Sequence
 
+import numpy as np
+import pandas as pd
 
-@dataclass
-class ResultadoNumero:
-    pontos: list[str]
-    nota: float
+from .utils import FLAG, NAO_CALCULADO, RAZAO, ResultadoLote, ResultadoPar
 
-    def formatado(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
 
+class ResultadoNumero(ResultadoPar):
+    __slots__ = ()
 
-def _normalize_numeric(value: str) -> Optional[Decimal]:
+    FORMATOS = (FLAG,) + (RAZAO,) * 3
+
+
+_INVALIDO = ResultadoNumero((0.0,) + (NAO_CALCULADO,) * 3, 0.0)
+
+
+def _candidate(value: str) -> Optional[str]:
+    """Aplica as heurísticas pt-BR/en-US e devolve o texto numérico candidato."""
     if value is None:
         return None
     cleaned = value.strip()
@@ -46,6 +52,13 @@ def _normalize_numeric(value: str) -> Optional[Decimal]:
     candidate = prefix + cleaned
     if candidate in {"+", "-", ".", ""}:
         return None
+    return candidate
+
+
+def _normalize_numeric(value: str) -> Optional[Decimal]:
+    candidate = _candidate(value)
+    if candidate is None:
+        return None
     try:
         return Decimal(candidate)
     except InvalidOperation:
@@ -56,27 +69,9 @@ def _is_int_like(number: Decimal) -> bool:
     return number == number.to_integral_value()
 
 
-def _format_score(value: float) -> str:
-    if value < 0:
-        value = 0.0
-    if value > 1:
-        value = 1.0
-    return f"{value:.2f}".replace(".", ",")
-
-
-def comparar(v1: str, v2: str) -> ResultadoNumero:
-    pontos = ["0,0"] * 4
-    nota = 0.0
-
-    n1 = _normalize_numeric(v1)
-    n2 = _normalize_numeric(v2)
-
-    if n1 is None or n2 is None:
-        return ResultadoNumero(pontos, nota)
-
-    if n1 == n2:
-        nota += 1.0
-        pontos[0] = "1,0"
+def _pontuar(n1: Decimal, n2: Decimal) -> tuple[float, float, float, float]:
+    """Notas (igualdade, proximidade absoluta, relativa, bucket) de dois números."""
+    igual = 1.0 if n1 == n2 else 0.0
 
     diff = abs(n1 - n2)
     scale = max(abs(n1), abs(n2), Decimal("1"))
@@ -88,14 +83,10 @@ def comparar(v1: str, v2: str) -> ResultadoNumero:
     ratio_abs = min(diff / tolerance, Decimal("1")) if tolerance else Decimal("1")
     score_abs = float(Decimal("1") - ratio_abs)
     score_abs = max(0.0, min(1.0, score_abs))
-    nota += score_abs
-    pontos[1] = _format_score(score_abs)
 
     ratio_rel = min(diff / scale, Decimal("1")) if scale else Decimal("0")
     score_rel = float(Decimal("1") - ratio_rel)
     score_rel = max(0.0, min(1.0, score_rel))
-    nota += score_rel
-    pontos[2] = _format_score(score_rel)
 
     try:
         if _is_int_like(n1) and _is_int_like(n2):
@@ -108,8 +99,153 @@ def comparar(v1: str, v2: str) -> ResultadoNumero:
     except InvalidOperation:
         same_bucket = False
 
-    score_bucket = 1.0 if same_bucket else 0.0
-    nota += score_bucket
-    pontos[3] = _format_score(score_bucket)
+    return igual, score_abs, score_rel, 1.0 if same_bucket else 0.0
 
-    return ResultadoNumero(pontos, nota)
+
+def comparar(v1: str, v2: str) -> ResultadoNumero:
+    n1 = _normalize_numeric(v1)
+    n2 = _normalize_numeric(v2)
+
+    if n1 is None or n2 is None:
+        return _INVALIDO
+
+    igual, score_abs, score_rel, score_bucket = _pontuar(n1, n2)
+    nota = ((igual + score_abs) + score_rel) + score_bucket
+    return ResultadoNumero((igual, score_abs, score_rel, score_bucket), nota)
+
+
+# ---------- versão vetorizada ----------
+# Cada valor vira um inteiro escalonado ``mantissa * 10**-expoente`` (int64);
+# num par, os dois lados são alinhados ao maior expoente e todas as notas
+# viram razões ``P/Q`` de inteiros (exatos em float64, pois ``Q`` fica abaixo
+# de ``_LIMITE_EXATO``), calculadas com uma única divisão IEEE (correctly
+# rounded). O caminho Decimal arredonda ``1 - diff/tol`` a 28 dígitos (erro
+# absoluto de no máximo ``1e-28``) antes de converter para float; os dois
+# resultados só podem divergir se ``P/Q`` estiver a menos desse erro de um
+# ponto médio entre dois doubles. Essa distância é medida com o resíduo
+# exato ``P - s*Q`` (produto sem erro de Dekker) e os pares ambíguos, assim
+# como os valores fora do domínio, voltam para o caminho Decimal.
+_LIMITE_MANTISSA = 1 << 45
+_LIMITE_EXATO = 1 << 50
+_ERRO_DECIMAL = 1e-27  # 10x a cota de erro do caminho Decimal
+_SPLIT = 134217729.0  # 2**27 + 1 (divisão de Veltkamp)
+_RE_SIMPLES = re.compile(r"^([+-]?)([0-9]*)(?:\.([0-9]*))?$")
+_NULO, _RAPIDO, _LENTO = 0, 1, 2
+
+
+def _parse_mantissa(value: str) -> tuple[int, int, int]:
+    """Devolve ``(estado, mantissa, expoente)`` de um valor bruto."""
+    candidate = _candidate(value)
+    if candidate is None:
+        return _NULO, 0, 0
+    m = _RE_SIMPLES.match(candidate)
+    if m is None or not (m.group(2) or m.group(3)):
+        # notação científica, inf/nan etc.: decide o caminho Decimal
+        return (_LENTO if _normalize_numeric(value) is not None else _NULO), 0, 0
+    frac = m.group(3) or ""
+    mant = int(m.group(1) + (m.group(2) or "0") + frac)
+    if abs(mant) >= _LIMITE_MANTISSA or len(frac) > 5:
+        return _LENTO, 0, 0
+    return _RAPIDO, mant, len(frac)
+
+
+def _parse_coluna(valores: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Analisa cada valor distinto uma vez e devolve ``(estado, mantissa, expoente)``."""
+    codigos, unicos = pd.factorize(pd.Series(valores, dtype=object), use_na_sentinel=False)
+    tabela = np.array([_parse_mantissa(v) for v in unicos], dtype=np.int64).reshape(-1, 3)
+    linhas = tabela[codigos]
+    return linhas[:, 0], linhas[:, 1], linhas[:, 2]
+
+
+def _quantizar(x: np.ndarray, k: np.ndarray, casas: np.ndarray) -> np.ndarray:
+    """``x`` (em unidades de ``10**-k``) arredondado HALF_UP a ``casas`` decimais."""
+    excesso = np.maximum(k - casas, 0)
+    u = 10 ** excesso
+    q = (np.abs(x) + u // 2) // u
+    return np.where(excesso > 0, np.sign(x) * q, x * 10 ** np.maximum(casas - k, 0))
+
+
+def _dividir(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    c = _SPLIT * x
+    alto = c - (c - x)
+    return alto, x - alto
+
+
+def _razao(p: np.ndarray, q: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``max(0, p/q)`` correctly rounded e a máscara dos resultados seguros.
+
+    Um resultado é seguro quando ``p/q`` está a mais de :data:`_ERRO_DECIMAL`
+    dos pontos médios vizinhos do double obtido, isto é, quando o caminho
+    Decimal arredonda para o mesmo double.
+    """
+    pf = p.astype(np.float64)
+    qf = q.astype(np.float64)
+    s = np.where(p > 0, pf / qf, 0.0)
+    # resíduo exato p - s*q: s*q = h + l sem erro (Dekker) e p - h é exato (Sterbenz)
+    h = s * qf
+    s_alto, s_baixo = _dividir(s)
+    q_alto, q_baixo = _dividir(qf)
+    l = ((s_alto * q_alto - h) + s_alto * q_baixo + s_baixo * q_alto) + s_baixo * q_baixo
+    delta = ((pf - h) - l) / qf
+    acima = (np.nextafter(s, np.inf) - s) / 2
+    abaixo = (s - np.nextafter(s, 0.0)) / 2
+    seguro = (p <= 0) | ((acima - delta > _ERRO_DECIMAL) & (delta + abaixo > _ERRO_DECIMAL))
+    return s, seguro
+
+
+def comparar_batch(col1: Sequence[str], col2: Sequence[str]) -> ResultadoLote:
+    """Versão vetorizada de :func:`comparar` para colunas inteiras.
+
+    Garantia de exatidão: as 4 colunas e a nota são idênticas (bit a bit) às
+    do caminho Decimal. Pares com mantissas abaixo de ``_LIMITE_MANTISSA`` e
+    no máximo 5 casas decimais são calculados em int64/float64; os demais
+    (valores enormes, notação científica, razões ambíguas) seguem o caminho
+    Decimal. Critérios não calculados (valor ausente ou inválido) vêm como
+    ``NaN``.
+    """
+    n = len(col1)
+    pontos = np.zeros((4, n))
+    pontos[1:] = np.nan
+    e1, m1, k1 = _parse_coluna(col1)
+    e2, m2, k2 = _parse_coluna(col2)
+
+    k = np.maximum(k1, k2)
+    a = m1 * 10 ** (k - k1)
+    b = m2 * 10 ** (k - k2)
+    um = 10**k
+    escala = np.maximum(np.maximum(np.abs(a), np.abs(b)), um)
+    rapido = (e1 == _RAPIDO) & (e2 == _RAPIDO) & (escala < _LIMITE_EXATO)
+
+    r = np.flatnonzero(rapido)
+    if len(r):
+        a, b, k, um, escala = a[r], b[r], k[r], um[r], escala[r]
+        diff = np.abs(a - b)
+        inteiros = (a % um == 0) & (b % um == 0)
+
+        # prox abs: tolerância 5 (inteiros) ou max(5% da escala, 0,01)
+        por_escala = 5 * escala >= um
+        q_abs = np.where(inteiros, 5, np.where(por_escala, escala, um))
+        p_abs = np.where(
+            inteiros, 5 - diff // um, np.where(por_escala, escala - 20 * diff, um - 100 * diff)
+        )
+
+        casas = np.where(escala <= 1000 * um, 2, 1)
+        mesmo_bucket = np.where(
+            inteiros, diff <= um, _quantizar(a, k, casas) == _quantizar(b, k, casas)
+        )
+
+        score_abs, seguro_abs = _razao(p_abs, q_abs)
+        score_rel, seguro_rel = _razao(escala - diff, escala)
+        pontos[0, r] = a == b
+        pontos[1, r] = score_abs
+        pontos[2, r] = score_rel
+        pontos[3, r] = mesmo_bucket
+        rapido[r[~(seguro_abs & seguro_rel)]] = False
+
+    lento = np.flatnonzero(~rapido & (e1 != _NULO) & (e2 != _NULO))
+    for i in lento:
+        pontos[:, i] = _pontuar(_normalize_numeric(col1[i]), _normalize_numeric(col2[i]))
+
+    validos = np.nan_to_num(pontos)
+    nota = ((validos[0] + validos[1]) + validos[2]) + validos[3]
+    return ResultadoLote(list(pontos), nota)
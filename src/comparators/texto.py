@@ -1,80 +1,95 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import Sequence
 
-from util import soundex
+from .utils import FLAG, NAO_CALCULADO, RAZAO, ResultadoPar
+from .vocabulario import Vocabulario, vocabulario_padrao
 
 
-@dataclass
-class ResultadoTexto:
-    pontos: list[str]
-    nota: float
+class ResultadoTexto(ResultadoPar):
+    __slots__ = ()
 
-    def formatado(self) -> list[str]:
-        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+    FORMATOS = (FLAG, FLAG) + (RAZAO,) * 5
 
 
-def comparar(v1: str, v2: str, freq: dict[str, int]) -> ResultadoTexto:
-    pontos = ["0,0"] * 7
-    nota = 0.0
+_SEM_FRAGMENTOS = ResultadoTexto((0.0, 0.0) + (NAO_CALCULADO,) * 5, 0.0)
 
-    parts1 = v1.split()
-    parts2 = v2.split()
+
+def comparar(v1: str, v2: str, freq: dict[str, int]) -> ResultadoTexto:
+    vocab = vocabulario_padrao()
+    ids1 = vocab.codificar(v1)
+    ids2 = vocab.codificar(v2)
+    tokens = vocab.tokens
+    tabela = {i: freq.get(tokens[i], 0) for i in ids1}
+    return comparar_ids(ids1, ids2, vocab, tabela)
+
+
+def comparar_ids(
+    parts1: Sequence[int],
+    parts2: Sequence[int],
+    vocab: Vocabulario,
+    freq_tabela: Sequence[int],
+) -> ResultadoTexto:
+    """Compara textos já codificados em ids de ``vocab``.
+
+    ``freq_tabela`` é a frequência de cada token indexada por id.
+    """
     if not parts1 or not parts2:
-        return ResultadoTexto(pontos, nota)
+        return _SEM_FRAGMENTOS
 
+    nota = 0.0
+    primeiro = ultimo = 0.0
+    nota_raros = nota_comuns = NAO_CALCULADO
     t1 = len(parts1)
     if parts1[0] == parts2[0]:
         nota += 1
-        pontos[0] = "1,0"
+        primeiro = 1.0
     if parts1[-1] == parts2[-1]:
         nota += 1
-        pontos[1] = "1,0"
+        ultimo = 1.0
 
-    inter = sum(1 for f in parts1 if f in parts2)
-    incr = inter / t1
-    nota += incr
-    pontos[2] = f"{incr:.2f}".replace(".", ",")
+    set2 = set(parts2)
+    inter = sum(1 for f in parts1 if f in set2)
+    nota_iguais = inter / t1
+    nota += nota_iguais
 
+    tam = vocab.tamanho
     is_date_like = (
         len(parts1) == 1
         and len(parts2) == 1
-        and len(parts1[0]) == 8
-        and parts1[0].isdigit()
-        and len(parts2[0]) == 8
-        and parts2[0].isdigit()
+        and tam[parts1[0]] == 8
+        and vocab.tokens[parts1[0]].isdigit()
+        and tam[parts2[0]] == 8
+        and vocab.tokens[parts2[0]].isdigit()
     )
 
     if not is_date_like:
-        raros = sum(1 for p in parts1 if freq.get(p, 0) < 5)
-        incr = raros / t1
-        nota += incr
-        pontos[3] = f"{incr:.2f}".replace(".", ",")
+        raros = sum(1 for p in parts1 if freq_tabela[p] < 5)
+        nota_raros = raros / t1
+        nota += nota_raros
 
-        comuns = sum(1 for p in parts1 if freq.get(p, 0) > 1000)
-        incr = -(comuns / t1)
-        nota += incr
-        pontos[4] = f"{incr:.2f}".replace(".", ",")
+        comuns = sum(1 for p in parts1 if freq_tabela[p] > 1000)
+        nota_comuns = -(comuns / t1)
+        nota += nota_comuns
 
     parecidos = 0
-    soundex_parts2 = {p2: soundex(p2) for p2 in parts2}
+    sx = vocab.soundex
+    codigos2 = {sx[p2] for p2 in parts2}
     for p1 in parts1:
-        s1 = soundex(p1)
-        if any(sum(c1 == c2 for c1, c2 in zip(s1, soundex_parts2[p2])) >= 3 for p2 in parts2):
+        c1 = sx[p1]
+        if any(vocab.parecidos(c1, c2) for c2 in codigos2):
             parecidos += 1
-    incr = (parecidos / t1) * 0.8
-    nota += incr
-    pontos[5] = f"{incr:.2f}".replace(".", ",")
-
-    abrevs = 0
-    for p1 in parts1:
-        if len(p1) == 1 and any(p2.startswith(p1) for p2 in parts2):
-            abrevs += 1
-    for p2 in parts2:
-        if len(p2) == 1 and any(p1.startswith(p2) for p1 in parts1):
-            abrevs += 1
-    incr = (abrevs / t1) * 0.5
-    nota += incr
-    pontos[6] = f"{incr:.2f}".replace(".", ",")
-
-    return ResultadoTexto(pontos, nota)
+    nota_parecidos = (parecidos / t1) * 0.8
+    nota += nota_parecidos
+
+    ini = vocab.inicial
+    iniciais1 = {ini[p1] for p1 in parts1}
+    iniciais2 = {ini[p2] for p2 in parts2}
+    abrevs = sum(1 for p1 in parts1 if tam[p1] == 1 and ini[p1] in iniciais2)
+    abrevs += sum(1 for p2 in parts2 if tam[p2] == 1 and ini[p2] in iniciais1)
+    nota_abrevs = (abrevs / t1) * 0.5
+    nota += nota_abrevs
+
+    return ResultadoTexto(
+        (primeiro, ultimo, nota_iguais, nota_raros, nota_comuns, nota_parecidos, nota_abrevs), nota
+    )
@@ -1,8 +1,101 @@
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from typing import ClassVar, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Como cada critério é gravado na saída (ver :func:`formatar_pontos`):
+# pontual com 1 casa ("1,0", "0,5") ou contínuo com 2 casas ("0,75"), em que
+# ``NaN`` marca um critério não calculado e vira "0,0".
+FLAG = "flag"
+RAZAO = "razao"
+NAO_CALCULADO = float("nan")
 
 
 def tokens_to_string(tokens: Iterable[str]) -> str:
     """Join tokens into a single normalized string."""
     return " ".join(tok for tok in tokens if tok).strip()
+
+
+@dataclass
+class ResultadoLote:
+    """Resultado de um comparador vetorizado: uma coluna por critério e a nota por linha."""
+
+    pontos: list[np.ndarray]
+    nota: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoPar:
+    """Resultado de um comparador escalar: critérios numéricos e a nota do par.
+
+    Cada comparador tem uma subclasse que só define os :attr:`FORMATOS` dos
+    seus critérios (e ``__slots__ = ()``, para continuar sem ``__dict__``).
+    Imutável: um mesmo resultado pode ser reaproveitado entre pares.
+    """
+
+    valores: tuple[float, ...]
+    nota: float
+
+    FORMATOS: ClassVar[tuple[str, ...]] = ()
+
+    @property
+    def pontos(self) -> list[str]:
+        return formatar_pontos(self.valores, self.FORMATOS)
+
+    def formatado(self) -> list[str]:
+        return self.pontos + [f"{self.nota:.2f}".replace(".", ",")]
+
+
+def formatar_ponto(valor: float, formato: str) -> str:
+    if formato == FLAG:
+        return f"{valor:.1f}".replace(".", ",")
+    if valor != valor:
+        return "0,0"
+    return f"{valor:.2f}".replace(".", ",")
+
+
+def formatar_pontos(valores: Sequence[float], formatos: Sequence[str]) -> list[str]:
+    """Formata os critérios numéricos de um resultado escalar."""
+    return [formatar_ponto(v, f) for v, f in zip(valores, formatos)]
+
+
+def formatar_coluna(valores: np.ndarray, formato: str) -> np.ndarray:
+    """Formata uma coluna de critérios, cada valor distinto uma única vez.
+
+    Os valores são agrupados pelos bits do float64, o que mantém ``-0.0``
+    (gravado como ``"-0,00"``) separado de ``0.0``.
+    """
+    bits = np.ascontiguousarray(valores, dtype=np.float64).view(np.int64)
+    codigos, unicos = pd.factorize(bits)
+    textos = [formatar_ponto(v, formato) for v in unicos.view(np.float64).tolist()]
+    return np.asarray(textos, dtype=object)[codigos]
+
+
+def levenshtein_fixo(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distância de Levenshtein linha a linha entre matrizes ``(n, m)`` de códigos.
+
+    Programação dinâmica clássica vetorizada sobre as ``n`` linhas; serve
+    para campos de largura fixa (datas, códigos), onde ``m`` é pequeno.
+    """
+    n, m = a.shape
+    prev = np.tile(np.arange(m + 1, dtype=np.int16), (n, 1))
+    for i in range(1, m + 1):
+        cur = np.empty_like(prev)
+        cur[:, 0] = i
+        ai = a[:, i - 1]
+        for j in range(1, m + 1):
+            custo = (ai != b[:, j - 1]).astype(np.int16)
+            cur[:, j] = np.minimum(np.minimum(cur[:, j - 1], prev[:, j]) + 1, prev[:, j - 1] + custo)
+        prev = cur
+    return prev[:, m]
+
+
+def como_codigos(valores: Sequence[str], largura: int) -> np.ndarray:
+    """Converte strings de ``largura`` caracteres em matriz ``(n, largura)`` de code points."""
+    if not len(valores):
+        return np.zeros((0, largura), dtype=np.uint32)
+    return np.array(valores, dtype=f"U{largura}").view(np.uint32).reshape(-1, largura)
+
@@ -0,0 +1,95 @@
+"""Vocabulário de tokens: cada token normalizado vira um id inteiro.
+
+Os atributos usados pelos comparadores (código soundex, tamanho, inicial e
+frequências) ficam em arrays paralelos indexados pelo id, de modo que
+``nomes``/``texto`` comparam tuplas de inteiros, testam pertinência com
+conjuntos e consultam frequências por indexação.
+"""
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from typing import Mapping
+
+import util
+from util import soundex
+
+
+class Vocabulario:
+    """Dicionário ``token -> id`` de uma execução, com atributos por id."""
+
+    def __init__(self, tamanho_cache: int | None = None):
+        self.ids: dict[str, int] = {}
+        self.tokens: list[str] = []
+        self.soundex = array("I")  # id do código soundex de cada token
+        self.tamanho = array("I")
+        self.inicial = array("I")  # ord() do primeiro caractere
+        self.codigos: list[str] = []
+        self._codigo_ids: dict[str, int] = {}
+        self._parecidos: dict[tuple[int, int], bool] = {}
+        self._tabelas: list[tuple[Mapping[str, int], array]] = []
+        tamanho = util.CACHE_TAMANHO if tamanho_cache is None else tamanho_cache
+        self.codificar = lru_cache(maxsize=tamanho)(self._codificar)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def id(self, token: str) -> int:
+        i = self.ids.get(token)
+        if i is None:
+            i = len(self.tokens)
+            self.ids[token] = i
+            self.tokens.append(token)
+            codigo = soundex(token)
+            ci = self._codigo_ids.get(codigo)
+            if ci is None:
+                ci = self._codigo_ids[codigo] = len(self.codigos)
+                self.codigos.append(codigo)
+            self.soundex.append(ci)
+            self.tamanho.append(len(token))
+            self.inicial.append(ord(token[0]))
+            for freq, tabela in self._tabelas:
+                tabela.append(freq.get(token, 0))
+        return i
+
+    def _codificar(self, texto: str) -> tuple[int, ...]:
+        """Ids dos tokens de ``texto`` (já padronizado), na ordem original."""
+        return tuple(self.id(p) for p in texto.split())
+
+    def tabela(self, freq: Mapping[str, int]) -> array:
+        """Array de frequências alinhado aos ids (cresce junto com o vocabulário)."""
+        tabela = array("q", (freq.get(t, 0) for t in self.tokens))
+        self._tabelas.append((freq, tabela))
+        return tabela
+
+    def parecidos(self, c1: int, c2: int) -> bool:
+        """Se dois códigos soundex (por id) coincidem em ao menos 3 posições."""
+        chave = (c1, c2)
+        r = self._parecidos.get(chave)
+        if r is None:
+            a, b = self.codigos[c1], self.codigos[c2]
+            r = self._parecidos[chave] = sum(x == y for x, y in zip(a, b)) >= 3
+        return r
+
+
+_PADRAO: Vocabulario | None = None
+
+
+def vocabulario_padrao() -> Vocabulario:
+    """Vocabulário do processo usado pelas APIs que recebem strings.
+
+    Limitado como os caches de :func:`util.memoizar`: passando de
+    ``util.CACHE_TAMANHO`` tokens ele é descartado e recomeça vazio. Os ids
+    só valem dentro de cada comparação, então nenhuma depende dos anteriores.
+    """
+    global _PADRAO
+    limite = util.CACHE_TAMANHO
+    if _PADRAO is None or (limite is not None and len(_PADRAO) > limite):
+        _PADRAO = Vocabulario()
+    return _PADRAO
+
+
+def reiniciar_vocabulario_padrao() -> None:
+    """Descarta o vocabulário do processo; o próximo uso começa vazio."""
+    global _PADRAO
+    _PADRAO = None
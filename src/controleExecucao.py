@@ -0,0 +1,70 @@
+# controleExecucao.py
+"""Cancelamento e pausa de uma execução em andamento.
+
+Um :class:`Controle` é criado por quem dispara a execução (ex.: a GUI) e
+passado a :func:`comparaRegistros.processar_generico`; outra thread chama
+:meth:`Controle.pausar`, :meth:`Controle.retomar` ou :meth:`Controle.cancelar`.
+O pipeline consulta o controle entre os blocos da passada de frequências
+(:meth:`Controle.percorrer`) e entre lotes (:meth:`Controle.aguardar`): na
+pausa nenhum lote novo é distribuído (os que já estão nos processos
+terminam), e o cancelamento descarta os lotes na fila e interrompe a
+execução com :class:`ExecucaoCancelada`.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecucaoCancelada(Exception):
+    """A execução foi interrompida por :meth:`Controle.cancelar`."""
+
+
+class Controle:
+    """Sinal de pausa/cancelamento compartilhado entre threads."""
+
+    def __init__(self):
+        self._livre = threading.Event()  # limpo durante a pausa
+        self._livre.set()
+        self._cancelado = threading.Event()
+
+    @property
+    def pausado(self) -> bool:
+        return not self._livre.is_set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    def pausar(self) -> None:
+        self._livre.clear()
+
+    def retomar(self) -> None:
+        self._livre.set()
+
+    def cancelar(self) -> None:
+        self._cancelado.set()
+        self._livre.set()  # acorda quem está esperando na pausa
+
+    def verificar(self) -> None:
+        """Levanta :class:`ExecucaoCancelada` se a execução foi cancelada."""
+        if self._cancelado.is_set():
+            raise ExecucaoCancelada("execução cancelada")
+
+    def aguardar(self) -> None:
+        """Bloqueia enquanto a execução estiver pausada; depois, como :meth:`verificar`."""
+        self._livre.wait()
+        self.verificar()
+
+    def percorrer(self, itens: Iterable[T]) -> Iterator[T]:
+        """Itera ``itens`` chamando :meth:`aguardar` antes de pedir cada um (ex.: blocos lidos)."""
+        it = iter(itens)
+        while True:
+            self.aguardar()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            yield item
@@ -1,9 +1,18 @@
 # freqbuilder.py
 from __future__ import annotations
+import hashlib
+import os
+import struct
+import sys
+import time
+import zlib
 import pandas as pd
+from array import array
 from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List
+import controleExecucao as ce
+import leituraEntrada as le
 import util
 
 
@@ -95,3 +104,283 @@ def build_if_missing(
 
     import transformaBase as tf
     return tf.guarda_frequencias(*map(str, freq_files))
+
+
+# ---------- frequências do pipeline genérico (processar_generico) ----------
+def _colunas_freq(pares) -> list[int]:
+    """Índices das colunas que alimentam tabelas de frequência (tipos T e N)."""
+    cols = set()
+    for idx1, idx2, tipo, _ in pares:
+        if tipo.upper() in ("T", "N"):
+            cols.update((idx1, idx2))
+    return sorted(cols)
+
+
+def contar_tokens(counter: Counter, valores: pd.Series) -> None:
+    """Soma em ``counter`` os tokens padronizados de ``valores``.
+
+    ``util.padroniza`` roda uma única vez por valor distinto do bloco.
+    """
+    for val, qtd in valores.value_counts(sort=False).items():
+        for p in util.padroniza(str(val)).split():
+            counter[p] += qtd
+
+
+def contar_partes_nome(counters: List[Counter], valores: pd.Series) -> None:
+    """Soma em ``counters`` (primeiro, meio, último) as partes de ``valores``."""
+    first, middle, last = counters
+    for val, qtd in valores.value_counts(sort=False).items():
+        parts = util.padroniza(str(val)).split()
+        if not parts:
+            continue
+        first[parts[0]] += qtd
+        last[parts[-1]] += qtd
+        for m in parts[1:-1]:
+            middle[m] += qtd
+
+
+def count_pares(blocos, pares, colunas: List[int] | None = None) -> Tuple[int, Dict[int, object]]:
+    """
+    Acumula as tabelas de frequência de ``pares`` sobre ``blocos``.
+    • blocos  — DataFrames (ex.: iterador de ``pd.read_csv(chunksize=...)``)
+    • colunas — índice original de cada coluna presente nos blocos
+                (``None`` quando os blocos trazem todas as colunas)
+    Devolve ``(total_de_linhas, {j: Counter | [Counter, Counter, Counter] | None})``.
+    """
+    freq_maps: Dict[int, object] = {}
+    for j, (_, _, tipo, _) in enumerate(pares):
+        t = tipo.upper()
+        freq_maps[j] = Counter() if t == "T" else [Counter(), Counter(), Counter()] if t == "N" else None
+
+    total = 0
+    for bloco in blocos:
+        bloco = bloco.fillna("")
+        total += len(bloco)
+        pos = {c: k for k, c in enumerate(colunas)} if colunas is not None else None
+        for j, (idx1, idx2, tipo, _) in enumerate(pares):
+            destino = freq_maps[j]
+            if destino is None:
+                continue
+            for idx in (idx1, idx2):
+                serie = bloco.iloc[:, pos[idx] if pos is not None else idx]
+                if tipo.upper() == "T":
+                    contar_tokens(destino, serie)
+                else:
+                    contar_partes_nome(destino, serie)
+    return total, freq_maps
+
+
+def count_bases(blocos_a, blocos_b, pares) -> Dict[int, object]:
+    """
+    Tabelas de frequência de ``pares`` para o cruzamento de duas bases.
+    • pares — ``(idx_a, idx_b, tipo, nome)``: ``idx_a`` indexa as colunas de
+              ``blocos_a`` e ``idx_b`` as de ``blocos_b``
+    Cada registro de cada base é contado uma vez (e não uma vez por par
+    candidato). Devolve ``{j: Counter | [Counter, Counter, Counter] | None}``.
+    """
+    _, freq_maps = count_pares([], pares)
+    for blocos, lado in ((blocos_a, 0), (blocos_b, 1)):
+        for bloco in blocos:
+            bloco = bloco.fillna("")
+            for j, par in enumerate(pares):
+                destino = freq_maps[j]
+                if destino is None:
+                    continue
+                serie = bloco.iloc[:, par[lado]]
+                if par[2].upper() == "T":
+                    contar_tokens(destino, serie)
+                else:
+                    contar_partes_nome(destino, serie)
+    return freq_maps
+
+
+def build_for_pares(
+    csv_path: str,
+    pares,
+    *,
+    sep: str = "|",
+    chunksize: int = 500_000,
+    cache_dir: str | None = None,
+    motor: str = "auto",
+    controle: ce.Controle | None = None,
+) -> Tuple[int, Dict[int, object]]:
+    """
+    Primeira passada do pipeline genérico: lê ``csv_path`` em blocos,
+    carregando apenas as colunas dos pares T/N (ver :func:`leituraEntrada.ler`,
+    que usa o ``motor`` de leitura pedido), e devolve
+    ``(total_de_linhas, freq_maps)`` no formato de :func:`count_pares`.
+    Com ``cache_dir`` as tabelas são lidas/gravadas via :func:`cached_pares`.
+    Com ``controle`` a passada pode ser pausada ou cancelada entre blocos
+    (ver :meth:`controleExecucao.Controle.percorrer`).
+    """
+    def contar(sub):
+        colunas = _colunas_freq(sub) or [0]  # coluna 0 só para contar linhas
+        blocos = le.ler(csv_path, sep, chunksize=chunksize, colunas=colunas, motor=motor, cache_dir=cache_dir)
+        if controle is not None:
+            blocos = controle.percorrer(blocos)
+        return count_pares(blocos, sub, colunas)
+
+    if cache_dir is None:
+        return contar(pares)
+    return cached_pares(csv_path, pares, contar, sep=sep, cache_dir=cache_dir)
+
+
+# ---------- cache persistente das frequências do pipeline genérico ----------
+# Cada entrada (``*.freq``) guarda as tabelas de um par ``(idx1, idx2, tipo)``
+# de um arquivo identificado pela sua impressão digital de conteúdo; a entrada
+# ``linhas`` guarda só o total de linhas. Formato: ``_CACHE_MAGIC`` seguido de
+# um bloco zlib com ``total`` (u64), ``n_tabelas`` (u32) e, por tabela,
+# ``n_chaves`` (u32), ``n_bytes`` (u32), as chaves ordenadas separadas por
+# ``\0`` e as contagens como u64 little-endian.
+_CACHE_MAGIC = b"CRF1"
+CACHE_MAX_BYTES = 512 * 1024 * 1024  # tamanho total máximo do cache
+CACHE_MAX_AGE = 30 * 24 * 3600       # segundos sem uso antes de expirar
+_AMOSTRA = 64 * 1024                 # bytes por amostra da impressão digital
+_N_AMOSTRAS = 16
+
+
+def fingerprint(csv_path: str) -> str:
+    """Impressão digital do conteúdo: tamanho, mtime e hash de amostras."""
+    st = os.stat(csv_path)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with open(csv_path, "rb") as fh:
+        if st.st_size <= _AMOSTRA * _N_AMOSTRAS:
+            h.update(fh.read())
+        else:
+            passo = (st.st_size - _AMOSTRA) // (_N_AMOSTRAS - 1)
+            for i in range(_N_AMOSTRAS):
+                fh.seek(i * passo)
+                h.update(fh.read(_AMOSTRA))
+    return h.hexdigest()
+
+
+def _cache_path(cache_dir: Path, fp: str, sep: str, par: object) -> Path:
+    chave = hashlib.blake2b(repr((fp, sep, par)).encode(), digest_size=16).hexdigest()
+    return cache_dir / f"{chave}.freq"
+
+
+def _serializar(total: int, tabelas: List[Counter]) -> bytes:
+    partes = [struct.pack("<QI", total, len(tabelas))]
+    for tab in tabelas:
+        chaves = sorted(tab)
+        blob = "\0".join(chaves).encode("utf-8")
+        contagens = array("Q", (tab[c] for c in chaves))
+        if sys.byteorder == "big":
+            contagens.byteswap()
+        partes += [struct.pack("<II", len(chaves), len(blob)), blob, contagens.tobytes()]
+    return _CACHE_MAGIC + zlib.compress(b"".join(partes), 6)
+
+
+def _desserializar(dados: bytes) -> Tuple[int, List[Counter]]:
+    if dados[:4] != _CACHE_MAGIC:
+        raise ValueError("entrada de cache inválida")
+    buf = zlib.decompress(dados[4:])
+    total, n_tabelas = struct.unpack_from("<QI", buf, 0)
+    off = struct.calcsize("<QI")
+    tabelas: List[Counter] = []
+    for _ in range(n_tabelas):
+        n_chaves, n_bytes = struct.unpack_from("<II", buf, off)
+        off += 8
+        chaves = buf[off : off + n_bytes].decode("utf-8").split("\0") if n_chaves else []
+        off += n_bytes
+        contagens = array("Q")
+        contagens.frombytes(buf[off : off + 8 * n_chaves])
+        if sys.byteorder == "big":
+            contagens.byteswap()
+        off += 8 * n_chaves
+        tabelas.append(Counter(dict(zip(chaves, contagens))))
+    return total, tabelas
+
+
+def _ler_cache(path: Path) -> Tuple[int, List[Counter]] | None:
+    try:
+        dados = path.read_bytes()
+        resultado = _desserializar(dados)
+    except (OSError, ValueError, zlib.error, struct.error):
+        return None
+    os.utime(path)  # marca uso recente para a política de expiração
+    return resultado
+
+
+def _gravar_cache(path: Path, total: int, tabelas: List[Counter]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(_serializar(total, tabelas))
+    os.replace(tmp, path)
+
+
+def evict_cache(
+    cache_dir: str, max_bytes: float = CACHE_MAX_BYTES, max_age: float = CACHE_MAX_AGE, padrao: str = "*.freq"
+) -> None:
+    """Remove entradas ``padrao`` sem uso há mais de ``max_age`` segundos e,
+    se o total ainda passar de ``max_bytes``, as menos usadas recentemente."""
+    agora = time.time()
+    entradas = []
+    for p in Path(cache_dir).glob(padrao):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if agora - st.st_mtime > max_age:
+            p.unlink(missing_ok=True)
+        else:
+            entradas.append((st.st_mtime, st.st_size, p))
+    entradas.sort()
+    ocupado = sum(tam for _, tam, _ in entradas)
+    for _, tam, p in entradas:
+        if ocupado <= max_bytes:
+            break
+        p.unlink(missing_ok=True)
+        ocupado -= tam
+
+
+def cached_pares(
+    csv_path: str,
+    pares,
+    contar: Callable[[list], Tuple[int, Dict[int, object]]],
+    *,
+    sep: str,
+    cache_dir: str,
+) -> Tuple[int, Dict[int, object]]:
+    """
+    Devolve ``(total_de_linhas, freq_maps)`` para ``pares`` usando o cache
+    em ``cache_dir``. Só os pares T/N ausentes são passados a ``contar``
+    (mesmo contrato de :func:`count_pares`); se nada faltar, não há passada
+    sobre os dados.
+    """
+    out = Path(cache_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    fp = fingerprint(csv_path)
+
+    total: int | None = None
+    linhas_path = _cache_path(out, fp, sep, "linhas")
+    lido = _ler_cache(linhas_path)
+    if lido is not None:
+        total = lido[0]
+
+    freq_maps: Dict[int, object] = {}
+    faltando: list[int] = []
+    for j, (idx1, idx2, tipo, _) in enumerate(pares):
+        t = tipo.upper()
+        if t not in ("T", "N"):
+            freq_maps[j] = None
+            continue
+        lido = _ler_cache(_cache_path(out, fp, sep, (idx1, idx2, t)))
+        if lido is None:
+            faltando.append(j)
+            continue
+        total = lido[0] if total is None else total
+        freq_maps[j] = lido[1][0] if t == "T" else lido[1]
+
+    if faltando or total is None:
+        sub = [pares[j] for j in faltando]
+        total, novos = contar(sub)
+        for k, j in enumerate(faltando):
+            idx1, idx2, tipo, _ = pares[j]
+            t = tipo.upper()
+            freq_maps[j] = novos[k]
+            tabelas = [novos[k]] if t == "T" else novos[k]
+            _gravar_cache(_cache_path(out, fp, sep, (idx1, idx2, t)), total, tabelas)
+        _gravar_cache(linhas_path, total, [])
+        evict_cache(cache_dir)
+    return total, freq_maps
@@ -0,0 +1,298 @@
+# gravacaoSaida.py
+"""Gravação incremental do arquivo de saída em CSV, Parquet ou Arrow IPC.
+
+O pipeline entrega à saída DataFrames com as colunas de entrada (texto),
+os critérios e a nota final (``float64``). Só o CSV formata os números em
+pt-BR (ex.: ``"0,75"``, ver :func:`formatar`); nos formatos colunares os
+arrays numéricos são gravados direto, os critérios como ``float32`` (um
+critério não calculado, ``NaN``, vira nulo), a nota final como ``float64`` e
+as colunas de entrada como ``string``, e cada bloco é anexado ao arquivo à
+medida que chega (um *row group* do Parquet ou um *record batch* do Arrow
+IPC/Feather v2).
+
+Os arquivos intermediários do pipeline (parciais dos processos e runs da
+ordenação externa) são gravados e relidos por :class:`Partes`: CSV quando a
+saída é CSV e Arrow IPC quando é colunar, de modo que os números nunca
+passam por texto fora do CSV.
+
+Os formatos colunares dependem do ``pyarrow``, que é opcional.
+"""
+from __future__ import annotations
+
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from comparators import formatar_coluna
+from comparators.utils import RAZAO
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - formatos colunares indisponíveis sem pyarrow
+    pa = None
+
+# Extensão do arquivo gravado em cada formato.
+EXTENSOES = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# Extensão dos arquivos intermediários (ver :class:`Partes`) de cada formato.
+EXTENSOES_PARTES = {"csv": ".csv", "parquet": ".arrow", "feather": ".arrow"}
+
+
+def validar_formato(formato: str) -> None:
+    if formato not in EXTENSOES:
+        raise ValueError(f"Formato de saída desconhecido: '{formato}' (use {', '.join(EXTENSOES)})")
+    if formato != "csv" and pa is None:
+        raise ImportError(f"o formato '{formato}' requer o pacote pyarrow")
+
+
+def _formatos(header: Sequence[str], inicio_criterios: int, formatos: Sequence[str] | None) -> list[str]:
+    """Formato de cada critério (ver :func:`comparators.formatar_coluna`); o padrão é 2 casas."""
+    n = len(header) - inicio_criterios
+    if formatos is None:
+        return [RAZAO] * n
+    if len(formatos) != n:
+        raise ValueError(f"esperados {n} formatos de critério, recebidos {len(formatos)}")
+    return list(formatos)
+
+
+def formatar(df: pd.DataFrame, inicio_criterios: int, formatos: Sequence[str]) -> pd.DataFrame:
+    """``df`` com os critérios numéricos (a partir de ``inicio_criterios``) em texto pt-BR.
+
+    Colunas que já são texto (ex.: relidas de um parcial CSV) ficam como estão.
+    """
+    saida = None
+    for i, formato in enumerate(formatos, start=inicio_criterios):
+        coluna = df.iloc[:, i]
+        if is_numeric_dtype(coluna):
+            if saida is None:
+                saida = df.copy(deep=False)
+            saida.isetitem(i, formatar_coluna(coluna.to_numpy(), formato))
+    return df if saida is None else saida
+
+
+class GravadorCsv:
+    """Grava o cabeçalho na primeira escrita e anexa os blocos seguintes.
+
+    Os critérios são formatados a cada bloco (ver :func:`formatar`). Com
+    ``cabecalho=False`` grava só as linhas (parciais e runs).
+    """
+
+    def __init__(
+        self,
+        destino: Path,
+        header: Sequence[str],
+        inicio_criterios: int,
+        *,
+        sep: str,
+        formatos: Sequence[str] | None = None,
+        cabecalho: bool = True,
+    ):
+        self.destino = destino
+        self.header = list(header)
+        self.inicio_criterios = inicio_criterios
+        self.formatos = _formatos(self.header, inicio_criterios, formatos)
+        self.sep = sep
+        self.cabecalho = cabecalho
+        self._iniciado = False
+
+    def _iniciar(self) -> None:
+        if not self._iniciado:
+            if self.cabecalho:
+                pd.DataFrame(columns=self.header).to_csv(self.destino, sep=self.sep, index=False)
+            else:
+                Path(self.destino).write_bytes(b"")
+            self._iniciado = True
+
+    def gravar(self, df: pd.DataFrame) -> None:
+        formatar(df, self.inicio_criterios, self.formatos).to_csv(
+            self.destino,
+            sep=self.sep,
+            index=False,
+            header=self.cabecalho and not self._iniciado,
+            mode="a" if self._iniciado else "w",
+        )
+        self._iniciado = True
+
+    def copiar_parte(self, parte: Path) -> None:
+        """Anexa um CSV parcial sem cabeçalho (já no separador da saída) byte a byte."""
+        self._iniciar()
+        with open(self.destino, "ab") as saida, open(parte, "rb") as f:
+            shutil.copyfileobj(f, saida)
+
+    def fechar(self) -> None:
+        self._iniciar()  # saída vazia: só o cabeçalho
+
+    def __enter__(self) -> GravadorCsv:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+class GravadorColunar:
+    """Grava Parquet (``formato="parquet"``) ou Arrow IPC (``"feather"``) bloco a bloco.
+
+    As colunas a partir de ``inicio_criterios`` são os critérios
+    (``tipo_criterios``, ``float32`` por padrão) e a última é a nota final
+    (``float64``); as anteriores são texto. ``NaN`` é gravado como nulo.
+    """
+
+    def __init__(
+        self,
+        destino: Path,
+        header: Sequence[str],
+        inicio_criterios: int,
+        *,
+        formato: str,
+        tipo_criterios: str = "float32",
+    ):
+        self.header = list(header)
+        self.inicio_criterios = inicio_criterios
+        criterio = pa.type_for_alias(tipo_criterios)
+        campos = [
+            pa.field(nome, pa.string() if i < inicio_criterios else criterio)
+            for i, nome in enumerate(self.header[:-1])
+        ]
+        campos.append(pa.field(self.header[-1], pa.float64()))
+        self.schema = pa.schema(campos)
+        if formato == "parquet":
+            self._writer = pq.ParquetWriter(str(destino), self.schema)
+        else:
+            self._writer = pa.ipc.new_file(str(destino), self.schema)
+
+    def _tabela(self, df: pd.DataFrame) -> pa.Table:
+        colunas = []
+        for i, campo in enumerate(self.schema):
+            valores = df.iloc[:, i]
+            if i < self.inicio_criterios:
+                colunas.append(pa.array(valores.astype(str).tolist(), type=pa.string()))
+            else:
+                numeros = valores.to_numpy(dtype=campo.type.to_pandas_dtype())
+                colunas.append(pa.array(numeros, type=campo.type, from_pandas=True))
+        return pa.Table.from_arrays(colunas, schema=self.schema)
+
+    def gravar(self, df: pd.DataFrame) -> None:
+        if len(df):
+            self._writer.write_table(self._tabela(df))
+
+    def copiar_parte(self, parte: Path) -> None:
+        """Anexa um parcial Arrow IPC (ver :class:`Partes`) lote a lote, sem passar pelo pandas."""
+        with pa.memory_map(str(parte)) as fonte:
+            leitor = pa.ipc.open_file(fonte)
+            for i in range(leitor.num_record_batches):
+                lote = leitor.get_batch(i)
+                if lote.num_rows:
+                    self._writer.write_table(pa.Table.from_batches([lote]).cast(self.schema))
+
+    def fechar(self) -> None:
+        self._writer.close()
+
+    def __enter__(self) -> GravadorColunar:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+def abrir(
+    formato: str,
+    destino: Path,
+    header: Sequence[str],
+    inicio_criterios: int,
+    *,
+    sep: str,
+    formatos: Sequence[str] | None = None,
+):
+    """Gravador de ``formato`` para ``destino`` (use como gerenciador de contexto).
+
+    ``formatos`` diz como cada critério é escrito no CSV (ver :func:`formatar`).
+    """
+    validar_formato(formato)
+    if formato == "csv":
+        return GravadorCsv(destino, header, inicio_criterios, sep=sep, formatos=formatos)
+    return GravadorColunar(destino, header, inicio_criterios, formato=formato)
+
+
+@dataclass(frozen=True)
+class Partes:
+    """Como os arquivos intermediários do pipeline são gravados e relidos.
+
+    São os parciais dos processos trabalhadores e as runs da ordenação
+    externa (ver :mod:`ordenacaoExterna`). Com saída ``"csv"`` são CSVs sem
+    cabeçalho no separador da saída, com os critérios já formatados, de modo
+    que os parciais podem ser copiados byte a byte para o CSV final (ver
+    :meth:`GravadorCsv.copiar_parte`) e relidos como texto. Com saída
+    colunar são Arrow IPC com os critérios em ``float64``, relidos como
+    números e copiados para a saída sem conversão para texto.
+    """
+
+    formato: str
+    header: tuple[str, ...]
+    inicio_criterios: int
+    formatos: tuple[str, ...]
+    sep: str
+
+    @classmethod
+    def texto(cls, header: Sequence[str], sep: str) -> Partes:
+        """Partes só com colunas de texto (nenhum critério)."""
+        return cls("csv", tuple(header), len(header), (), sep)
+
+    @property
+    def extensao(self) -> str:
+        return EXTENSOES_PARTES[self.formato]
+
+    def gravador(self, destino: Path) -> GravadorCsv | GravadorColunar:
+        """Gravador que anexa blocos a ``destino`` (use como gerenciador de contexto)."""
+        if self.formato == "csv":
+            return GravadorCsv(
+                destino, self.header, self.inicio_criterios, sep=self.sep, formatos=self.formatos, cabecalho=False
+            )
+        return GravadorColunar(
+            destino, self.header, self.inicio_criterios, formato="feather", tipo_criterios="float64"
+        )
+
+    def gravar(self, df: pd.DataFrame, destino: Path) -> None:
+        with self.gravador(destino) as gravador:
+            gravador.gravar(df)
+
+    def ler(self, parte: Path, buffer_linhas: int | None = None) -> Iterator[pd.DataFrame]:
+        """Blocos de até ``buffer_linhas`` linhas de ``parte`` (um só sem ``buffer_linhas``)."""
+        if self.formato != "csv":
+            yield from self._ler_arrow(parte, buffer_linhas)
+            return
+        if not Path(parte).stat().st_size:
+            return  # parcial sem nenhuma linha
+        blocos = pd.read_csv(
+            parte, sep=self.sep, header=None, dtype=str, keep_default_na=False, chunksize=buffer_linhas
+        )
+        for bloco in [blocos] if buffer_linhas is None else blocos:
+            bloco.columns = self.header
+            yield bloco
+
+    def _ler_arrow(self, parte: Path, buffer_linhas: int | None) -> Iterator[pd.DataFrame]:
+        with pa.memory_map(str(parte)) as fonte:
+            tabela = pa.ipc.open_file(fonte).read_all()  # mapeada: só os blocos convertidos vão para a memória
+            passo = buffer_linhas or max(tabela.num_rows, 1)
+            for inicio in range(0, tabela.num_rows, passo):
+                bloco = tabela.slice(inicio, passo).to_pandas()
+                bloco.columns = self.header
+                yield bloco
+
+    def chave(self, serie: pd.Series) -> pd.Series:
+        """Chave de ordenação de ``serie`` (``key`` do ``sort_values``).
+
+        Na saída CSV um critério numérico é comparado pelo texto que o CSV
+        grava, de modo que a ordem não depende de a linha ter passado ou não
+        por um parcial. Na saída colunar os critérios são gravados como
+        números e ordenados pelo valor.
+        """
+        formatos = dict(zip(self.header[self.inicio_criterios :], self.formatos))
+        if self.formato != "csv" or serie.name not in formatos or not is_numeric_dtype(serie):
+            return serie
+        return pd.Series(formatar_coluna(serie.to_numpy(), formatos[serie.name]), index=serie.index)
@@ -12,6 +12,7 @@ import re
 
 from comparators.core import build_criterios_labels
 import comparaRegistros as cr  # módulo já existente
+import controleExecucao as ce
 import csv
 
 # Emojis para tipos de variáveis
@@ -486,27 +487,52 @@ class ToolTip:
 # ============================ Barra de progresso modal ===============================
 class ProgressDialog(tk.Toplevel):
     """Exibe progresso determinate ou indeterminate.
-    Para atualizar progresso: use queue e método update_from_queue."""
-    def __init__(self, parent: tk.Tk, title: str = "Progresso"):
+    Para atualizar progresso: use queue e método update_from_queue.
+    Com ``controle`` mostra os botões Pausar/Continuar e Cancelar."""
+    def __init__(self, parent: tk.Tk, title: str = "Progresso", controle: ce.Controle | None = None):
         super().__init__(parent)
         self.title(title)
-        self.geometry("400x120")
+        self.controle = controle
+        self.geometry("400x160" if controle else "400x120")
         self.resizable(False, False)
         self.grab_set()
         self.update_idletasks()
         x = parent.winfo_rootx() + (parent.winfo_width() - self.winfo_width()) // 2
         y = parent.winfo_rooty() + (parent.winfo_height() - self.winfo_height()) // 2
         self.geometry(f"+{x}+{y}")
-        self.protocol("WM_DELETE_WINDOW", lambda: None)  # desabilita fechar
+        # sem controle não há como interromper: fechar fica desabilitado
+        self.protocol("WM_DELETE_WINDOW", self._cancelar if controle else lambda: None)
         ttk.Label(self, text=title, font=(parent.font_family, 15, "bold")).pack(pady=10)
         self.pb = ttk.Progressbar(self, orient="horizontal", length=350, mode="determinate")
         self.pb.pack(pady=5)
         self.lbl_info = ttk.Label(self, text="0%", font=(parent.font_family, 15))
         self.lbl_info.pack()
+        if controle:
+            botoes = ttk.Frame(self)
+            botoes.pack(pady=5)
+            self.btn_pausa = ttk.Button(botoes, text="Pausar", command=self._alternar_pausa)
+            self.btn_pausa.pack(side="left", padx=5)
+            self.btn_cancelar = ttk.Button(botoes, text="Cancelar", command=self._cancelar)
+            self.btn_cancelar.pack(side="left", padx=5)
         self.start_time = time.time()
         self.queue: queue.Queue[tuple[int, str, float | None]] = queue.Queue()
         self.after(100, self._poll)
 
+    def _alternar_pausa(self):
+        if self.controle.pausado:
+            self.controle.retomar()
+            self.btn_pausa.config(text="Pausar")
+        else:
+            self.controle.pausar()
+            self.btn_pausa.config(text="Continuar")
+            self.lbl_info.config(text="Pausando após os lotes em andamento…")
+
+    def _cancelar(self):
+        self.controle.cancelar()
+        self.btn_pausa.config(state="disabled")
+        self.btn_cancelar.config(state="disabled")
+        self.lbl_info.config(text="Cancelando…")
+
     def _poll(self):
         try:
             while True:
@@ -1014,11 +1040,12 @@ class App(tk.Tk):
                 tipo = override
             pares.append((idx1, idx2, tipo, c1))
         self._update_sort_options()
-        dlg = ProgressDialog(self, "Comparando registros")
+        controle = ce.Controle()
+        dlg = ProgressDialog(self, "Comparando registros", controle)
         dlg.put(-1, "Preparando…")
         def worker():
             try:
-                cr.processar_generico(
+                estatisticas = cr.processar_generico(
                     self.filepath,
                     out_base,
                     pares,
@@ -1027,10 +1054,23 @@ class App(tk.Tk):
                     sort_by=(None if self.sort_by_var.get() == "Nenhum" else self.sort_by_var.get()),
                     ascending=(self.sort_order_var.get() == "ASC"),
                     workers=max(1, min(self.total_cores, self.workers_var.get())),
+                    cache_dir=".freq_cache",
+                    # uma queda no meio da comparação retoma do último lote gravado
+                    checkpoint_dir=f"{out_base}.checkpoint",
+                    controle=controle,
                 )
                 self.output_csv = f"{out_base}.csv"
                 dlg.put(100, "Concluído")
-                messagebox.showinfo("Pronto", "Comparação concluída.")
+                resumo = "\n".join(
+                    f"{p.nome}: {p.pontuadas}/{p.linhas} combinações pontuadas ({p.razao_dedup:.1f}x)"
+                    for p in estatisticas.pares
+                )
+                messagebox.showinfo("Pronto", f"Comparação concluída.\n\n{resumo}")
+            except ce.ExecucaoCancelada:
+                dlg.destroy()
+                messagebox.showinfo(
+                    "Cancelado", "Comparação cancelada. Rode de novo com os mesmos campos para retomar de onde parou."
+                )
             except Exception as exc:
                 dlg.destroy()
                 messagebox.showerror("Erro", f"Falha no processamento: {exc}")
@@ -0,0 +1,237 @@
+# indiceLinhas.py
+"""Leitura do CSV de entrada por um índice de deslocamentos das linhas.
+
+Na primeira leitura o arquivo é mapeado em memória (``mmap``) e varrido uma
+única vez para achar o byte onde começa cada linha de dados; o índice
+(:class:`IndiceLinhas`) fica gravado em ``cache_dir``, indexado pela
+impressão digital do arquivo (ver :func:`freqBuilder.fingerprint`) e pelo
+separador, e reexecuções sobre a mesma entrada o reabrem sem ler o CSV.
+
+Com o índice qualquer faixa de linhas vira uma faixa de bytes, lida sem
+passar pelas anteriores: a leitura pode recomeçar de uma linha qualquer e
+cada processo trabalhador interpreta a sua própria faixa
+(:func:`ler_faixa`), sem que o processo principal leia a entrada.
+
+A varredura segue o tokenizador do pandas: quebras de linha dentro de
+campos entre aspas não separam registros, aspas no meio de um campo são
+texto comum e linhas em branco são ignoradas. Os terminadores aceitos são
+``\\n`` e ``\\r\\n``.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+import freqBuilder as fb
+
+_QUEBRA = ord("\n")
+_ASPAS = ord('"')
+_BRANCOS = b" \t\r"
+
+# Bytes varridos por vez na construção do índice.
+_PEDACO = 64 * 1024 * 1024
+
+# Índices abertos neste processo, por (arquivo, separador, impressão digital).
+_ABERTOS: dict[tuple[str, str, str], IndiceLinhas] = {}
+
+
+def _fora_de_aspas(mm, quebras: np.ndarray, aspas: np.ndarray, sep: int, fim: int, estado: dict) -> np.ndarray:
+    """Descarta de ``quebras`` as que caem dentro de campos entre aspas.
+
+    As aspas são tratadas por sequências de aspas seguidas. Fora de um campo
+    entre aspas, uma sequência no início do campo o abre e as aspas seguintes
+    já contam como dentro dele; no meio do campo é texto comum. Dentro, cada
+    ``""`` é uma aspa escapada e a aspa que sobra fecha o campo. Logo uma
+    sequência ímpar no início do campo inverte o estado, uma ímpar no meio do
+    campo sempre o deixa fechado e uma par não o muda: o estado depois de cada
+    sequência é a paridade (soma acumulada) das inversões desde o último
+    fechamento forçado.
+
+    ``estado`` leva de um pedaço para o próximo se o último campo ficou
+    aberto (``dentro``) e a sequência que chega ao ``fim`` do pedaço
+    (``pendentes``), que pode continuar no seguinte.
+    """
+    aspas = np.concatenate([estado["pendentes"], aspas])
+    pendentes = aspas[:0]
+    if len(aspas) and aspas[-1] == fim - 1 and fim < len(mm):
+        corte = np.flatnonzero(np.diff(aspas) != 1)
+        k = int(corte[-1]) + 1 if len(corte) else 0
+        aspas, pendentes = aspas[:k], aspas[k:]
+    estado["pendentes"] = pendentes
+    entrada = estado["dentro"]
+    if not len(aspas):
+        return quebras[:0] if entrada else quebras
+    primeiras = np.flatnonzero(np.diff(aspas, prepend=-2) != 1)
+    inicios = aspas[primeiras]
+    impar = np.diff(primeiras, append=len(aspas)) % 2 == 1
+    anterior = np.frombuffer(mm, dtype=np.uint8)[np.maximum(inicios - 1, 0)]
+    no_inicio = (inicios == 0) | np.isin(anterior, (sep, _QUEBRA, 13))
+    inversoes = np.cumsum(no_inicio & impar)
+    fechado = np.maximum.accumulate(np.where(~no_inicio & impar, np.arange(len(inicios)), -1))
+    base = np.where(fechado >= 0, inversoes[np.maximum(fechado, 0)], -int(entrada))
+    dentro = (inversoes - base) % 2 == 1
+    estado["dentro"] = bool(dentro[-1])
+    k = np.searchsorted(inicios, quebras, side="right") - 1
+    return quebras[~np.where(k >= 0, dentro[np.maximum(k, 0)], entrada)]
+
+
+def construir(arquivo: str, sep: str) -> np.ndarray:
+    """Deslocamentos (``int64``) do início de cada linha de dados, mais o tamanho do arquivo."""
+    tamanho = os.path.getsize(arquivo)
+    if not tamanho:
+        return np.zeros(1, dtype=np.int64)
+    with open(arquivo, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        estado = {"dentro": False, "pendentes": np.zeros(0, dtype=np.int64)}
+        fins = []
+        for ini in range(0, tamanho, _PEDACO):
+            fim_pedaco = min(ini + _PEDACO, tamanho)
+            pedaco = np.frombuffer(mm, dtype=np.uint8, count=fim_pedaco - ini, offset=ini)
+            quebras = np.flatnonzero(pedaco == _QUEBRA) + ini
+            aspas = np.flatnonzero(pedaco == _ASPAS)
+            del pedaco  # o mmap só fecha sem visões abertas
+            if len(aspas) or estado["dentro"] or len(estado["pendentes"]):
+                quebras = _fora_de_aspas(mm, quebras, aspas + ini, ord(sep), fim_pedaco, estado)
+            fins.append(quebras)
+        inicios = np.concatenate([np.zeros(1, dtype=np.int64)] + [q + 1 for q in fins])
+        fim = np.append(inicios[1:] - 1, tamanho)
+        if inicios[-1] == tamanho:
+            inicios, fim = inicios[:-1], fim[:-1]
+        # linhas em branco: candidatas são as vazias ou que começam por espaço
+        brancos = (_BRANCOS.replace(sep.encode(), b"") if len(sep.encode()) == 1 else _BRANCOS) + b"\n"
+        primeiro = np.frombuffer(mm, dtype=np.uint8)[inicios]
+        candidatas = np.flatnonzero(np.isin(primeiro, list(brancos)))
+        vazias = [k for k in candidatas.tolist() if not mm[inicios[k] : fim[k]].strip(brancos)]
+    registros = np.delete(inicios, vazias)
+    # o primeiro registro é o cabeçalho
+    return np.append(registros[1:], tamanho).astype(np.int64)
+
+
+def _caminho(cache_dir: Path, fp: str, sep: str) -> Path:
+    chave = hashlib.blake2b(repr((fp, sep)).encode(), digest_size=16).hexdigest()
+    return cache_dir / f"{chave}.idx"
+
+
+def abrir(arquivo: str, sep: str, *, cache_dir: str | None = None) -> IndiceLinhas:
+    """Índice de ``arquivo``: reaproveitado deste processo, lido de ``cache_dir`` ou construído.
+
+    Com ``cache_dir`` um índice construído é gravado lá (``*.idx``, no
+    formato ``.npy``) e reaberto mapeado em memória nas próximas execuções;
+    sem ele o índice só vive no processo atual.
+    """
+    fp = fb.fingerprint(arquivo)
+    chave = (os.path.abspath(arquivo), sep, fp)
+    indice = _ABERTOS.get(chave)
+    if indice is not None:
+        return indice
+    deslocamentos = None
+    if cache_dir is not None:
+        pasta = Path(cache_dir)
+        caminho = _caminho(pasta, fp, sep)
+        try:
+            deslocamentos = np.load(caminho, mmap_mode="r")
+            os.utime(caminho)  # marca uso recente para a política de expiração
+        except (OSError, ValueError):
+            deslocamentos = None
+    if deslocamentos is None:
+        deslocamentos = construir(arquivo, sep)
+        if cache_dir is not None:
+            pasta.mkdir(parents=True, exist_ok=True)
+            tmp = caminho.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, deslocamentos)
+            os.replace(tmp, caminho)
+            fb.evict_cache(cache_dir, max_bytes=float("inf"), padrao="*.idx")
+    indice = IndiceLinhas(arquivo, sep, deslocamentos)
+    _ABERTOS.clear()  # um índice por vez: podem ser grandes
+    _ABERTOS[chave] = indice
+    return indice
+
+
+def ler_faixa(
+    arquivo: str,
+    sep: str,
+    ini: int,
+    fim: int,
+    ncolunas: int,
+    *,
+    colunas: Sequence[int] | None = None,
+    inicio: int = 0,
+) -> pd.DataFrame:
+    """Linhas entre os bytes ``ini`` e ``fim`` de ``arquivo`` (sem cabeçalho).
+
+    As colunas saem numeradas pela posição no arquivo (só as ``colunas``,
+    se dadas) e o índice começa em ``inicio``, a linha de ``ini``.
+    """
+    if fim > ini:
+        with open(arquivo, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            dados = mm[ini:fim]
+    else:
+        dados = b""
+    df = pd.read_csv(io.BytesIO(dados), sep=sep, header=None, names=list(range(ncolunas)), dtype=str, usecols=colunas)
+    df.index = pd.RangeIndex(inicio, inicio + len(df))
+    return df.fillna("")
+
+
+class IndiceLinhas:
+    """Deslocamentos das linhas de dados de ``arquivo`` (ver :func:`construir`)."""
+
+    def __init__(self, arquivo: str, sep: str, deslocamentos: np.ndarray):
+        self.arquivo = arquivo
+        self.sep = sep
+        self.deslocamentos = deslocamentos
+        self.nomes = list(pd.read_csv(arquivo, sep=sep, dtype=str, nrows=0).columns)
+
+    def __len__(self) -> int:
+        return len(self.deslocamentos) - 1
+
+    def faixa(self, inicio: int, fim: int) -> tuple[int, int]:
+        """Bytes ``(ini, fim)`` das linhas ``inicio`` a ``fim - 1``."""
+        inicio = min(max(inicio, 0), len(self))
+        fim = min(max(fim, inicio), len(self))
+        return int(self.deslocamentos[inicio]), int(self.deslocamentos[fim])
+
+    def ler(self, inicio: int, fim: int, *, colunas: Sequence[int] | None = None) -> pd.DataFrame:
+        """Linhas ``inicio`` a ``fim - 1`` com os nomes de coluna do cabeçalho."""
+        ini, fim_bytes = self.faixa(inicio, fim)
+        df = ler_faixa(
+            self.arquivo, self.sep, ini, fim_bytes, len(self.nomes), colunas=colunas, inicio=min(inicio, len(self))
+        )
+        df.columns = [self.nomes[i] for i in df.columns]
+        return df
+
+    def blocos(
+        self, chunksize: int | None = None, *, inicio: int = 0, colunas: Sequence[int] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Blocos de ``chunksize`` linhas a partir da linha ``inicio`` (um único sem ``chunksize``)."""
+        passo = chunksize or max(len(self) - inicio, 1)
+        yield self.ler(inicio, inicio + passo, colunas=colunas)
+        for pos in range(inicio + passo, len(self), passo):
+            yield self.ler(pos, pos + passo, colunas=colunas)
+
+
+class Leitura:
+    """Blocos lidos por um :class:`IndiceLinhas` (ver :func:`leituraEntrada.ler`).
+
+    É um iterador de DataFrames como os outros leitores; o executor paralelo
+    usa ``indice``, ``colunas`` e ``inicio`` para mandar aos trabalhadores
+    faixas de bytes em vez de dados.
+    """
+
+    def __init__(self, indice: IndiceLinhas, chunksize: int | None, colunas: list[int] | None, inicio: int):
+        self.indice = indice
+        self.colunas = colunas
+        self.inicio = inicio
+        self._blocos = indice.blocos(chunksize, inicio=inicio, colunas=colunas)
+
+    def __iter__(self) -> Leitura:
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        return next(self._blocos)
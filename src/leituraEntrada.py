@@ -0,0 +1,198 @@
+# leituraEntrada.py
+"""Leitura do CSV de entrada em blocos de DataFrames de texto.
+
+Com o ``pyarrow`` instalado (``motor="auto"`` ou ``"pyarrow"``) o arquivo é
+lido pelo leitor CSV do Arrow, que separa e converte os campos em várias
+threads e só materializa as colunas pedidas; cada bloco vira um DataFrame
+com strings deduplicadas (valores repetidos compartilham o mesmo objeto).
+Sem ele, ou com ``motor="pandas"``, a leitura é feita por ``pd.read_csv``.
+``motor="mmap"`` lê pelo índice de deslocamentos das linhas
+(ver :mod:`indiceLinhas`), que permite começar de uma linha qualquer sem
+interpretar as anteriores.
+
+Os motores entregam o mesmo resultado: colunas ``str``, valores
+ausentes (os marcadores padrão do pandas, ex.: ``NA``) como ``""``, os
+nomes de coluna do pandas (repetidos viram ``a.1``), quebras de linha dentro
+de campos entre aspas preservadas, linhas em branco (ou só com espaços)
+ignoradas e blocos de exatamente ``chunksize`` linhas. Linhas que o Arrow
+recusa e o pandas aceita (ex.: com menos campos que o cabeçalho) fazem a
+leitura seguir pelo pandas a partir do bloco em que apareceram.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+import pandas as pd
+
+import indiceLinhas as il
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - sem pyarrow a leitura usa o pandas
+    pa = None
+
+MOTORES = ("auto", "pandas", "pyarrow", "mmap")
+
+# Marcadores lidos como ausentes pelo ``pd.read_csv`` (``na_values`` padrão).
+_NULOS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# Bytes por bloco lido pelo Arrow no modo streaming.
+_BLOCO_BYTES = 16 * 1024 * 1024
+
+
+def resolver_motor(motor: str, sep: str = ",") -> str:
+    """Motor efetivo (``"pandas"`` ou ``"pyarrow"``) para ``motor``.
+
+    ``"auto"`` usa o Arrow quando ele está instalado e o separador tem um
+    único caractere (separadores maiores são expressões regulares no pandas).
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de leitura desconhecido: '{motor}' (use {', '.join(MOTORES)})")
+    if motor in ("pyarrow", "mmap"):
+        if motor == "pyarrow" and pa is None:
+            raise ImportError("o motor 'pyarrow' requer o pacote pyarrow")
+        if len(sep) != 1:
+            raise ValueError(f"o motor '{motor}' exige um separador de um caractere")
+        return motor
+    if motor == "auto":
+        return "pyarrow" if pa is not None and len(sep) == 1 else "pandas"
+    return motor
+
+
+def cabecalho(arquivo: str, sep: str) -> list[str]:
+    """Nomes das colunas de ``arquivo`` como o pandas os lê."""
+    return list(pd.read_csv(arquivo, sep=sep, dtype=str, nrows=0).columns)
+
+
+def ler(
+    arquivo: str,
+    sep: str,
+    *,
+    chunksize: int | None = None,
+    colunas: Sequence[int] | None = None,
+    motor: str = "auto",
+    inicio: int = 0,
+    cache_dir: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Lê ``arquivo`` em blocos de ``chunksize`` linhas (um único bloco sem ``chunksize``).
+
+    ``colunas`` restringe a leitura a essas posições, que aparecem na ordem
+    do arquivo, como no ``usecols`` do pandas. ``inicio`` pula as primeiras
+    linhas de dados (o índice dos blocos continua a numeração do arquivo); só
+    o motor ``"mmap"`` as pula sem interpretá-las. ``cache_dir`` é onde esse
+    motor guarda o índice de linhas (ver :func:`indiceLinhas.abrir`).
+    """
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize deve ser positivo")
+    if inicio < 0:
+        raise ValueError("inicio não pode ser negativo")
+    usadas = sorted(set(colunas)) if colunas is not None else None
+    motor = resolver_motor(motor, sep)
+    if motor == "mmap":
+        return il.Leitura(il.abrir(arquivo, sep, cache_dir=cache_dir), chunksize, usadas, inicio)
+    if motor == "pandas":
+        blocos = _ler_pandas(arquivo, sep, chunksize, usadas)
+    else:
+        blocos = _ler_arrow(arquivo, sep, chunksize, usadas)
+    return _a_partir(blocos, inicio) if inicio else blocos
+
+
+def _a_partir(blocos: Iterator[pd.DataFrame], inicio: int) -> Iterator[pd.DataFrame]:
+    """Descarta as linhas de ``blocos`` antes da linha ``inicio``."""
+    entregues = 0
+    ultimo = None
+    for bloco in blocos:
+        ultimo = bloco
+        if len(bloco) and bloco.index[-1] >= inicio:
+            yield bloco.iloc[max(inicio - bloco.index[0], 0) :]
+            entregues += 1
+    if not entregues and ultimo is not None:
+        yield ultimo.iloc[:0]  # como o pandas, ao menos um bloco (vazio)
+
+
+def _ler_pandas(arquivo: str, sep: str, chunksize: int | None, usadas: list[int] | None) -> Iterator[pd.DataFrame]:
+    if chunksize is None:
+        yield pd.read_csv(arquivo, sep=sep, dtype=str, usecols=usadas).fillna("")
+        return
+    for bloco in pd.read_csv(arquivo, sep=sep, dtype=str, chunksize=chunksize, usecols=usadas):
+        yield bloco.fillna("")
+
+
+def _ler_arrow(arquivo: str, sep: str, chunksize: int | None, usadas: list[int] | None) -> Iterator[pd.DataFrame]:
+    if len(cabecalho(arquivo, sep)) == 1:
+        # com uma coluna o Arrow lê uma linha só de espaços como valor; o pandas a ignora
+        yield from _ler_pandas(arquivo, sep, chunksize, usadas)
+        return
+    lidas = 0
+    try:
+        for bloco in _blocos_arrow(arquivo, sep, chunksize, usadas):
+            yield bloco
+            lidas += len(bloco)
+    except pa.ArrowInvalid:
+        # ``lidas`` é múltiplo de ``chunksize``: os blocos do pandas seguem alinhados
+        for bloco in _ler_pandas(arquivo, sep, chunksize, usadas):
+            if not len(bloco) or bloco.index[0] >= lidas:
+                yield bloco
+
+
+def _linhas_em_branco(sep: str):
+    """``invalid_row_handler`` do Arrow que pula linhas só com espaços, como o pandas."""
+    brancos = " \t\r\n".replace(sep, "")
+
+    def tratar(linha) -> str:
+        return "skip" if not linha.text.strip(brancos) else "error"
+
+    return tratar
+
+
+def _blocos_arrow(arquivo: str, sep: str, chunksize: int | None, usadas: list[int] | None) -> Iterator[pd.DataFrame]:
+    nomes = cabecalho(arquivo, sep)
+    if usadas is None:
+        usadas = list(range(len(nomes)))
+    # nomes internos posicionais: o cabeçalho pode repetir nomes
+    internos = [str(i) for i in range(len(nomes))]
+    opcoes = dict(
+        read_options=pa_csv.ReadOptions(column_names=internos, skip_rows=1, block_size=_BLOCO_BYTES),
+        parse_options=pa_csv.ParseOptions(
+            delimiter=sep, newlines_in_values=True, invalid_row_handler=_linhas_em_branco(sep)
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={nome: pa.string() for nome in internos},
+            include_columns=[internos[i] for i in usadas],
+            null_values=_NULOS,
+            strings_can_be_null=True,
+        ),
+    )
+    selecionados = [nomes[i] for i in usadas]
+    if chunksize is None:
+        yield _para_pandas(pa_csv.read_csv(arquivo, **opcoes), selecionados)
+        return
+
+    leitor = pa_csv.open_csv(arquivo, **opcoes)
+    pendentes: list = []
+    linhas = 0
+    lidas = 0
+    for lote in leitor:
+        pendentes.append(lote)
+        linhas += lote.num_rows
+        while linhas >= chunksize:
+            tabela = pa.Table.from_batches(pendentes, schema=leitor.schema)
+            yield _para_pandas(tabela.slice(0, chunksize), selecionados, inicio=lidas)
+            lidas += chunksize
+            resto = tabela.slice(chunksize)
+            pendentes, linhas = resto.to_batches(), resto.num_rows
+    if linhas or not lidas:
+        # o pandas entrega um bloco vazio para um arquivo só com cabeçalho
+        yield _para_pandas(pa.Table.from_batches(pendentes, schema=leitor.schema), selecionados, inicio=lidas)
+
+
+def _para_pandas(tabela, nomes: list[str], *, inicio: int = 0) -> pd.DataFrame:
+    """DataFrame de ``tabela`` com o índice que o pandas daria (linhas a partir de ``inicio``)."""
+    df = tabela.to_pandas(deduplicate_objects=True)
+    df.columns = nomes
+    df.index = pd.RangeIndex(inicio, inicio + len(df))
+    return df.fillna("")
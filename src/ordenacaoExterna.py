@@ -0,0 +1,129 @@
+# ordenacaoExterna.py
+"""Ordenação externa (merge sort) de CSVs grandes demais para a memória.
+
+Cada bloco já pontuado é ordenado em memória e gravado como uma *run*
+temporária; ao final as runs são intercaladas com :func:`heapq.merge`,
+mantendo em memória apenas um pequeno buffer por run.
+
+As runs são gravadas e relidas por uma :class:`gravacaoSaida.Partes`
+(``partes``); sem ela são CSVs de texto no separador ``sep``.
+"""
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+import gravacaoSaida as gs
+
+# Quantidade máxima de runs abertas simultaneamente em uma intercalação.
+FAN_IN = 64
+
+
+def gravar_run(
+    df: pd.DataFrame,
+    destino: str | Path,
+    coluna: str,
+    ascending: bool,
+    *,
+    sep: str = "|",
+    partes: gs.Partes | None = None,
+) -> Path:
+    """Ordena ``df`` por ``coluna`` (ordenação estável) e grava como run sem cabeçalho."""
+    destino = Path(destino)
+    partes = partes or gs.Partes.texto(list(df.columns), sep)
+    partes.gravar(df.sort_values(by=coluna, ascending=ascending, kind="stable", key=partes.chave), destino)
+    return destino
+
+
+def _ler_run(path: Path, partes: gs.Partes, pos: int, ascending: bool, buffer_linhas: int) -> Iterator[tuple]:
+    """``(chave, linha)`` de cada linha da run (ver :meth:`gravacaoSaida.Partes.chave`).
+
+    Chaves numéricas levam na frente se o valor é nulo, para que os nulos
+    saiam por último nos dois sentidos, como no ``sort_values``.
+    """
+    for bloco in partes.ler(path, buffer_linhas):
+        serie = partes.chave(bloco.iloc[:, pos])
+        if is_numeric_dtype(serie):
+            nulos = serie.isna().to_numpy()
+            chaves = list(zip((nulos if ascending else ~nulos).tolist(), serie.fillna(0).tolist()))
+        else:
+            chaves = serie.tolist()
+        yield from zip(chaves, bloco.itertuples(index=False, name=None))
+
+
+def mesclar_runs(
+    runs: Sequence[str | Path],
+    destino: str | Path,
+    header: Sequence[str],
+    coluna: str,
+    ascending: bool,
+    *,
+    sep: str = "|",
+    buffer_linhas: int = 10_000,
+    gravar: Callable[[pd.DataFrame], None] | None = None,
+    partes: gs.Partes | None = None,
+) -> None:
+    """Intercala as ``runs`` (já ordenadas) em ``destino`` com cabeçalho.
+
+    Quando há mais de :data:`FAN_IN` runs, a intercalação é feita em
+    níveis, gravando runs intermediárias ao lado das originais (removidas
+    ao final; as runs recebidas continuam sob responsabilidade de quem chama).
+    Com ``gravar``, a intercalação final é entregue a essa função em lotes
+    de ``buffer_linhas`` linhas em vez de gravada em ``destino``.
+    """
+    destino = Path(destino)
+    runs = [Path(r) for r in runs]
+    partes = partes or gs.Partes.texto(header, sep)
+    pos = list(header).index(coluna)
+    originais = set(runs)
+    nivel = 0
+    while len(runs) > FAN_IN:
+        proximas: list[Path] = []
+        for g in range(0, len(runs), FAN_IN):
+            grupo = runs[g : g + FAN_IN]
+            saida = grupo[0].with_name(f"merge_{nivel}_{g // FAN_IN}{grupo[0].suffix}")
+            with partes.gravador(saida) as gravador:
+                _intercalar(grupo, header, pos, ascending, partes, buffer_linhas=buffer_linhas, gravar=gravador.gravar)
+            for r in grupo:
+                if r not in originais:
+                    r.unlink()
+            proximas.append(saida)
+        runs = proximas
+        nivel += 1
+    if gravar is not None:
+        _intercalar(runs, header, pos, ascending, partes, buffer_linhas=buffer_linhas, gravar=gravar)
+    else:
+        with gs.GravadorCsv(
+            destino, header, partes.inicio_criterios, sep=partes.sep, formatos=partes.formatos
+        ) as gravador:
+            _intercalar(runs, header, pos, ascending, partes, buffer_linhas=buffer_linhas, gravar=gravador.gravar)
+    for r in runs:
+        if r not in originais:
+            r.unlink()
+
+
+def _intercalar(
+    runs: Sequence[Path],
+    header: Sequence[str],
+    pos: int,
+    ascending: bool,
+    partes: gs.Partes,
+    *,
+    buffer_linhas: int,
+    gravar: Callable[[pd.DataFrame], None],
+) -> None:
+    por_run = max(100, buffer_linhas // max(1, len(runs)))
+    fontes = [_ler_run(r, partes, pos, ascending, por_run) for r in runs]
+    lote: list[tuple] = []
+    for _, linha in heapq.merge(*fontes, key=itemgetter(0), reverse=not ascending):
+        lote.append(linha)
+        if len(lote) >= buffer_linhas:
+            gravar(pd.DataFrame(lote, columns=list(header)))
+            lote.clear()
+    if lote:
+        gravar(pd.DataFrame(lote, columns=list(header)))
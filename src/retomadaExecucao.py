@@ -0,0 +1,168 @@
+# retomadaExecucao.py
+"""Checkpoints de execuções longas de :func:`comparaRegistros.processar_generico`.
+
+Cada faixa de linhas pontuada é gravada em um arquivo parcial próprio em
+``pasta`` e registrada no manifesto (``manifesto.jsonl``). A primeira linha
+do manifesto é a assinatura da execução: impressão digital da entrada,
+separador, pares e os parâmetros que mudam o conteúdo dos parciais. Cada
+linha seguinte é uma faixa concluída, anexada assim que o seu parcial fica
+pronto. Uma reexecução com a mesma assinatura só pontua as faixas que
+faltam; com outra assinatura o checkpoint antigo é descartado.
+
+Uma faixa só entra no manifesto depois que o seu parcial foi gravado por
+inteiro e sincronizado com o disco (``fsync`` do arquivo e da pasta), e a
+linha guarda o tamanho do parcial: na retomada, um parcial que não existe
+ou tem outro tamanho deixa a faixa como pendente. Uma última linha
+incompleta (queda no meio da escrita) é ignorada. Assim, um checkpoint
+nunca aponta para um parcial truncado.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+MANIFESTO = "manifesto.jsonl"
+VERSAO = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Faixa:
+    """Faixa de linhas ``[inicio, fim)`` concluída e o resumo da sua pontuação."""
+
+    inicio: int
+    fim: int
+    gravadas: int
+    contagens: list[list[int]]
+
+    @property
+    def linhas(self) -> int:
+        return self.fim - self.inicio
+
+
+def _sincronizar(caminho: Path, *, pasta: bool = False) -> None:
+    """``fsync`` de um arquivo já gravado (ou, com ``pasta``, das entradas de um diretório)."""
+    if pasta and os.name == "nt":
+        return  # o Windows não abre diretórios; o NTFS registra as entradas no journal
+    fd = os.open(caminho, os.O_RDONLY if pasta else os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Retomada:
+    """Checkpoint em ``pasta`` para a execução descrita por ``assinatura``.
+
+    ``assinatura`` deve ser serializável em JSON; ela é comparada depois de
+    um ciclo pelo JSON (tuplas viram listas). ``extensao`` é a dos arquivos
+    parciais.
+    """
+
+    def __init__(self, pasta: str | Path, assinatura: dict[str, Any], *, extensao: str = ".csv"):
+        self.pasta = Path(pasta)
+        self.extensao = extensao
+        self.assinatura = json.loads(json.dumps({"versao": VERSAO, **assinatura}))
+        self.concluidas: list[Faixa] = []
+        if not self._carregar():
+            self._limpar()
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            self._anexar(self.assinatura)
+
+    def _carregar(self) -> bool:
+        try:
+            texto = (self.pasta / MANIFESTO).read_text(encoding="utf-8")
+        except OSError:
+            return False
+        *linhas, resto = texto.split("\n")
+        try:
+            if not linhas or json.loads(linhas[0]) != self.assinatura:
+                return False
+        except ValueError:
+            return False
+        integro = not resto  # sem linha incompleta no fim
+        validas: dict[tuple[int, int], tuple[Faixa, int]] = {}
+        for linha in linhas[1:]:
+            try:
+                registro = json.loads(linha)
+                tamanho = registro.pop("tamanho")
+                faixa = Faixa(**registro)
+            except (ValueError, TypeError, KeyError):
+                integro = False
+                break
+            try:
+                integra = self.parte(faixa.inicio, faixa.fim).stat().st_size == tamanho
+            except OSError:
+                integra = False
+            if integra:
+                validas[faixa.inicio, faixa.fim] = (faixa, tamanho)
+            else:
+                integro = False
+        self.concluidas = sorted((f for f, _ in validas.values()), key=lambda f: f.inicio)
+        if not integro:
+            # regrava só as linhas válidas (para os próximos registros não colarem numa incompleta)
+            registros = [self.assinatura] + [{**asdict(f), "tamanho": t} for f, t in validas.values()]
+            tmp = self.pasta / f"{MANIFESTO}.tmp"
+            tmp.write_text("".join(json.dumps(r) + "\n" for r in registros), encoding="utf-8")
+            os.replace(tmp, self.pasta / MANIFESTO)
+        return True
+
+    def _anexar(self, registro: dict[str, Any]) -> None:
+        with open(self.pasta / MANIFESTO, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def parte(self, inicio: int, fim: int) -> Path:
+        """Arquivo parcial da faixa ``[inicio, fim)``."""
+        return self.pasta / f"faixa_{inicio}_{fim}{self.extensao}"
+
+    def registrar(self, faixa: Faixa) -> None:
+        """Marca ``faixa`` como concluída (o parcial já deve estar gravado).
+
+        O parcial e a pasta são sincronizados com o disco antes da linha do
+        manifesto, que nunca chega ao disco antes dos dados a que se refere.
+        """
+        parte = self.parte(faixa.inicio, faixa.fim)
+        _sincronizar(parte)
+        _sincronizar(self.pasta, pasta=True)
+        self._anexar({**asdict(faixa), "tamanho": parte.stat().st_size})
+        self.concluidas.append(faixa)
+
+    def faltantes(self, inicio: int, fim: int) -> list[tuple[int, int]]:
+        """Subfaixas de ``[inicio, fim)`` ainda não concluídas."""
+        faltam = []
+        for faixa in sorted(self.concluidas, key=lambda f: f.inicio):
+            if faixa.fim <= inicio:
+                continue
+            if faixa.inicio >= fim:
+                break
+            if faixa.inicio > inicio:
+                faltam.append((inicio, faixa.inicio))
+            inicio = max(inicio, faixa.fim)
+        if inicio < fim:
+            faltam.append((inicio, fim))
+        return faltam
+
+    def continuo(self, inicio: int) -> int:
+        """Primeira linha a partir de ``inicio`` que ainda não foi concluída."""
+        for faixa in sorted(self.concluidas, key=lambda f: f.inicio):
+            if faixa.inicio <= inicio < faixa.fim:
+                inicio = faixa.fim
+        return inicio
+
+    def _limpar(self) -> None:
+        # só os arquivos do checkpoint: ``pasta`` pode ter outros
+        for padrao in (f"{MANIFESTO}*", "faixa_*", "merge_*"):
+            for p in self.pasta.glob(padrao):
+                p.unlink(missing_ok=True)
+
+    def remover(self) -> None:
+        """Apaga o checkpoint (execução concluída) e a pasta, se ficar vazia."""
+        self._limpar()
+        try:
+            self.pasta.rmdir()
+        except OSError:
+            pass
@@ -0,0 +1,84 @@
+# selecaoTopK.py
+"""Seleção das K melhores linhas por registro, em streaming.
+
+Quando só interessam os K melhores candidatos de cada registro (ex.: cada
+registro da base A), não é preciso gravar nem ordenar todas as linhas
+pontuadas. Cada bloco é reduzido em memória às K melhores linhas por chave
+(:func:`reduzir`) e o resultado alimenta um heap de tamanho K por chave
+(:class:`SelecaoTopK`); a memória usada é proporcional ao número de chaves
+vezes K, e não ao número de linhas.
+
+Empates na nota são resolvidos pela ordem de entrada: fica a linha que
+apareceu primeiro.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+COLUNA_NOTA = "nota final"
+
+
+def _notas(serie: pd.Series) -> np.ndarray:
+    if is_numeric_dtype(serie):
+        return serie.to_numpy(dtype=float)
+    # relidas de um parcial CSV: texto pt-BR
+    return pd.to_numeric(serie.str.replace(",", ".", regex=False)).to_numpy(dtype=float)
+
+
+def reduzir(df: pd.DataFrame, chave: str, k: int) -> pd.DataFrame:
+    """Mantém as ``k`` linhas de maior nota de cada valor de ``chave``, na ordem original."""
+    ordem = np.argsort(-_notas(df[COLUNA_NOTA]), kind="stable")
+    chaves = df[chave].iloc[ordem]
+    manter = chaves.groupby(chaves, sort=False).cumcount().to_numpy() < k
+    return df.iloc[np.sort(ordem[manter])]
+
+
+class SelecaoTopK:
+    """Heap de no máximo ``k`` linhas por valor de ``chave``.
+
+    As linhas devem chegar na ordem de entrada (blocos em ordem, cada um
+    possivelmente já passado por :func:`reduzir`).
+    """
+
+    def __init__(self, colunas: list[str], chave: str, k: int):
+        if k < 1:
+            raise ValueError("top_k deve ser positivo")
+        self.colunas = list(colunas)
+        self.chave = chave
+        self.k = k
+        self._heaps: dict[str, list[tuple[float, int, tuple]]] = {}
+        self._seq = 0
+
+    def adicionar(self, df: pd.DataFrame) -> None:
+        chaves = df[self.chave].tolist()
+        notas = _notas(df[COLUNA_NOTA]).tolist()
+        k = self.k
+        heaps = self._heaps
+        for chave, nota, linha in zip(chaves, notas, df.itertuples(index=False, name=None)):
+            # -seq: entre notas iguais a linha mais antiga é a "maior" e fica
+            item = (nota, -self._seq, linha)
+            self._seq += 1
+            heap = heaps.get(chave)
+            if heap is None:
+                heaps[chave] = [item]
+            elif len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def linhas(self) -> Iterable[tuple]:
+        """Linhas mantidas, agrupadas por chave (ordem da primeira aparição), melhor nota primeiro."""
+        for heap in self._heaps.values():
+            for _, _, linha in sorted(heap, key=lambda item: item[:2], reverse=True):
+                yield linha
+
+    def resultado(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self.linhas()), columns=self.colunas)
@@ -0,0 +1,146 @@
+# tabelasCompartilhadas.py
+"""Tabelas de frequência somente leitura em memória compartilhada.
+
+O processo principal grava todas as tabelas de uma execução num único bloco
+de :class:`multiprocessing.shared_memory.SharedMemory`; cada tabela ocupa
+três regiões contíguas: offsets (``Q``), contagens (``Q``) e as chaves em
+UTF-8 concatenadas, ordenadas por bytes. Os processos trabalhadores recebem
+apenas um :class:`Descritor` (nome do bloco e posições) e consultam as
+tabelas por busca binária, sem copiar nem desserializar os dicionários.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Iterator, Mapping
+
+_ITEM = array("Q").itemsize
+
+
+@dataclass(frozen=True)
+class Descritor:
+    """O que um trabalhador precisa para anexar as tabelas publicadas.
+
+    ``estrutura`` espelha ``freq_maps``: para cada par, ``None``, a posição de
+    uma tabela ou uma lista de posições ``(n, offsets, contagens, chaves)``.
+    """
+
+    nome: str
+    estrutura: dict[int, Any]
+
+
+class FrequenciasCompartilhadas(Mapping[str, int]):
+    """Visão ``token -> contagem`` sobre uma tabela publicada."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, n: int, off_offsets: int, off_contagens: int, off_chaves: int):
+        buf = shm.buf
+        self._n = n
+        self._offsets = buf[off_offsets : off_offsets + (n + 1) * _ITEM].cast("Q")
+        self._contagens = buf[off_contagens : off_contagens + n * _ITEM].cast("Q")
+        self._chaves = buf[off_chaves : off_chaves + self._offsets[n]]
+        # por último: ao destruir a visão, as fatias do buffer são liberadas antes do bloco
+        self._shm = shm
+
+    def _chave(self, i: int) -> bytes:
+        return bytes(self._chaves[self._offsets[i] : self._offsets[i + 1]])
+
+    def _posicao(self, token: str) -> int:
+        alvo = token.encode("utf-8")
+        lo, hi = 0, self._n
+        while lo < hi:
+            meio = (lo + hi) // 2
+            if self._chave(meio) < alvo:
+                lo = meio + 1
+            else:
+                hi = meio
+        return lo if lo < self._n and self._chave(lo) == alvo else -1
+
+    def __getitem__(self, token: str) -> int:
+        i = self._posicao(token) if isinstance(token, str) else -1
+        if i < 0:
+            raise KeyError(token)
+        return self._contagens[i]
+
+    def get(self, token: str, default: Any = None) -> Any:
+        i = self._posicao(token) if isinstance(token, str) else -1
+        return self._contagens[i] if i >= 0 else default
+
+    def __contains__(self, token: object) -> bool:
+        return isinstance(token, str) and self._posicao(token) >= 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._chave(i).decode("utf-8") for i in range(self._n))
+
+
+class Publicacao:
+    """Bloco compartilhado com as tabelas de uma execução (dono: processo principal).
+
+    Use como gerenciador de contexto: ao sair o bloco é fechado e removido.
+    """
+
+    def __init__(self, freq_maps: Mapping[int, Any]):
+        partes: list[bytes] = []
+        tamanho = 0
+
+        def gravar(tab: Mapping[str, int]) -> tuple[int, int, int, int]:
+            nonlocal tamanho
+            chaves = sorted(k.encode("utf-8") for k in tab)
+            offsets = array("Q", [0])
+            for k in chaves:
+                offsets.append(offsets[-1] + len(k))
+            contagens = array("Q", (tab[k.decode("utf-8")] for k in chaves))
+            posicoes = []
+            for bloco in (offsets.tobytes(), contagens.tobytes(), b"".join(chaves)):
+                posicoes.append(tamanho)
+                partes.append(bloco)
+                tamanho += len(bloco)
+            return (len(chaves), *posicoes)
+
+        estrutura: dict[int, Any] = {}
+        for j, mapa in freq_maps.items():
+            if mapa is None:
+                estrutura[j] = None
+            elif isinstance(mapa, (list, tuple)):
+                estrutura[j] = [gravar(m) for m in mapa]
+            else:
+                estrutura[j] = gravar(mapa)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, tamanho))
+        pos = 0
+        for bloco in partes:
+            self.shm.buf[pos : pos + len(bloco)] = bloco
+            pos += len(bloco)
+        self.descritor = Descritor(self.shm.name, estrutura)
+
+    def fechar(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> Publicacao:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+def publicar(freq_maps: Mapping[int, Any]) -> Publicacao:
+    """Grava ``freq_maps`` (no formato de :func:`freqBuilder.count_pares`) num bloco compartilhado."""
+    return Publicacao(freq_maps)
+
+
+def anexar(descritor: Descritor) -> dict[int, Any]:
+    """Reconstrói ``freq_maps`` como visões sobre o bloco publicado."""
+    shm = shared_memory.SharedMemory(name=descritor.nome)
+    freq_maps: dict[int, Any] = {}
+    for j, pos in descritor.estrutura.items():
+        if pos is None:
+            freq_maps[j] = None
+        elif isinstance(pos, list):
+            freq_maps[j] = [FrequenciasCompartilhadas(shm, *p) for p in pos]
+        else:
+            freq_maps[j] = FrequenciasCompartilhadas(shm, *pos)
+    return freq_maps
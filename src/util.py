@@ -1,6 +1,7 @@
 from __future__ import annotations
-import re, unicodedata
-from typing import List
+import os, re, unicodedata
+from functools import lru_cache, wraps
+from typing import Callable, List
 from unidecode import unidecode
 from jellyfish import soundex as _j_soundex
 
@@ -28,7 +29,50 @@ except ImportError:  # pragma: no cover - fallback para ambientes sem extensão
         return prev_row[-1]
 
 
-__all__ = ["padroniza", "soundex", "levenshtein", "minusculo_sem_acento"]
+__all__ = [
+    "padroniza",
+    "soundex",
+    "levenshtein",
+    "minusculo_sem_acento",
+    "memoizar",
+    "configurar_cache",
+    "cache_info",
+]
+
+
+# ---------- memoização limitada (LRU) por processo ----------
+# Nomes e tokens se repetem muito nas bases; as funções decoradas com
+# ``memoizar`` passam a custar uma consulta ao dicionário para valores já
+# vistos. O tamanho vem de ``COMPARADOR_CACHE_TAMANHO`` (processos filhos
+# iniciados por ``spawn`` herdam a variável) ou de ``configurar_cache``.
+CACHE_TAMANHO_PADRAO = int(os.environ.get("COMPARADOR_CACHE_TAMANHO", "100000"))
+CACHE_TAMANHO: int | None = CACHE_TAMANHO_PADRAO
+_MEMOS: dict[str, tuple[Callable, list]] = {}
+
+
+def memoizar(func: Callable[[str], object]) -> Callable[[str], object]:
+    """Memoiza ``func`` (de um único argumento hashável) com LRU limitado."""
+    ref = [lru_cache(maxsize=CACHE_TAMANHO)(func)]
+    _MEMOS[f"{func.__module__}.{func.__qualname__}"] = (func, ref)
+
+    @wraps(func)
+    def wrapper(arg):
+        return ref[0](arg)
+
+    return wrapper
+
+
+def configurar_cache(tamanho: int | None) -> None:
+    """Redefine o tamanho (``None`` = ilimitado, ``0`` = desligado) e zera os caches."""
+    global CACHE_TAMANHO
+    CACHE_TAMANHO = tamanho
+    for func, ref in _MEMOS.values():
+        ref[0] = lru_cache(maxsize=tamanho)(func)
+
+
+def cache_info() -> dict[str, object]:
+    """Contadores ``hits``/``misses``/``currsize`` de cada função memoizada."""
+    return {nome: ref[0].cache_info() for nome, (_, ref) in _MEMOS.items()}
 
 
 _STOP_WORDS = {"de", "do", "da", "dos", "das"}
@@ -48,6 +92,7 @@ def _remove_caracteres_especiais(s: str) -> str:
     return re.sub(r"[^a-z0-9\s]", "", s)
 
 
+@memoizar
 def padroniza(nome: str) -> str:
     if not nome.strip():
         return ""
@@ -64,6 +109,7 @@ def padroniza(nome: str) -> str:
     return s.strip()
 
 
+@memoizar
 def soundex(palavra: str) -> str:
     """Delegamos ao jellyfish. Sempre retorna 4 caracteres."""
     if not palavra:
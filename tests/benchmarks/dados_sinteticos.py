@@ -0,0 +1,182 @@
+"""Gerador de dados sintéticos para os benchmarks.
+
+Produz pares de registros com nomes, nomes de mãe, datas de nascimento,
+logradouros, códigos de localidade (UF + 4 dígitos do código IBGE) e números
+no formato brasileiro. O segundo registro de cada par é uma cópia do
+primeiro com erros de digitação controlados por ``taxa_erro``, ou um
+registro independente (não par). Tudo é derivado de ``semente``, então duas
+execuções com os mesmos parâmetros geram exatamente os mesmos arquivos.
+"""
+from __future__ import annotations
+
+import csv
+import random
+from pathlib import Path
+
+PRENOMES = [
+    "Maria", "Jose", "Ana", "Joao", "Antonio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas",
+    "Luiz", "Marcos", "Luis", "Gabriel", "Rafael", "Francisca", "Daniel", "Marcelo", "Bruno", "Eduardo",
+    "Felipe", "Raimundo", "Rodrigo", "Antonia", "Adriana", "Juliana", "Marcia", "Fernanda", "Patricia",
+    "Aline", "Sebastiao", "Raimunda", "Josefa", "Luzia", "Vitoria", "Heloisa", "Kaua", "Thiago",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira",
+    "Barbosa", "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado",
+    "Mendes", "Freitas", "Cardoso", "Ramos", "Goncalves", "Santana", "Teixeira",
+]
+PARTICULAS = ["de", "da", "dos", "das"]
+SUFIXOS = ["Filho", "Junior", "Neto", "Sobrinho"]
+TIPOS_VIA = ["Rua", "R.", "Avenida", "Av.", "Travessa", "Tv.", "Alameda", "Estrada", "Praca"]
+COMPLEMENTOS = ["", "", "", "apto 101", "apto 12", "bloco A", "casa 2", "fundos", "lote 7 quadra 3"]
+# Códigos IBGE (7 dígitos) de municípios populosos e a UF de cada um.
+MUNICIPIOS = [
+    ("SP", "3550308"), ("RJ", "3304557"), ("MG", "3106200"), ("BA", "2927408"), ("DF", "5300108"),
+    ("CE", "2304400"), ("AM", "1302603"), ("PR", "4106902"), ("PE", "2611606"), ("RS", "4314902"),
+    ("PA", "1501402"), ("GO", "5208707"), ("SP", "3518800"), ("SP", "3509502"), ("MA", "2111300"),
+    ("RJ", "3304904"), ("AL", "2704302"), ("RJ", "3301702"), ("RN", "2408102"), ("PI", "2211001"),
+]
+
+COLUNAS = [
+    "nome_a", "nome_b", "mae_a", "mae_b", "nasc_a", "nasc_b", "local_a", "local_b",
+    "endereco_a", "endereco_b", "valor_a", "valor_b", "obs_a", "obs_b",
+]
+# (idx1, idx2, tipo, nome) de cada par de COLUNAS, no formato de processar_generico.
+PARES = [
+    (0, 1, "N", "paciente"),
+    (2, 3, "N", "mae"),
+    (4, 5, "D", "nascimento"),
+    (6, 7, "C", "local"),
+    (8, 9, "L", "endereco"),
+    (10, 11, "M", "valor"),
+    (12, 13, "T", "obs"),
+]
+
+
+class GeradorRegistros:
+    """Gera pares de registros reprodutíveis a partir de ``semente``."""
+
+    def __init__(self, taxa_erro: float = 0.2, taxa_nao_par: float = 0.3, semente: int = 42):
+        self.taxa_erro = taxa_erro
+        self.taxa_nao_par = taxa_nao_par
+        self.rng = random.Random(semente)
+
+    def erro(self, valor: str) -> str:
+        """Aplica no máximo um erro de digitação (troca, omissão, inserção ou transposição)."""
+        rng = self.rng
+        if not valor or rng.random() >= self.taxa_erro:
+            return valor
+        i = rng.randrange(len(valor))
+        letra = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        op = rng.random()
+        if op < 0.3:
+            return valor[:i] + letra + valor[i + 1 :]
+        if op < 0.55:
+            return valor[:i] + valor[i + 1 :]
+        if op < 0.8:
+            return valor[:i] + letra + valor[i:]
+        if i + 1 < len(valor):
+            return valor[:i] + valor[i + 1] + valor[i] + valor[i + 2 :]
+        return valor
+
+    def nome(self) -> str:
+        rng = self.rng
+        partes = [rng.choice(PRENOMES)]
+        if rng.random() < 0.3:
+            partes.append(rng.choice(PRENOMES))
+        for _ in range(rng.randint(1, 3)):
+            if rng.random() < 0.25:
+                partes.append(rng.choice(PARTICULAS))
+            partes.append(rng.choice(SOBRENOMES))
+        if rng.random() < 0.05:
+            partes.append(rng.choice(SUFIXOS))
+        return " ".join(partes)
+
+    def data(self) -> str:
+        rng = self.rng
+        return f"{rng.randint(1930, 2023)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+
+    def erro_data(self, data: str) -> str:
+        rng = self.rng
+        if rng.random() >= self.taxa_erro:
+            return data
+        r = rng.random()
+        if r < 0.3:
+            return data[:6] + data[7] + data[6]  # dia invertido
+        if r < 0.5:
+            return data[:4] + data[5] + data[4] + data[6:]  # mês invertido
+        if r < 0.8:
+            i = rng.randrange(8)
+            return data[:i] + str(rng.randint(0, 9)) + data[i + 1 :]
+        return rng.choice(["", data[:6], data[6:] + data[4:6] + data[:4]])
+
+    def localidade(self) -> str:
+        uf, codigo = self.rng.choice(MUNICIPIOS)
+        return uf + codigo[2:6]
+
+    def logradouro(self) -> str:
+        rng = self.rng
+        numero = rng.choice([str(rng.randint(1, 3000)), str(rng.randint(1, 300)), "s/n"])
+        via = f"{rng.choice(TIPOS_VIA)} {rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)}"
+        return " ".join(p for p in (via, numero, rng.choice(COMPLEMENTOS)) if p)
+
+    def numero(self) -> str:
+        rng = self.rng
+        valor = rng.uniform(0, 20000)
+        formato = rng.random()
+        if formato < 0.4:
+            inteiro, decimais = f"{valor:,.2f}".split(".")
+            return inteiro.replace(",", ".") + "," + decimais  # 12.345,67
+        if formato < 0.7:
+            return f"{valor:.2f}"
+        return str(int(valor))
+
+    def erro_numero(self, valor: str) -> str:
+        rng = self.rng
+        if rng.random() >= self.taxa_erro:
+            return valor
+        if rng.random() < 0.5:
+            return self.erro(valor) if rng.random() < 0.5 else valor.replace(",", ".")
+        return self.numero()
+
+    def par(self) -> list[str]:
+        """Uma linha com os 7 pares de COLUNAS."""
+        rng = self.rng
+        a = [self.nome(), self.nome(), self.data(), self.localidade(), self.logradouro(), self.numero()]
+        a.append(rng.choice(PRENOMES) + " " + rng.choice(SOBRENOMES))
+        if rng.random() < self.taxa_nao_par:
+            b = [self.nome(), self.nome(), self.data(), self.localidade(), self.logradouro(), self.numero()]
+            b.append(rng.choice(PRENOMES))
+        else:
+            b = [
+                self.erro(a[0]),
+                self.erro(a[1]),
+                self.erro_data(a[2]),
+                self.erro(a[3]),
+                self.erro(a[4]),
+                self.erro_numero(a[5]),
+                self.erro(a[6]),
+            ]
+        return [v for par in zip(a, b) for v in par]
+
+    def linhas(self, n: int) -> list[list[str]]:
+        return [self.par() for _ in range(n)]
+
+
+def gravar_generico(destino: Path, linhas: list[list[str]], *, sep: str = "|") -> Path:
+    """Grava as linhas com o cabeçalho de :data:`COLUNAS` (entrada de ``processar_generico``)."""
+    with open(destino, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=sep)
+        w.writerow(COLUNAS)
+        w.writerows(linhas)
+    return destino
+
+
+def gravar_legado(destino: Path, linhas: list[list[str]], *, sep: str = ";") -> Path:
+    """Grava ``Nome1;Mae1;Nasc1;Nome2;Mae2;Nasc2`` (entrada de ``processar``)."""
+    with open(destino, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=sep)
+        w.writerow(["Nome1", "Mae1", "Nasc1", "Nome2", "Mae2", "Nasc2"])
+        for linha in linhas:
+            w.writerow([linha[0], linha[2], linha[4], linha[1], linha[3], linha[5]])
+    return destino
@@ -0,0 +1,242 @@
+"""Benchmarks de desempenho dos comparadores e dos pipelines.
+
+Mede linhas por segundo de cada ``comparar_*`` (escalares, por ids e
+vetorizados), de ``processar`` e de ``processar_generico`` com 1 e N
+processos, sobre dados de :mod:`dados_sinteticos`, e os bytes alocados por
+linha (resultados mantidos, via ``tracemalloc``) dos comparadores
+escalares. O resultado vai para um
+JSON com o commit, a plataforma e os parâmetros usados; ``--comparar``
+mostra a variação em relação a um JSON anterior.
+
+Uso::
+
+    python tests/benchmarks/executar.py --linhas 20000 --workers 4 --saida bench.json
+    python tests/benchmarks/executar.py --comparar bench_anterior.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+AQUI = Path(__file__).resolve().parent
+RAIZ = AQUI.parent.parent
+for caminho in (RAIZ / "src", AQUI):
+    if str(caminho) not in sys.path:
+        sys.path.insert(0, str(caminho))
+
+import comparaRegistros as cr  # noqa: E402
+import comparators as cmp  # noqa: E402
+import util  # noqa: E402
+from comparators.vocabulario import reiniciar_vocabulario_padrao  # noqa: E402
+from dados_sinteticos import PARES, GeradorRegistros, gravar_generico, gravar_legado  # noqa: E402
+
+
+def _esfriar_caches() -> None:
+    """Zera os caches do processo: os LRUs de ``util`` e o vocabulário padrão."""
+    util.configurar_cache(util.CACHE_TAMANHO)
+    reiniciar_vocabulario_padrao()
+
+
+def _medir(func: Callable[[], object], repeticoes: int) -> float:
+    """Menor tempo (s) entre ``repeticoes`` execuções de ``func``."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _bytes_por_linha(func: Callable[[], object], linhas: int) -> float:
+    """Bytes ainda alocados, por linha, depois de ``func`` (que devolve os resultados)."""
+    tracemalloc.start()
+    try:
+        inicio = tracemalloc.get_traced_memory()[0]
+        resultados = func()
+        fim = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del resultados
+    return (fim - inicio) / linhas
+
+
+def _colunas(linhas: list[list[str]], idx1: int, idx2: int, *, padronizar: bool) -> tuple[list[str], list[str]]:
+    a = [linha[idx1] for linha in linhas]
+    b = [linha[idx2] for linha in linhas]
+    if padronizar:
+        a = [util.padroniza(v) for v in a]
+        b = [util.padroniza(v) for v in b]
+    return a, b
+
+
+def comparadores(linhas: list[list[str]]) -> dict[str, Callable[[], object]]:
+    """Casos de benchmark dos comparadores, com as entradas já preparadas."""
+    nomes = _colunas(linhas, 0, 1, padronizar=True)
+    datas = _colunas(linhas, 4, 5, padronizar=True)
+    locais = _colunas(linhas, 6, 7, padronizar=True)
+    enderecos = _colunas(linhas, 8, 9, padronizar=True)
+    valores = _colunas(linhas, 10, 11, padronizar=False)
+    textos = _colunas(linhas, 12, 13, padronizar=True)
+
+    vocab = cmp.Vocabulario()
+    ids_nomes = [[vocab.codificar(v) for v in col] for col in nomes]
+    ids_textos = [[vocab.codificar(v) for v in col] for col in textos]
+    tabela = vocab.tabela({})
+    tabelas_nome = [vocab.tabela({}) for _ in range(3)]
+
+    def escalar(func, cols, *args):
+        return lambda: [func(x, y, *args) for x, y in zip(*cols)]
+
+    return {
+        "comparar_nome": escalar(cmp.comparar_nome, nomes),
+        "comparar_nome_ids": escalar(cmp.comparar_nome_ids, ids_nomes, vocab, tabelas_nome),
+        "comparar_texto": escalar(cmp.comparar_texto, textos),
+        "comparar_texto_ids": escalar(cmp.comparar_texto_ids, ids_textos, vocab, tabela),
+        "comparar_data": escalar(cmp.comparar_data, datas),
+        "comparar_data_batch": lambda: cmp.comparar_data_batch(*datas),
+        "comparar_localidade": escalar(cmp.comparar_localidade, locais),
+        "comparar_localidade_batch": lambda: cmp.comparar_localidade_batch(*locais),
+        "comparar_logradouro": escalar(cmp.comparar_logradouro, enderecos),
+        "comparar_numero": escalar(cmp.comparar_numero, valores),
+        "comparar_numero_batch": lambda: cmp.comparar_numero_batch(*valores),
+    }
+
+
+def pipelines(linhas: list[list[str]], tmp: Path, workers: int) -> dict[str, Callable[[], object]]:
+    """Casos de benchmark de ``processar`` e ``processar_generico``."""
+    generico = gravar_generico(tmp / "generico.csv", linhas)
+    legado = gravar_legado(tmp / "legado.csv", linhas)
+    execucao = iter(range(1_000_000))
+
+    # cada repetição parte de caches frios e grava numa saída nova: a
+    # construção das frequências faz parte do custo e nenhum caso herda o
+    # estado dos anteriores
+    def rodar_legado():
+        _esfriar_caches()
+        k = next(execucao)
+        cr.processar(str(legado), str(tmp / f"saida_legado_{k}"), (0, 1, 2, 3, 4, 5), str(tmp / f"cache_{k}"))
+
+    def rodar_generico(n: int):
+        def rodar():
+            _esfriar_caches()
+            return cr.processar_generico(str(generico), str(tmp / f"saida_{n}_{next(execucao)}"), PARES, workers=n)
+
+        return rodar
+
+    casos = {"processar": rodar_legado, "processar_generico_1": rodar_generico(1)}
+    if workers > 1:
+        casos[f"processar_generico_{workers}"] = rodar_generico(workers)
+    return casos
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(
+    linhas: int = 20_000,
+    *,
+    workers: int | None = None,
+    taxa_erro: float = 0.2,
+    semente: int = 42,
+    repeticoes: int = 3,
+    filtro: str | None = None,
+) -> dict:
+    """Roda todos os casos e devolve o dicionário gravado no JSON."""
+    workers = workers or os.cpu_count() or 1
+    dados = GeradorRegistros(taxa_erro=taxa_erro, semente=semente).linhas(linhas)
+    resultados: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        casos = {**comparadores(dados), **pipelines(dados, Path(tmp), workers)}
+        for nome, func in casos.items():
+            if filtro and filtro not in nome:
+                continue
+            _esfriar_caches()  # cada caso começa com os caches frios
+            segundos = _medir(func, repeticoes)
+            resultados[nome] = {
+                "linhas": linhas,
+                "segundos": round(segundos, 6),
+                "linhas_por_segundo": round(linhas / segundos, 1) if segundos else None,
+            }
+            if nome.startswith("comparar_") and not nome.endswith("_batch"):
+                _esfriar_caches()
+                resultados[nome]["bytes_por_linha"] = round(_bytes_por_linha(func, linhas), 1)
+    return {
+        "commit": _commit(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parametros": {
+            "linhas": linhas,
+            "workers": workers,
+            "taxa_erro": taxa_erro,
+            "semente": semente,
+            "repeticoes": repeticoes,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: dict, anterior: dict) -> list[str]:
+    """Linhas de texto com a variação de linhas/s de cada caso presente nos dois JSONs."""
+    saida = [f"{'caso':<30} {'antes':>12} {'agora':>12} {'variação':>9}"]
+    for nome, res in atual["resultados"].items():
+        antes = anterior.get("resultados", {}).get(nome)
+        if not antes or not antes.get("linhas_por_segundo") or not res.get("linhas_por_segundo"):
+            continue
+        a, b = antes["linhas_por_segundo"], res["linhas_por_segundo"]
+        saida.append(f"{nome:<30} {a:>12.1f} {b:>12.1f} {100 * (b - a) / a:>+8.1f}%")
+    return saida
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=None, help="processos do caso paralelo (padrão: CPUs)")
+    parser.add_argument("--taxa-erro", type=float, default=0.2)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--filtro", help="roda apenas os casos cujo nome contém este texto")
+    parser.add_argument("--saida", type=Path, help="JSON de resultados (padrão: bench_<commit>.json)")
+    parser.add_argument("--comparar", type=Path, help="JSON anterior para comparação")
+    args = parser.parse_args(argv)
+
+    resultado = executar(
+        args.linhas,
+        workers=args.workers,
+        taxa_erro=args.taxa_erro,
+        semente=args.semente,
+        repeticoes=args.repeticoes,
+        filtro=args.filtro,
+    )
+    saida = args.saida or Path(f"bench_{resultado['commit'] or 'local'}.json")
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for nome, res in resultado["resultados"].items():
+        alocado = f" {res['bytes_por_linha']:>10.1f} B/linha" if "bytes_por_linha" in res else ""
+        print(f"{nome:<30} {res['linhas_por_segundo']:>12.1f} linhas/s{alocado}")
+    if args.comparar:
+        print()
+        print("\n".join(comparar(resultado, json.loads(args.comparar.read_text(encoding="utf-8")))))
+    print(f"\nresultados gravados em {saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
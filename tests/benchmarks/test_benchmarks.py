@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+import dados_sinteticos as ds
+import executar
+from comparators.vocabulario import vocabulario_padrao
+
+
+def test_gerador_reprodutivel():
+    a = ds.GeradorRegistros(semente=7).linhas(50)
+    b = ds.GeradorRegistros(semente=7).linhas(50)
+
+    assert a == b
+    assert all(len(linha) == len(ds.COLUNAS) for linha in a)
+    assert all(len(linha[6]) == 6 for linha in a)
+
+
+def test_executar_grava_json_comparavel(tmp_path):
+    saida = tmp_path / "bench.json"
+
+    assert executar.main(["--linhas", "30", "--workers", "1", "--repeticoes", "1", "--saida", str(saida)]) == 0
+
+    resultado = json.loads(saida.read_text(encoding="utf-8"))
+    assert {"comparar_nome", "comparar_numero_batch", "processar", "processar_generico_1"} <= set(resultado["resultados"])
+    assert all(r["linhas"] == 30 for r in resultado["resultados"].values())
+    assert resultado["resultados"]["comparar_nome"]["bytes_por_linha"] > 0
+    assert "bytes_por_linha" not in resultado["resultados"]["comparar_numero_batch"]
+    assert len(executar.comparar(resultado, resultado)) == len(resultado["resultados"]) + 1
+
+
+def test_pipelines_partem_de_caches_frios_e_saidas_novas(tmp_path):
+    casos = executar.pipelines(ds.GeradorRegistros(semente=7).linhas(20), tmp_path, 1)
+    vocab = vocabulario_padrao()
+    vocab.id("aquecido")
+
+    casos["processar_generico_1"]()
+    assert vocabulario_padrao() is not vocab
+    casos["processar_generico_1"]()
+
+    assert len(list(tmp_path.glob("saida_1_*.csv"))) == 2
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import blocagem as bl
+import comparaRegistros as cr
+
+
+def _bases(tmp_path):
+    a = pd.DataFrame(
+        {
+            "nome": ["Ana Silva", "Carlos Souza", "Maria Lima", "", "Ana Souza"],
+            "nasc": ["19900101", "19850505", "19700303", "19900101", "19900102"],
+            "local": ["SP1234", "RJ0001", "MG5555", "SP1234", "SP1234"],
+        }
+    )
+    b = pd.DataFrame(
+        {
+            "id": ["b0", "b1", "b2", "b3"],
+            "nome": ["Anna Silva", "Carlos Sousa", "Joao Lima", "Ana Maria"],
+            "nasc": ["19900101", "19850505", "19700303", "19901231"],
+            "local": ["SP1234", "RJ0002", "MG5555", "SP1234"],
+        }
+    )
+    arq_a, arq_b = tmp_path / "a.csv", tmp_path / "b.csv"
+    a.to_csv(arq_a, sep="|", index=False)
+    b.to_csv(arq_b, sep=";", index=False)
+    return a, b, arq_a, arq_b
+
+
+def test_chave_bloco_valores():
+    df = pd.DataFrame({"nome": ["Ana Silva", "", "anna"], "nasc": ["19900101", "19850505", "1990"]})
+    chave = bl.ChaveBloco(((0, 0, "soundex"), (1, 1, "ano")))
+
+    valores = chave.valores(df, 0).tolist()
+
+    assert valores[0] == valores[2] and valores[0].endswith("1990")
+    assert valores[1] is None
+
+
+def test_chave_bloco_transformacao_invalida():
+    with pytest.raises(ValueError):
+        bl.ChaveBloco(((0, 0, "metafone"),))
+
+
+def test_indice_bloco_hash_join():
+    indice = bl.IndiceBloco(pd.Series(["x", None, "y", "x"]))
+
+    ia, ib = indice.candidatos(pd.Series(["y", "x", None, "z"]))
+
+    assert list(zip(ia, ib)) == [(0, 2), (1, 0), (1, 3)]
+    assert indice.contar(pd.Series(["x", "x"])) == 4
+
+
+def test_vincular_pontua_apenas_pares_do_mesmo_bloco(tmp_path):
+    a, b, arq_a, arq_b = _bases(tmp_path)
+    pares = [(0, 1, "N", "nome"), (1, 2, "D", "nasc"), (2, 3, "C", "local")]
+    chave = bl.ChaveBloco(((0, 1, "soundex"), (1, 2, "ano")))
+
+    estatisticas = bl.vincular(
+        str(arq_a), str(arq_b), str(tmp_path / "saida"), pares, chave, sep_b=";", sort_by=None, workers=1, chunksize=2
+    )
+
+    out = pd.read_csv(tmp_path / "saida.csv", sep="|", dtype=str, keep_default_na=False)
+    assert list(out.columns[:7]) == ["R_nome", "R_nasc", "R_local", "C_id", "C_nome", "C_nasc", "C_local"]
+    assert list(zip(out["R_nome"], out["C_id"])) == [
+        ("Ana Silva", "b0"),
+        ("Ana Silva", "b3"),
+        ("Carlos Souza", "b1"),
+        ("Ana Souza", "b0"),
+        ("Ana Souza", "b3"),
+    ]
+    assert estatisticas.linhas == 5
+
+
+def test_vincular_equivale_a_processar_generico_nos_pares(tmp_path):
+    a, b, arq_a, arq_b = _bases(tmp_path)
+    pares = [(1, 2, "D", "nasc"), (2, 3, "C", "local")]
+    chave = bl.ChaveBloco(((2, 3, "exato"),))
+
+    bl.vincular(str(arq_a), str(arq_b), str(tmp_path / "vinc"), pares, chave, sep_b=";", workers=1)
+
+    materializado = a.merge(b, on="local", suffixes=("", "_b"))
+    montado = pd.concat(
+        [materializado[["nome", "nasc", "local"]], materializado[["id", "nome_b", "nasc_b", "local"]]], axis=1
+    )
+    montado.columns = ["R_nome", "R_nasc", "R_local", "C_id", "C_nome", "C_nasc", "C_local"]
+    montado.to_csv(tmp_path / "pares.csv", sep="|", index=False)
+    cr.processar_generico(
+        str(tmp_path / "pares.csv"), str(tmp_path / "ref"), [(1, 5, "D", "nasc"), (2, 6, "C", "local")], workers=1
+    )
+
+    vinc = pd.read_csv(tmp_path / "vinc.csv", sep="|", dtype=str, keep_default_na=False)
+    ref = pd.read_csv(tmp_path / "ref.csv", sep="|", dtype=str, keep_default_na=False)
+    assert sorted(map(tuple, vinc.values)) == sorted(map(tuple, ref.values))
+
+
+def test_indice_vizinhanca_janela():
+    indice = bl.IndiceVizinhanca(pd.Series(["d", "a", None, "c", "b", "e"]), janela=2)
+
+    ia, ib = indice.candidatos(pd.Series(["c", None, "a", "z"]))
+
+    # B ordenada: a(1) b(4) c(3) d(0) e(5)
+    assert list(zip(ia, ib)) == [(0, 4), (0, 3), (2, 1), (2, 4), (3, 0), (3, 5)]
+
+
+def test_vizinhanca_tolera_erro_no_fim_da_chave():
+    df_a = pd.DataFrame({"nome": ["Carlos Souza"]})
+    df_b = pd.DataFrame({"nome": ["Ana Lima", "Carlos Sousa", "Maria Silva"]})
+    exata = bl.ChaveBloco(((0, 0, "padroniza"),))
+    gerador = bl.GeradorCandidatos([bl.VizinhancaOrdenada(exata, janela=2)], df_b)
+
+    ia, ib, _ = gerador.candidatos(df_a)
+
+    assert bl.GeradorCandidatos([exata], df_b).candidatos(df_a)[2] == [0]
+    assert list(zip(ia, ib)) == [(0, 1), (0, 2)]
+
+
+def test_gerador_multiplas_passadas_deduplica():
+    df_a = pd.DataFrame({"nome": ["Ana Silva", "Rui Costa"], "nasc": ["19900101", "19800101"]})
+    df_b = pd.DataFrame({"nome": ["Anna Silva", "Ana Souza", "Rui Kosta"], "nasc": ["19900101", "19910101", "19700101"]})
+    passadas = [bl.ChaveBloco(((0, 0, "soundex"),)), bl.ChaveBloco(((1, 1, "ano"),))]
+
+    ia, ib, contagens = bl.GeradorCandidatos(passadas, df_b).candidatos(df_a)
+
+    assert contagens == [3, 1]
+    assert list(zip(ia, ib)) == [(0, 0), (0, 1), (1, 2)]
+
+
+def test_vincular_multiplas_passadas_estatisticas(tmp_path):
+    a, b, arq_a, arq_b = _bases(tmp_path)
+    passadas = [
+        bl.ChaveBloco(((0, 1, "soundex"), (1, 2, "ano"))),
+        bl.VizinhancaOrdenada(bl.ChaveBloco(((2, 3, "exato"),)), janela=2),
+    ]
+
+    estatisticas = bl.vincular(
+        str(arq_a), str(arq_b), str(tmp_path / "saida"), [(0, 1, "N", "nome")], passadas, sep_b=";", workers=1
+    )
+
+    out = pd.read_csv(tmp_path / "saida.csv", sep="|", dtype=str, keep_default_na=False)
+    pares = list(zip(out["R_nome"], out["C_id"]))
+    blocagem = estatisticas.blocagem
+    assert len(pares) == len(set(pares)) == blocagem.candidatos == estatisticas.linhas
+    assert blocagem.candidatos < sum(blocagem.pares_por_passada)
+    assert (blocagem.linhas_a, blocagem.linhas_b) == (5, 4)
+    assert blocagem.razao_reducao == pytest.approx(1 - blocagem.candidatos / 20)
+    assert blocagem.pares_por_segundo > 0
+
+
+def test_vincular_mede_a_geracao_nas_duas_leituras(tmp_path, monkeypatch):
+    a, b, arq_a, arq_b = _bases(tmp_path)
+    chamadas = []
+    candidatos = bl.GeradorCandidatos.candidatos
+
+    def espiao(self, bloco_a):
+        chamadas.append(self)
+        return candidatos(self, bloco_a)
+
+    monkeypatch.setattr(bl.GeradorCandidatos, "candidatos", espiao)
+    chave = bl.ChaveBloco(((2, 3, "exato"),))
+    estatisticas = bl.vincular(
+        str(arq_a), str(arq_b), str(tmp_path / "saida"), [(0, 1, "N", "nome")], chave, sep_b=";", workers=1, chunksize=2
+    )
+
+    assert len(chamadas) == 6  # 3 blocos de A, contados e depois pontuados
+    assert estatisticas.blocagem.segundos == chamadas[0].segundos > 0
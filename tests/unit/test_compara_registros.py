@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 
+import json
+import threading
 from decimal import Decimal
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest  # type: ignore
 
 import comparaRegistros as cr
+import controleExecucao as ce
+import freqBuilder as fb
+import util
 
 
 def test_build_freq_map_counts_tokens():
@@ -121,3 +128,402 @@ def test_processar_generico_invalid_sort_column(tmp_path):
             sep="|",
             sort_by="inexistente",
         )
+
+
+def _entrada_varias_linhas(tmp_path, n=25):
+    nomes = ["Ana Silva", "Carlos Souza", "Maria de Souza", "Joao Alves", "Ana Maria"]
+    df = pd.DataFrame(
+        {
+            "nome_a": [nomes[i % 5] for i in range(n)],
+            "nome_b": [nomes[(i * 3) % 5] for i in range(n)],
+            "data_a": [f"1990010{i % 9 + 1}" for i in range(n)],
+            "data_b": [f"1990010{(i * 2) % 9 + 1}" for i in range(n)],
+        }
+    )
+    entrada = tmp_path / "entrada.csv"
+    df.to_csv(entrada, sep="|", index=False)
+    return entrada
+
+
+def test_processar_generico_streaming_matches_in_memory(tmp_path):
+    entrada = _entrada_varias_linhas(tmp_path)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+
+    cr.processar_generico(str(entrada), str(tmp_path / "mem"), pares, sort_by=None, workers=1)
+    cr.processar_generico(str(entrada), str(tmp_path / "str"), pares, sort_by=None, workers=1, chunksize=4)
+
+    assert (tmp_path / "mem.csv").read_text() == (tmp_path / "str.csv").read_text()
+
+
+def test_processar_generico_streaming_external_sort(tmp_path, monkeypatch):
+    entrada = _entrada_varias_linhas(tmp_path)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    monkeypatch.setattr(cr.oe, "FAN_IN", 2)
+
+    cr.processar_generico(str(entrada), str(tmp_path / "mem"), pares, sort_by=None, workers=1)
+    cr.processar_generico(str(entrada), str(tmp_path / "str"), pares, workers=1, chunksize=3)
+
+    mem = pd.read_csv(tmp_path / "mem.csv", sep="|", dtype=str)
+    ordenado = pd.read_csv(tmp_path / "str.csv", sep="|", dtype=str)
+    assert list(ordenado.columns) == list(mem.columns)
+    assert list(ordenado["nota final"]) == sorted(mem["nota final"], reverse=True)
+    assert sorted(map(tuple, ordenado.values)) == sorted(map(tuple, mem.values))
+    assert not list(tmp_path.glob(".runs_*"))
+
+
+def test_processar_generico_cache_dir_skips_frequency_pass(tmp_path, monkeypatch):
+    entrada = _entrada_varias_linhas(tmp_path, n=6)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    cache = tmp_path / "cache"
+
+    cr.processar_generico(str(entrada), str(tmp_path / "a"), pares, workers=1, cache_dir=str(cache))
+
+    def falha(*_args, **_kwargs):
+        raise AssertionError("frequências deveriam vir do cache")
+
+    monkeypatch.setattr(cr.fb, "count_pares", falha)
+    cr.processar_generico(str(entrada), str(tmp_path / "b"), pares, workers=1, cache_dir=str(cache), chunksize=2)
+    cr.processar_generico(
+        str(entrada), str(tmp_path / "c"), pares, workers=1, cache_dir=str(cache), ascending=True
+    )
+
+    a = pd.read_csv(tmp_path / "a.csv", sep="|", dtype=str)
+    c = pd.read_csv(tmp_path / "c.csv", sep="|", dtype=str)
+    assert sorted(map(tuple, a.values)) == sorted(map(tuple, c.values))
+
+
+def test_processar_generico_scores_each_distinct_pair_once(tmp_path):
+    entrada = _entrada_varias_linhas(tmp_path)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+
+    estatisticas = cr.processar_generico(
+        str(entrada), str(tmp_path / "saida"), pares, sort_by=None, workers=1, chunksize=10
+    )
+
+    assert estatisticas.linhas == 25
+    paciente, nascimento = estatisticas.pares
+    assert (paciente.nome, paciente.linhas, paciente.pontuadas) == ("Paciente", 25, 5)
+    assert (nascimento.linhas, nascimento.pontuadas) == (25, 9)
+    assert paciente.razao_dedup == 5.0
+
+
+def test_processar_generico_with_unlimited_cache(tmp_path):
+    entrada = _entrada_varias_linhas(tmp_path)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    cr.processar_generico(str(entrada), str(tmp_path / "padrao"), pares, workers=1, chunksize=10)
+
+    util.configurar_cache(None)
+    try:
+        cr.processar_generico(str(entrada), str(tmp_path / "ilimitado"), pares, workers=1, chunksize=10)
+    finally:
+        util.configurar_cache(util.CACHE_TAMANHO_PADRAO)
+
+    assert (tmp_path / "ilimitado.csv").read_text() == (tmp_path / "padrao.csv").read_text()
+
+
+def test_arredondar_notas_matches_dfmt_on_ties():
+    notas = np.array([0.005, 0.015, 1.005, 2.675, -0.0, -0.001, 15.125, 9.994999])
+
+    arredondadas = cr._arredondar_notas(notas)
+
+    assert [f"{x:.2f}" for x in arredondadas] == [cr.DFMT(x) for x in notas.tolist()]
+
+
+def test_score_block_normalizes_each_distinct_value_once(monkeypatch):
+    chamadas = []
+    original = cr.util.padroniza
+
+    def contar(valor):
+        chamadas.append(valor)
+        return original(valor)
+
+    monkeypatch.setattr(cr.util, "padroniza", contar)
+    pares = [(0, 1, "N", "Paciente"), (0, 1, "T", "Texto"), (1, 0, "T", "Invertido")]
+    ctx = cr._Contexto(pares, {})
+    cols = {0: ["Ana Silva", "Ana Silva", "Joao"], 1: ["Ana Silva", "Joao", "Joao"]}
+
+    saida = cr._score_block(cols, ctx)
+
+    assert sorted(chamadas) == ["Ana Silva", "Ana Silva", "Joao", "Joao"]
+    assert len(saida[-1]) == 3
+
+
+@pytest.mark.parametrize("chunksize, sort_by", [(None, None), (None, "nota final"), (7, None), (7, "nota final")])
+def test_processar_generico_parallel_batches_match_sequential(tmp_path, monkeypatch, chunksize, sort_by):
+    entrada = _entrada_varias_linhas(tmp_path)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 4)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 2)
+
+    kw = dict(sort_by=sort_by, chunksize=chunksize)
+    cr.processar_generico(str(entrada), str(tmp_path / "seq"), pares, workers=1, **kw)
+    estatisticas = cr.processar_generico(str(entrada), str(tmp_path / "par"), pares, workers=2, **kw)
+
+    assert (tmp_path / "seq.csv").read_text() == (tmp_path / "par.csv").read_text()
+    assert estatisticas.linhas == 25
+    assert not list(tmp_path.glob(".lotes_*"))
+
+
+def test_tamanho_lote_adapts_to_measured_cost():
+    tamanho = cr._TamanhoLote()
+    assert tamanho.linhas == cr._LOTE_INICIAL
+
+    tamanho.registrar(1000, 10.0)
+    assert tamanho.linhas == cr._LOTE_MIN
+
+    for _ in range(20):
+        tamanho.registrar(1000, 0.0001)
+    assert tamanho.linhas == cr._LOTE_MAX
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (1, 4), (2, 4)])
+def test_processar_generico_min_nota_matches_filtered_full_run(tmp_path, monkeypatch, workers, chunksize):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 4)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 2)
+    linhas = [
+        ("Ana Silva", "Ana Silva", "19900101", "19900101", "Rua A 10", "Rua A 10"),
+        ("Ana Silva", "Ana Silva", "19900101", "20010101", "Rua A 10", "Rua A 10"),
+        ("Joao Souza", "Pedro Lima", "19800101", "19700707", "Rua B 1", "Av C 2"),
+        ("J Souza", "Joao Souza", "19800101", "19800101", "Rua B 1", "Rua B 1"),
+        ("Maria", "Maria", "20000101", "20000110", "", "Rua D 5"),
+        ("Jose", "", "19500101", "19500101", "Rua E 3", "Rua E 3"),
+    ]
+    entrada = tmp_path / "in.csv"
+    pd.DataFrame(linhas, columns=["n1", "n2", "d1", "d2", "l1", "l2"]).to_csv(entrada, sep="|", index=False)
+    pares = [(0, 1, "N", "Paciente"), (4, 5, "L", "Endereco"), (2, 3, "D", "Nascimento")]
+
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, sort_by=None, workers=1)
+    estatisticas = cr.processar_generico(
+        str(entrada), str(tmp_path / "min"), pares, workers=workers, chunksize=chunksize, min_nota=9
+    )
+
+    full = pd.read_csv(tmp_path / "full.csv", sep="|", dtype=str, keep_default_na=False)
+    obtido = pd.read_csv(tmp_path / "min.csv", sep="|", dtype=str, keep_default_na=False)
+    esperado = full[full["nota final"].str.replace(",", ".").astype(float) >= 9]
+    assert 0 < len(esperado) < len(full)
+    assert sorted(map(tuple, obtido.values)) == sorted(map(tuple, esperado.values))
+    assert estatisticas.linhas == len(full)
+    assert estatisticas.descartadas == len(full) - len(esperado)
+    # datas primeiro; logradouro (o mais caro) só nas linhas que ainda podem chegar a 9
+    paciente, endereco, nascimento = estatisticas.pares
+    assert endereco.linhas < paciente.linhas <= nascimento.linhas < len(full)
+
+
+def test_score_block_min_nota_keeps_nothing_when_unreachable():
+    ctx = cr._Contexto([(0, 1, "D", "Nascimento"), (0, 1, "C", "Local")], {}, min_nota=3.5)
+
+    saida = cr._score_block({0: ["SP1234", "19900101"], 1: ["SP1234", "19900101"]}, ctx)
+
+    assert [len(coluna) for coluna in saida] == [0] * 10
+    assert list(ctx.mantidas) == []
+    assert ctx.contagens == [[0, 0], [0, 0]]
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (1, 4), (2, None), (2, 4)])
+def test_processar_generico_top_k_per_record(tmp_path, monkeypatch, workers, chunksize):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 4)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 2)
+    nomes = ["Ana Silva", "Ana Souza", "Joao Silva", "Ana Maria Silva", "Pedro Lima"]
+    linhas = [(f"r{i % 3}", nomes[i % 3], nomes[(i * 2) % 5]) for i in range(15)]
+    entrada = tmp_path / "in.csv"
+    pd.DataFrame(linhas, columns=["id", "nome", "candidato"]).to_csv(entrada, sep="|", index=False)
+    pares = [(1, 2, "N", "Paciente")]
+
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, sort_by=None, workers=1)
+    estatisticas = cr.processar_generico(
+        str(entrada),
+        str(tmp_path / "top"),
+        pares,
+        sort_by=None,
+        workers=workers,
+        chunksize=chunksize,
+        top_k=2,
+        chave_registro="id",
+    )
+
+    full = pd.read_csv(tmp_path / "full.csv", sep="|", dtype=str, keep_default_na=False)
+    full["n"] = full["nota final"].str.replace(",", ".").astype(float)
+    esperado = full.sort_values("n", ascending=False, kind="stable").groupby("id", sort=False).head(2)
+    esperado = esperado.set_index("id").loc[["r0", "r1", "r2"]].reset_index().drop(columns="n")
+    obtido = pd.read_csv(tmp_path / "top.csv", sep="|", dtype=str, keep_default_na=False)
+    assert obtido.equals(esperado[obtido.columns])
+    assert (estatisticas.linhas, estatisticas.descartadas) == (15, 9)
+
+
+def test_processar_generico_top_k_requires_key_column(tmp_path):
+    entrada = _entrada_varias_linhas(tmp_path, n=3)
+    with pytest.raises(ValueError):
+        cr.processar_generico(str(entrada), str(tmp_path / "o"), [(0, 1, "N", "P")], top_k=1, chave_registro="x")
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (1, 4), (2, None), (2, 4)])
+def test_processar_generico_colunas_saida_projects_input(tmp_path, monkeypatch, workers, chunksize):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 4)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 2)
+    df = pd.read_csv(_entrada_varias_linhas(tmp_path, n=12), sep="|", dtype=str)
+    df.insert(1, "obs", [f"obs {i}" for i in range(12)])
+    df["id"] = [f"r{i}" for i in range(12)]
+    entrada = tmp_path / "largo.csv"
+    df.to_csv(entrada, sep="|", index=False)
+    pares = [(0, 2, "N", "Paciente"), (3, 4, "D", "Nascimento")]
+    kw = dict(sort_by="nota final", workers=workers, chunksize=chunksize)
+
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, **kw)
+    cr.processar_generico(str(entrada), str(tmp_path / "proj"), pares, colunas_saida=["id", "nome_a"], **kw)
+    cr.processar_generico(str(entrada), str(tmp_path / "nada"), pares, colunas_saida=[], **kw)
+
+    full = pd.read_csv(tmp_path / "full.csv", sep="|", dtype=str, keep_default_na=False)
+    criterios = list(full.columns[len(df.columns) :])
+    proj = pd.read_csv(tmp_path / "proj.csv", sep="|", dtype=str, keep_default_na=False)
+    nada = pd.read_csv(tmp_path / "nada.csv", sep="|", dtype=str, keep_default_na=False)
+    # colunas na ordem do arquivo, não na pedida
+    assert proj.equals(full[["nome_a", "id"] + criterios])
+    assert nada.equals(full[criterios])
+
+
+def test_processar_generico_colunas_saida_unknown_column(tmp_path):
+    entrada = _entrada_varias_linhas(tmp_path, n=3)
+    with pytest.raises(ValueError):
+        cr.processar_generico(str(entrada), str(tmp_path / "o"), [(0, 1, "N", "P")], colunas_saida=["x"])
+
+
+@pytest.mark.parametrize("workers, chunksize, motor", [(1, None, "pandas"), (1, 4, "pandas"), (1, 4, "mmap"), (2, 4, "mmap")])
+def test_processar_generico_linha_inicial_matches_tail(tmp_path, monkeypatch, workers, chunksize, motor):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 4)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 2)
+    entrada = _entrada_varias_linhas(tmp_path, n=15)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    kw = dict(sort_by=None, workers=workers, chunksize=chunksize, motor=motor)
+
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, **kw)
+    estatisticas = cr.processar_generico(str(entrada), str(tmp_path / "resto"), pares, linha_inicial=6, **kw)
+
+    full = (tmp_path / "full.csv").read_text().splitlines()
+    assert (tmp_path / "resto.csv").read_text().splitlines() == full[:1] + full[7:]
+    assert estatisticas.linhas == 9
+
+
+@pytest.mark.parametrize(
+    "workers, chunksize, extra",
+    [
+        (1, None, {}),
+        (1, 4, {"sort_by": "nota final"}),
+        (2, 4, {"min_nota": 5}),
+        (1, 4, {"motor": "mmap", "top_k": 2, "chave_registro": "nome_a"}),
+    ],
+)
+def test_processar_generico_checkpoint_resumes_after_crash(tmp_path, monkeypatch, workers, chunksize, extra):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 3)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 3)
+    monkeypatch.setattr(cr, "_LOTE_MAX", 3)
+    entrada = _entrada_varias_linhas(tmp_path, n=20)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    kw = {"sort_by": None, "workers": workers, "chunksize": chunksize, **extra}
+    pasta = tmp_path / "ckpt"
+    esperado = cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, **kw)
+
+    original = cr._process_lote
+    chamadas = []
+
+    def espia(lote):
+        chamadas.append(Path(lote.destino).name)
+        if len(chamadas) == 3 and not (pasta / "retomado").exists():
+            raise RuntimeError("queda simulada")
+        return original(lote)
+
+    if workers == 1:
+        monkeypatch.setattr(cr, "_process_lote", espia)
+        with pytest.raises(RuntimeError):
+            cr.processar_generico(str(entrada), str(tmp_path / "ck"), pares, checkpoint_dir=str(pasta), **kw)
+        # o manifesto lista as faixas concluídas antes da queda (não necessariamente contíguas)
+        faixas = [json.loads(linha) for linha in (pasta / "manifesto.jsonl").read_text().splitlines()[1:]]
+        prontas = [f"faixa_{f['inicio']}_{f['fim']}.csv" for f in faixas]
+        assert len(prontas) >= 2
+        chamadas.clear()
+        (pasta / "retomado").touch()
+    estatisticas = cr.processar_generico(str(entrada), str(tmp_path / "ck"), pares, checkpoint_dir=str(pasta), **kw)
+
+    assert (tmp_path / "ck.csv").read_text() == (tmp_path / "full.csv").read_text()
+    assert (estatisticas.linhas, estatisticas.descartadas) == (esperado.linhas, esperado.descartadas)
+    assert [(p.linhas, p.pontuadas > 0) for p in estatisticas.pares] == [(20, True), (20, True)]
+    if workers == 1:
+        assert chamadas and not set(prontas) & set(chamadas)  # só as faixas que faltavam
+        assert [p.name for p in pasta.iterdir()] == ["retomado"]  # o resto do checkpoint foi apagado
+    else:
+        assert not pasta.exists()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_processar_generico_cancel_keeps_checkpoint_for_resume(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 3)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 3)
+    monkeypatch.setattr(cr, "_LOTE_MAX", 3)
+    entrada = _entrada_varias_linhas(tmp_path, n=30)
+    pares = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+    kw = dict(workers=workers, checkpoint_dir=str(tmp_path / "ck"))
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, workers=1)
+
+    controle = ce.Controle()
+
+    def cancelar_no_primeiro_lote(pct, msg, eta=None):
+        if pct > 0:
+            controle.cancelar()
+
+    with pytest.raises(ce.ExecucaoCancelada):
+        cr.processar_generico(
+            str(entrada), str(tmp_path / "out"), pares, progress_cb=cancelar_no_primeiro_lote, controle=controle, **kw
+        )
+    assert not (tmp_path / "out.csv").exists()
+    assert (tmp_path / "ck" / "manifesto.jsonl").exists()
+
+    cr.processar_generico(str(entrada), str(tmp_path / "out"), pares, **kw)
+    assert (tmp_path / "out.csv").read_text() == (tmp_path / "full.csv").read_text()
+
+
+def test_processar_generico_pause_waits_for_resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 3)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 3)
+    monkeypatch.setattr(cr, "_LOTE_MAX", 3)
+    entrada = _entrada_varias_linhas(tmp_path, n=12)
+    pares = [(0, 1, "N", "Paciente")]
+    cr.processar_generico(str(entrada), str(tmp_path / "full"), pares, workers=1)
+    controle = ce.Controle()
+    pausas = []
+
+    def pausar_uma_vez(pct, msg, eta=None):
+        if pct > 0 and not pausas:
+            controle.pausar()
+            pausas.append(threading.Timer(0.2, controle.retomar))
+            pausas[0].start()
+
+    cr.processar_generico(
+        str(entrada), str(tmp_path / "out"), pares, workers=1, progress_cb=pausar_uma_vez, controle=controle
+    )
+
+    assert not controle.pausado
+    assert (tmp_path / "out.csv").read_text() == (tmp_path / "full.csv").read_text()
+
+
+def test_processar_generico_cancel_during_frequency_pass(tmp_path, monkeypatch):
+    entrada = _entrada_varias_linhas(tmp_path, n=20)
+    controle = ce.Controle()
+    lidos = []
+    count_pares = fb.count_pares
+
+    def cancelar_no_primeiro_bloco(blocos, *args):
+        def espiao():
+            for bloco in blocos:
+                lidos.append(len(bloco))
+                controle.cancelar()
+                yield bloco
+
+        return count_pares(espiao(), *args)
+
+    monkeypatch.setattr(fb, "count_pares", cancelar_no_primeiro_bloco)
+    with pytest.raises(ce.ExecucaoCancelada):
+        cr.processar_generico(
+            str(entrada), str(tmp_path / "out"), [(0, 1, "N", "Paciente")], chunksize=4, workers=1, controle=controle
+        )
+
+    assert lidos == [4]  # os blocos seguintes nem foram lidos
+    assert not (tmp_path / "out.csv").exists()
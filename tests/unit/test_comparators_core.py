@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import numpy as np
+
 from comparators import (
+    build_criterios_formatos,
     build_criterios_labels,
     comparar_data,
     comparar_logradouro,
     comparar_nome,
     comparar_numero,
     comparar_texto,
+    formatar_coluna,
 )
 
 
@@ -27,3 +31,22 @@ def test_build_criterios_labels_includes_numeric_entries():
 
     assert "ano num prox arred" in criterios
     assert criterios[-1] == "nota final"
+
+
+def test_build_criterios_formatos_matches_labels():
+    pares = [(0, 1, "N", "nome"), (1, 2, "L", "end"), (2, 3, "M", "ano")]
+
+    formatos = build_criterios_formatos(pares)
+
+    assert len(formatos) == len(build_criterios_labels(pares))
+    assert formatos[7:13] == ["flag", "razao", "flag", "razao", "razao", "razao"]
+
+
+def test_formatar_coluna_matches_scalar_pontos():
+    resultado = comparar_nome("ana maria silva", "ana silva", None)
+
+    colunas = [formatar_coluna(np.array([v, v]), f) for v, f in zip(resultado.valores, resultado.FORMATOS)]
+
+    assert [c[0] for c in colunas] == resultado.pontos
+    assert resultado.pontos[3] == "0,0"  # sem tabelas de frequência: não calculado
+    assert list(formatar_coluna(np.array([-0.0, 0.0, np.nan]), "razao")) == ["-0,00", "0,00", "0,0"]
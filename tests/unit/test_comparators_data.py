@@ -42,3 +42,17 @@ def test_comparacao_resultado_formata_pontos():
 
 def test_formatar_resultado_helper():
     assert core.formatar_resultado([0.5, 1]) == ["0,50", "1,00"]
+
+
+def test_comparar_data_batch_matches_scalar():
+    from comparators.data import comparar_batch
+
+    col1 = ["20200101", "20200101", "20200112", "20211201", "20200101", "19901231", "", "2020010", "abcdefgh", "20200101"]
+    col2 = ["20200101", "20200102", "20200121", "20212101", "20020101", "20001231", "", "2020010", "abcdefhg", "02020101"]
+
+    lote = comparar_batch(col1, col2)
+
+    for i, (d1, d2) in enumerate(zip(col1, col2)):
+        escalar = comparar_data(d1, d2)
+        assert core.formatar_flags([p[i] for p in lote.pontos]) == escalar.pontos
+        assert lote.nota[i] == escalar.nota
@@ -38,3 +38,18 @@ def test_localidade_code_soundex_for_non_numeric():
     assert resultado.pontos[0] == "1,0"
     assert resultado.pontos[3] == "0,4"
     assert resultado.nota > 1.3
+
+
+def test_localidade_batch_matches_scalar():
+    from comparators.core import formatar_flags
+    from comparators.localidade import comparar_batch
+
+    col1 = ["SP3550", "SP3550", "SP3550", "RJ1234", "SPABCD", "SP1234", "sp3550", "", "SP35", "ßP1234", "MG1234"]
+    col2 = ["SP3550", "SQ3551", "PS3505", "RJ4321", "SPABCE", "SPABCD", "SP3550", "", "SP35", "SSP123", "AB9876"]
+
+    lote = comparar_batch(col1, col2)
+
+    for i, (v1, v2) in enumerate(zip(col1, col2)):
+        escalar = comparar(v1, v2)
+        assert formatar_flags([p[i] for p in lote.pontos]) == escalar.pontos
+        assert lote.nota[i] == escalar.nota
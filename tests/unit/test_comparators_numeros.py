@@ -27,3 +27,19 @@ def test_comparar_numero_parses_floats_with_commas():
     assert resultado.pontos[0] == "1,0"
     assert float(resultado.pontos[2].replace(",", ".")) == 1.0
     assert resultado.nota >= 3.5
+
+
+def test_comparar_numero_batch_matches_scalar():
+    from comparators import comparar_numero_batch, formatar_coluna
+    from comparators.numeros import ResultadoNumero
+
+    col1 = ["2020", "10,50", "1.234,56", "0,001", "-3", "1e3", "", "abc", "123456789", "99,995", "0.5", "12.345,67", "1.000.000,01"]
+    col2 = ["2021", "10.5", "1234,5", "0,002", "−3", "1000", "5", "abc", "123456780", "100", "0.49", "12.345,68", "999.999,99"]
+
+    lote = comparar_numero_batch(col1, col2)
+
+    for i, (v1, v2) in enumerate(zip(col1, col2)):
+        escalar = comparar_numero(v1, v2)
+        pontos = [formatar_coluna(p[i : i + 1], f)[0] for p, f in zip(lote.pontos, ResultadoNumero.FORMATOS)]
+        assert pontos == escalar.pontos
+        assert lote.nota[i] == escalar.nota
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import util
+from comparators import nomes, texto
+from comparators.vocabulario import Vocabulario, vocabulario_padrao
+
+
+def test_vocabulario_interna_tokens_com_atributos():
+    vocab = Vocabulario()
+    freq = {"ana": 7}
+    tabela = vocab.tabela(freq)
+
+    ids = vocab.codificar("ana maria ana")
+
+    assert ids == (0, 1, 0)
+    assert vocab.tokens == ["ana", "maria"]
+    assert list(vocab.tamanho) == [3, 5]
+    assert vocab.inicial[1] == ord("m")
+    assert vocab.codigos[vocab.soundex[0]] == "A500"
+    assert list(tabela) == [7, 0]
+    assert vocab.tabela(freq)[0] == 7
+
+
+def test_comparar_ids_equivale_a_comparar_por_strings():
+    vocab = Vocabulario()
+    freq_maps = ({"ana": 1, "joao": 2000}, {"m": 2, "maria": 3}, {"silva": 1001})
+    tabelas = [vocab.tabela(m) for m in freq_maps]
+    ids1 = vocab.codificar("ana m silva")
+    ids2 = vocab.codificar("ana maria silva")
+
+    por_ids = nomes.comparar_ids(ids1, ids2, vocab, tabelas)
+    por_str = nomes.comparar("ana m silva", "ana maria silva", freq_maps)
+    assert por_ids == por_str
+
+    tabela = vocab.tabela({"silva": 3000})
+    assert texto.comparar_ids(ids1, ids2, vocab, tabela) == texto.comparar(
+        "ana m silva", "ana maria silva", {"silva": 3000}
+    )
+
+
+def test_vocabulario_padrao_e_limitado(monkeypatch):
+    esperado = nomes.comparar("ana maria silva", "ana m silva", None)
+    monkeypatch.setattr(util, "CACHE_TAMANHO", 4)
+
+    for i in range(50):
+        nomes.comparar(f"nome{i} silva", f"nome{i} souza", None)
+        # conferido no início de cada comparação, que acrescenta até 3 tokens
+        assert len(vocabulario_padrao()) <= 4 + 3
+
+    assert nomes.comparar("ana maria silva", "ana m silva", None) == esperado
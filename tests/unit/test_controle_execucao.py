@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import controleExecucao as ce
+
+
+def test_pausa_bloqueia_ate_retomar():
+    controle = ce.Controle()
+    controle.pausar()
+    liberado = threading.Event()
+
+    t = threading.Thread(target=lambda: (controle.aguardar(), liberado.set()))
+    t.start()
+    assert not liberado.wait(0.1)
+    assert controle.pausado
+
+    controle.retomar()
+    t.join(1)
+    assert liberado.is_set()
+
+
+def test_cancelar_acorda_a_pausa_com_excecao():
+    controle = ce.Controle()
+    controle.pausar()
+    erros = []
+
+    def esperar():
+        try:
+            controle.aguardar()
+        except ce.ExecucaoCancelada as exc:
+            erros.append(exc)
+
+    t = threading.Thread(target=esperar)
+    t.start()
+    controle.cancelar()
+    t.join(1)
+
+    assert len(erros) == 1 and controle.cancelado
+    with pytest.raises(ce.ExecucaoCancelada):
+        controle.verificar()
@@ -72,3 +72,94 @@ def test_build_if_missing_creates_cache_from_csv(tmp_path: Path):
     primeiro_nome_map = freq_map_list[0]
     assert primeiro_nome_map["ana"] >= 1
     assert any("clara" in mapa for mapa in freq_map_list)
+
+
+def test_build_for_pares_streams_only_frequency_columns(tmp_path: Path, monkeypatch):
+    csv_path = tmp_path / "pares.csv"
+    df = pd.DataFrame(
+        {
+            "NomeA": ["Ana Maria Silva", "José Souza", ""],
+            "NomeB": ["Ana Silva", "Jose de Souza", "Ana"],
+            "DataA": ["19900101", "19851212", "20000101"],
+            "DataB": ["19900101", "19851212", "20000101"],
+            "TextoA": ["rua a", "rua b", "rua a"],
+            "TextoB": ["rua a", "", "rua c"],
+        }
+    )
+    df.to_csv(csv_path, sep="|", index=False)
+    pares = [(0, 1, "N", "nome"), (2, 3, "D", "nasc"), (4, 5, "T", "texto")]
+
+    lidas: list[list[str]] = []
+    original = pd.read_csv
+
+    def espiao(*args, **kwargs):
+        resultado = original(*args, **kwargs)
+        lidas.append(kwargs.get("usecols"))
+        return resultado
+
+    monkeypatch.setattr(fb.pd, "read_csv", espiao)
+    total, freq_maps = fb.build_for_pares(str(csv_path), pares, sep="|", chunksize=1, motor="pandas")
+
+    assert lidas == [[0, 1, 4, 5]]
+    assert total == 3
+    assert freq_maps[1] is None
+    first, middle, last = freq_maps[0]
+    assert first["ana"] == 3 and first["jose"] == 2
+    assert middle["maria"] == 1
+    assert last["silva"] == 2 and last["ana"] == 1
+    assert freq_maps[2]["rua"] == 5
+    assert freq_maps[2]["a"] == 3
+
+
+def test_cached_pares_reuses_and_invalidates_cache(tmp_path: Path):
+    csv_path = tmp_path / "pares.csv"
+    csv_path.write_text("a|b|c|d\nAna Silva|Ana|rua x|rua y\nJose|Jose Souza|rua x|\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    pares = [(0, 1, "N", "nome"), (2, 3, "T", "texto"), (0, 1, "D", "data")]
+    chamadas: list[list] = []
+
+    def contar(sub):
+        chamadas.append(sub)
+        return fb.count_pares([pd.read_csv(csv_path, sep="|", dtype=str)], sub)
+
+    total, freq = fb.cached_pares(str(csv_path), pares, contar, sep="|", cache_dir=str(cache_dir))
+    total2, freq2 = fb.cached_pares(str(csv_path), pares, contar, sep="|", cache_dir=str(cache_dir))
+
+    assert len(chamadas) == 1
+    assert total == total2 == 2
+    assert freq2[0] == freq[0] and freq2[1] == freq[1] and freq2[2] is None
+    assert freq2[1]["rua"] == 3
+
+    fb.cached_pares(str(csv_path), pares, contar, sep=";", cache_dir=str(cache_dir))
+    assert len(chamadas) == 2
+
+    csv_path.write_text("a|b|c|d\nMaria|Maria|rua z|rua z\n", encoding="utf-8")
+    total3, freq3 = fb.cached_pares(str(csv_path), pares, contar, sep="|", cache_dir=str(cache_dir))
+    assert len(chamadas) == 3
+    assert total3 == 1
+    assert freq3[0][0]["maria"] == 2
+
+
+def test_evict_cache_removes_old_and_oversized_entries(tmp_path: Path):
+    import os
+
+    antigo = tmp_path / "antigo.freq"
+    medio = tmp_path / "medio.freq"
+    novo = tmp_path / "novo.freq"
+    for i, p in enumerate((antigo, medio, novo)):
+        p.write_bytes(b"x" * 100)
+    os.utime(antigo, (0, 0))
+    os.utime(medio, (medio.stat().st_mtime - 10,) * 2)
+
+    fb.evict_cache(str(tmp_path), max_bytes=150, max_age=3600)
+
+    assert not antigo.exists()
+    assert not medio.exists()
+    assert novo.exists()
+
+
+def test_cache_serialization_roundtrip():
+    tabelas = [Counter({"ana": 3, "maria": 70_000}), Counter()]
+    total, lidas = fb._desserializar(fb._serializar(42, tabelas))
+    assert total == 42
+    assert lidas == tabelas
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import comparaRegistros as cr
+import gravacaoSaida as gs
+import ordenacaoExterna as oe
+
+
+def _entrada(tmp_path):
+    df = pd.DataFrame(
+        {
+            "nome_a": ["Ana Silva", "Carlos Souza", "Maria Lima", "Ana Silva"],
+            "nome_b": ["Ana Silva", "Carlos Sousa", "Joao Lima", "Ana Maria"],
+            "data_a": ["19900101", "19850505", "19700303", "19900101"],
+            "data_b": ["19900101", "19850550", "19700303", "20000101"],
+        }
+    )
+    entrada = tmp_path / "entrada.csv"
+    df.to_csv(entrada, sep="|", index=False)
+    return entrada
+
+
+PARES = [(0, 1, "N", "Paciente"), (2, 3, "D", "Nascimento")]
+
+
+def test_formato_desconhecido(tmp_path):
+    with pytest.raises(ValueError):
+        cr.processar_generico(str(_entrada(tmp_path)), str(tmp_path / "o"), PARES, formato="xlsx")
+
+
+def test_gravador_csv_vazio_grava_cabecalho(tmp_path):
+    destino = tmp_path / "o.csv"
+    with gs.abrir("csv", destino, ["a", "nota final"], 1, sep="|"):
+        pass
+    assert destino.read_text() == "a|nota final\n"
+
+
+def test_gravador_csv_formata_criterios_numericos(tmp_path):
+    destino = tmp_path / "o.csv"
+    df = pd.DataFrame({"a": ["x", "y"], "flag": [1.0, 0.5], "razao": [0.755, np.nan], "nota final": [2.5, -0.0]})
+    with gs.abrir("csv", destino, list(df.columns), 1, sep="|", formatos=["flag", "razao", "razao"]) as gravador:
+        gravador.gravar(df)
+    assert destino.read_text().splitlines() == ["a|flag|razao|nota final", "x|1,0|0,76|2,50", "y|0,5|0,0|-0,00"]
+
+
+@pytest.mark.parametrize("chunksize, sort_by", [(None, "nota final"), (2, None)])
+def test_pipeline_entrega_criterios_numericos_ao_gravador(tmp_path, monkeypatch, chunksize, sort_by):
+    recebidos = []
+    gravar = gs.GravadorCsv.gravar
+
+    def espiao(self, df):
+        recebidos.append(df)
+        gravar(self, df)
+
+    monkeypatch.setattr(gs.GravadorCsv, "gravar", espiao)
+    entrada = str(_entrada(tmp_path))
+    cr.processar_generico(entrada, str(tmp_path / "o"), PARES, workers=1, chunksize=chunksize, sort_by=sort_by)
+
+    assert recebidos
+    for df in recebidos:
+        assert df["nome_a"].dtype == object
+        assert all(df[c].dtype == "float64" for c in df.columns[4:])
+
+
+@pytest.mark.parametrize("formato", ["parquet", "feather"])
+@pytest.mark.parametrize(
+    "workers, chunksize, sort_by, extra",
+    [
+        (1, None, "nota final", {}),
+        (1, 2, None, {}),
+        (2, 2, "nota final", {}),
+        (2, None, "nota final", {}),
+        (2, 2, None, {"top_k": 1, "chave_registro": "nome_a"}),
+    ],
+)
+def test_formatos_colunares_equivalem_ao_csv(tmp_path, monkeypatch, formato, workers, chunksize, sort_by, extra):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 2)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 1)
+    entrada = _entrada(tmp_path)
+    kw = dict(workers=workers, chunksize=chunksize, sort_by=sort_by, **extra)
+
+    cr.processar_generico(str(entrada), str(tmp_path / "ref"), PARES, **kw)
+    cr.processar_generico(str(entrada), str(tmp_path / "bin"), PARES, formato=formato, **kw)
+
+    ref = pd.read_csv(tmp_path / "ref.csv", sep="|", dtype=str)
+    arquivo = tmp_path / f"bin{gs.EXTENSOES[formato]}"
+    binario = pd.read_parquet(arquivo) if formato == "parquet" else pd.read_feather(arquivo)
+    assert list(binario.columns) == list(ref.columns)
+    assert binario["Paciente prim frag igual"].dtype == "float32"
+    assert binario["nota final"].dtype == "float64"
+    assert binario["nome_a"].tolist() == ref["nome_a"].tolist()
+    # os binários guardam o valor sem o arredondamento do texto
+    for coluna in ref.columns[4:]:
+        esperado = ref[coluna].str.replace(",", ".").astype(float)
+        np.testing.assert_allclose(binario[coluna].fillna(0).astype(float), esperado, atol=0.0051)
+    assert binario["nota final"].tolist() == ref["nota final"].str.replace(",", ".").astype(float).tolist()
+
+
+@pytest.mark.parametrize("formato", ["parquet", "feather"])
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (1, 2), (2, 2)])
+def test_formatos_colunares_ordenam_pelo_valor(tmp_path, monkeypatch, formato, workers, chunksize):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(cr, "_LOTE_INICIAL", 2)
+    monkeypatch.setattr(cr, "_LOTE_MIN", 1)
+    monkeypatch.setattr(oe, "FAN_IN", 2)
+    entrada = str(_entrada(tmp_path))
+    pares = PARES[:1] + [(0, 1, "N", "Mae")] + PARES[1:]  # nota do par idêntico passa de 10
+    kw = dict(workers=workers, chunksize=chunksize, sort_by="nota final")
+
+    cr.processar_generico(entrada, str(tmp_path / "ref"), pares, **kw)
+    cr.processar_generico(entrada, str(tmp_path / "bin"), pares, formato=formato, **kw)
+
+    arquivo = tmp_path / f"bin{gs.EXTENSOES[formato]}"
+    notas = (pd.read_parquet(arquivo) if formato == "parquet" else pd.read_feather(arquivo))["nota final"].tolist()
+    assert max(notas) >= 10
+    assert notas == sorted(notas, reverse=True)
+    # o CSV mantém a ordem do texto gravado
+    texto = pd.read_csv(tmp_path / "ref.csv", sep="|", dtype=str)["nota final"].tolist()
+    assert texto == sorted(texto, reverse=True)
+
+
+@pytest.mark.parametrize("formato", ["parquet", "feather"])
+def test_gravador_colunar_grava_numeros_e_nulos(tmp_path, formato):
+    pytest.importorskip("pyarrow")
+    destino = tmp_path / f"o{gs.EXTENSOES[formato]}"
+    df = pd.DataFrame({"a": ["x", "y"], "razao": [0.7549, np.nan], "nota final": [1.25, 0.0]})
+    with gs.abrir(formato, destino, list(df.columns), 1, sep="|") as gravador:
+        gravador.gravar(df)
+
+    lido = pd.read_parquet(destino) if formato == "parquet" else pd.read_feather(destino)
+    assert lido["razao"].iloc[0] == np.float32(0.7549)
+    assert lido["razao"].isna().tolist() == [False, True]
+    assert lido["nota final"].tolist() == [1.25, 0.0]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pandas as pd
+
+import indiceLinhas as il
+
+
+def _arquivo(tmp_path):
+    # aspas com quebra de linha, aspas escapadas e no meio do campo, linhas em branco e CRLF
+    texto = (
+        'id|nome|obs\r\n'
+        '0|Ana|"linha\r\nquebrada"\r\n'
+        '\r\n'
+        '1|Rua 5"A|"x""y"\r\n'
+        '   \r\n'
+        '2|"B|C"|NA\r\n'
+        '3|"D"|"z\nw"'
+    )
+    arquivo = tmp_path / "entrada.csv"
+    arquivo.write_bytes(texto.encode("utf-8"))
+    return arquivo
+
+
+def test_indice_segue_o_pandas(tmp_path, monkeypatch):
+    monkeypatch.setattr(il, "_PEDACO", 7)  # pedaços terminando dentro de campos entre aspas
+    monkeypatch.setattr(il, "_ABERTOS", {})
+    arquivo = str(_arquivo(tmp_path))
+    esperado = pd.read_csv(arquivo, sep="|", dtype=str).fillna("")
+
+    indice = il.abrir(arquivo, "|")
+
+    assert len(indice) == 4
+    assert indice.ler(0, len(indice)).equals(esperado)
+    for k in range(len(indice)):
+        assert indice.ler(k, k + 1).equals(esperado.iloc[k : k + 1])
+    assert [list(b.index) for b in indice.blocos(3, inicio=1)] == [[1, 2, 3]]
+    assert list(indice.ler(2, 4, colunas=[2]).columns) == ["obs"]
+
+
+def test_indice_persistido_em_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(il, "_ABERTOS", {})
+    arquivo = str(_arquivo(tmp_path))
+    cache = tmp_path / "cache"
+
+    primeiro = il.abrir(arquivo, "|", cache_dir=str(cache))
+    il._ABERTOS.clear()
+    monkeypatch.setattr(il, "construir", lambda *a: (_ for _ in ()).throw(AssertionError("reconstruiu")))
+    segundo = il.abrir(arquivo, "|", cache_dir=str(cache))
+
+    assert len(list(cache.glob("*.idx"))) == 1
+    assert list(segundo.deslocamentos) == list(primeiro.deslocamentos)
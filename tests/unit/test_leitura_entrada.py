@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+import leituraEntrada as le
+
+
+def _arquivo(tmp_path):
+    arquivo = tmp_path / "entrada.csv"
+    linhas = ["id|nome|id|obs"] + [f"{i}|Ana {i}|{i % 3}|{'NA' if i % 4 == 0 else ''}" for i in range(10)]
+    arquivo.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return arquivo
+
+
+def test_motor_desconhecido(tmp_path):
+    with pytest.raises(ValueError):
+        le.ler(str(_arquivo(tmp_path)), "|", motor="polars")
+
+
+def test_pandas_em_blocos_com_colunas(tmp_path):
+    blocos = list(le.ler(str(_arquivo(tmp_path)), "|", chunksize=4, colunas=[3, 0], motor="pandas"))
+
+    assert [len(b) for b in blocos] == [4, 4, 2]
+    assert list(blocos[0].columns) == ["id", "obs"]
+    assert set(blocos[0]["obs"]) == {""}  # "NA" e vazio viram ""
+    assert list(blocos[1].index) == [4, 5, 6, 7]
+
+
+@pytest.mark.parametrize("chunksize, colunas", [(None, None), (3, None), (4, [2, 1]), (100, [3])])
+def test_pyarrow_igual_ao_pandas(tmp_path, chunksize, colunas):
+    pytest.importorskip("pyarrow")
+    arquivo = str(_arquivo(tmp_path))
+
+    esperado = list(le.ler(arquivo, "|", chunksize=chunksize, colunas=colunas, motor="pandas"))
+    obtido = list(le.ler(arquivo, "|", chunksize=chunksize, colunas=colunas, motor="pyarrow"))
+
+    assert len(obtido) == len(esperado)
+    for a, b in zip(esperado, obtido):
+        assert list(b.columns) == list(a.columns)  # "id.1": nomes repetidos como no pandas
+        assert b.equals(a)
+
+
+def _arquivo_irregular(tmp_path, curta=False):
+    linhas = [f"{i}|nome {i}|x" for i in range(600)]
+    linhas[450] = '450|"linha 1\nlinha 2"|x'  # valor com quebra de linha depois do 1º bloco
+    linhas[500] = "   "
+    linhas[510] = "\t"
+    if curta:
+        linhas[550] = "550|só dois"  # o pandas completa com vazio; o Arrow recusa
+    arquivo = tmp_path / "irregular.csv"
+    arquivo.write_text("a|b|c\n" + "\n".join(linhas) + "\n", encoding="utf-8")
+    return str(arquivo)
+
+
+@pytest.mark.parametrize("curta", [False, True])
+@pytest.mark.parametrize("chunksize", [None, 7, 100])
+def test_pyarrow_aspas_multilinha_e_linhas_em_branco(tmp_path, monkeypatch, chunksize, curta):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(le, "_BLOCO_BYTES", 1024)
+    arquivo = _arquivo_irregular(tmp_path, curta)
+
+    esperado = list(le.ler(arquivo, "|", chunksize=chunksize, motor="pandas"))
+    obtido = list(le.ler(arquivo, "|", chunksize=chunksize, motor="pyarrow"))
+
+    assert sum(len(b) for b in esperado) == 598
+    assert len(obtido) == len(esperado)
+    for a, b in zip(esperado, obtido):
+        assert b.equals(a)
+
+
+@pytest.mark.parametrize("chunksize, colunas", [(None, None), (3, None), (4, [2, 1])])
+def test_mmap_igual_ao_pandas(tmp_path, chunksize, colunas):
+    arquivo = str(_arquivo(tmp_path))
+
+    esperado = list(le.ler(arquivo, "|", chunksize=chunksize, colunas=colunas, motor="pandas"))
+    obtido = list(le.ler(arquivo, "|", chunksize=chunksize, colunas=colunas, motor="mmap"))
+
+    assert len(obtido) == len(esperado)
+    for a, b in zip(esperado, obtido):
+        assert list(b.columns) == list(a.columns)
+        assert b.equals(a)
+
+
+@pytest.mark.parametrize("motor", ["pandas", "mmap"])
+def test_inicio_pula_linhas(tmp_path, motor):
+    arquivo = str(_arquivo(tmp_path))
+
+    blocos = list(le.ler(arquivo, "|", chunksize=4, inicio=6, motor=motor))
+    vazio = list(le.ler(arquivo, "|", chunksize=4, inicio=50, motor=motor))
+
+    # o mmap começa os blocos na linha pedida; os outros motores cortam o bloco dela
+    esperado = [[6, 7, 8, 9]] if motor == "mmap" else [[6, 7], [8, 9]]
+    assert [list(b.index) for b in blocos] == esperado
+    assert [len(b) for b in vazio] == [0]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+import ordenacaoExterna as oe
+
+
+def test_mesclar_runs_intercala_em_niveis(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(oe, "FAN_IN", 2)
+    header = ["id", "nota final"]
+    notas = [["3,00", "1,50"], ["2,00", "0,50"], ["2,50", ""], ["4,00"]]
+    runs = []
+    for i, bloco in enumerate(notas):
+        df = pd.DataFrame({"id": [f"{i}-{j}" for j in range(len(bloco))], "nota final": bloco})
+        runs.append(oe.gravar_run(df, tmp_path / f"run_{i}.csv", "nota final", False, sep=";"))
+
+    destino = tmp_path / "saida.csv"
+    oe.mesclar_runs(runs, destino, header, "nota final", False, sep=";", buffer_linhas=2)
+
+    out = pd.read_csv(destino, sep=";", dtype=str, keep_default_na=False)
+    assert list(out.columns) == header
+    assert list(out["nota final"]) == ["4,00", "3,00", "2,50", "2,00", "1,50", "0,50", ""]
+    assert not list(tmp_path.glob("merge_*"))
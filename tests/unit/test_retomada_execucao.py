@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import retomadaExecucao as rx
+
+
+def _concluir(retomada, inicio, fim):
+    retomada.parte(inicio, fim).write_text("x\n")
+    retomada.registrar(rx.Faixa(inicio, fim, fim - inicio, [[fim - inicio, 1]]))
+
+
+def test_faixas_faltantes_e_continuo(tmp_path):
+    retomada = rx.Retomada(tmp_path / "ck", {"entrada": "abc"})
+    _concluir(retomada, 0, 10)
+    _concluir(retomada, 20, 30)
+    _concluir(retomada, 10, 15)
+
+    assert retomada.faltantes(0, 40) == [(15, 20), (30, 40)]
+    assert retomada.faltantes(5, 12) == []
+    assert retomada.continuo(0) == 15
+    assert retomada.continuo(16) == 16
+
+
+def test_reabre_com_a_mesma_assinatura(tmp_path):
+    pasta = tmp_path / "ck"
+    _concluir(rx.Retomada(pasta, {"pares": [(0, 1, "N", "P")]}), 0, 5)
+
+    # tuplas e listas se equivalem na assinatura (ciclo pelo JSON)
+    reaberta = rx.Retomada(pasta, {"pares": [[0, 1, "N", "P"]]})
+
+    assert [(f.inicio, f.fim, f.linhas) for f in reaberta.concluidas] == [(0, 5, 5)]
+
+
+def test_outra_assinatura_descarta_so_o_checkpoint(tmp_path):
+    pasta = tmp_path / "ck"
+    _concluir(rx.Retomada(pasta, {"entrada": "abc"}), 0, 5)
+    (pasta / "outro.txt").write_text("mantido")
+
+    retomada = rx.Retomada(pasta, {"entrada": "def"})
+
+    assert retomada.concluidas == []
+    assert sorted(p.name for p in pasta.iterdir()) == ["manifesto.jsonl", "outro.txt"]
+    retomada.remover()
+    assert [p.name for p in pasta.iterdir()] == ["outro.txt"]
+
+
+def test_linha_incompleta_no_manifesto_e_ignorada(tmp_path):
+    pasta = tmp_path / "ck"
+    retomada = rx.Retomada(pasta, {})
+    _concluir(retomada, 0, 5)
+    retomada.parte(5, 9).write_text("x\n")
+    with open(pasta / rx.MANIFESTO, "a") as f:
+        f.write('{"inicio": 5, "fim": 9, "grav')  # queda no meio da escrita
+
+    reaberta = rx.Retomada(pasta, {})
+    _concluir(reaberta, 5, 9)
+
+    assert [(f.inicio, f.fim) for f in rx.Retomada(pasta, {}).concluidas] == [(0, 5), (5, 9)]
+
+
+def test_parcial_sincronizado_antes_do_manifesto(tmp_path, monkeypatch):
+    retomada = rx.Retomada(tmp_path / "ck", {})
+    eventos = []
+    sincronizar = rx._sincronizar
+    anexar = rx.Retomada._anexar
+    monkeypatch.setattr(rx, "_sincronizar", lambda p, **kw: (eventos.append(p.name), sincronizar(p, **kw)))
+    monkeypatch.setattr(rx.Retomada, "_anexar", lambda self, r: (eventos.append(rx.MANIFESTO), anexar(self, r)))
+
+    _concluir(retomada, 0, 5)
+
+    assert eventos == ["faixa_0_5.csv", "ck", rx.MANIFESTO]
+
+
+def test_parcial_truncado_volta_a_ser_pendente(tmp_path):
+    pasta = tmp_path / "ck"
+    retomada = rx.Retomada(pasta, {})
+    _concluir(retomada, 0, 5)
+    _concluir(retomada, 5, 9)
+    retomada.parte(5, 9).write_text("")  # perdeu o conteúdo (ex.: queda de energia)
+
+    reaberta = rx.Retomada(pasta, {})
+    assert [(f.inicio, f.fim) for f in reaberta.concluidas] == [(0, 5)]
+    assert reaberta.faltantes(0, 9) == [(5, 9)]
+
+    _concluir(reaberta, 5, 9)
+    assert [(f.inicio, f.fim) for f in rx.Retomada(pasta, {}).concluidas] == [(0, 5), (5, 9)]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import selecaoTopK as stk
+
+
+def _df(linhas):
+    return pd.DataFrame(linhas, columns=["id", "cand", "nota final"])
+
+
+def test_reduzir_mantem_k_melhores_por_chave():
+    df = _df([("a", "1", "3,00"), ("a", "2", "10,50"), ("b", "3", "1,00"), ("a", "3", "9,00")])
+
+    reduzido = stk.reduzir(df, "id", 2)
+
+    assert list(map(tuple, reduzido.values)) == [("a", "2", "10,50"), ("b", "3", "1,00"), ("a", "3", "9,00")]
+
+
+def test_selecao_entre_blocos_e_empates():
+    selecao = stk.SelecaoTopK(["id", "cand", "nota final"], "id", 2)
+
+    selecao.adicionar(_df([("a", "1", "5,00"), ("b", "1", "2,00"), ("a", "2", "5,00")]))
+    selecao.adicionar(_df([("a", "3", "5,00"), ("b", "2", "7,00"), ("a", "4", "6,00"), ("c", "1", "0,00")]))
+
+    assert len(selecao) == 5
+    assert list(map(tuple, selecao.resultado().values)) == [
+        ("a", "4", "6,00"),
+        ("a", "1", "5,00"),
+        ("b", "2", "7,00"),
+        ("b", "1", "2,00"),
+        ("c", "1", "0,00"),
+    ]
+
+
+def test_selecao_k_invalido():
+    with pytest.raises(ValueError):
+        stk.SelecaoTopK(["id", "nota final"], "id", 0)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import tabelasCompartilhadas as tc
+
+
+def test_publicar_e_anexar_preserva_tabelas():
+    freq_maps = {
+        0: [Counter({"ANA": 3, "JOSÉ": 1}), Counter(), Counter({"SILVA": 7})],
+        1: Counter({"RUA": 2, "AVENIDA": 5, "Ç": 1}),
+        2: None,
+    }
+
+    with tc.publicar(freq_maps) as publicacao:
+        anexadas = tc.anexar(publicacao.descritor)
+
+        assert [dict(t) for t in anexadas[0]] == [dict(t) for t in freq_maps[0]]
+        assert dict(anexadas[1]) == dict(freq_maps[1])
+        assert anexadas[2] is None
+        assert anexadas[1].get("AVENIDA", 0) == 5
+        assert anexadas[1].get("AVENID", 0) == 0
+        assert "JOSÉ" in anexadas[0][0] and "JOSE" not in anexadas[0][0]
+        assert len(anexadas[0][1]) == 0
+
+
+def test_empacotar_colunas_ida_e_volta():
+    import comparaRegistros as cr
+
+    cols = {0: ["Ana", "", "José da Silva"], 3: ["1", "22", "333"]}
+
+    assert cr._desempacotar_colunas(cr._empacotar_colunas(cols)) == cols
@@ -25,3 +25,22 @@ def test_soundex_returns_code_for_word():
 
 def test_soundex_returns_zeros_for_empty():
     assert util.soundex("") == "0000"
+
+
+def test_memoizacao_conta_hits_e_respeita_tamanho():
+    util.configurar_cache(2)
+    try:
+        util.padroniza("Maria da Silva")
+        util.padroniza("Maria da Silva")
+        util.soundex("maria")
+        info = util.cache_info()
+        assert info["util.padroniza"].hits == 1
+        assert info["util.padroniza"].misses == 1
+        assert info["util.soundex"].maxsize == 2
+
+        for nome in ("a", "b", "c"):
+            util.padroniza(nome)
+        assert util.cache_info()["util.padroniza"].currsize == 2
+        assert util.padroniza("  João da Silva Jr.  ") == "joao silva"
+    finally:
+        util.configurar_cache(util.CACHE_TAMANHO_PADRAO)